@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+API Key Pool - Spread Etherscan requests over several API keys with per-key budgets
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from constants import (
+    # API key pool
+    API_KEY_AUTH_QUARANTINE_SECONDS,
+    API_KEY_RATE_QUARANTINE_SECONDS,
+    API_KEY_MAX_QUARANTINE_SECONDS,
+
+    # Upstream names
+    UPSTREAM_ETHERSCAN
+)
+from rate_limiter import TokenBucketRateLimiter, get_rate_limiter
+
+
+class ApiKeyPoolError(Exception):
+    """API key pool related errors"""
+    pass
+
+
+def is_auth_error_reply(data) -> bool:
+    """Etherscan rejects a missing, invalid or revoked key with status "0" and an "API Key" result"""
+    if not isinstance(data, dict) or str(data.get("status")) != "0":
+        return False
+    text = f"{data.get('result', '')} {data.get('message', '')}".lower()
+    return "api key" in text and ("invalid" in text or "missing" in text)
+
+
+class ApiKey:
+    """One API key with its own token bucket, health state and usage counters"""
+
+    def __init__(self, key: str, limiter: TokenBucketRateLimiter):
+        self.key = key
+        self.limiter = limiter
+        self.quarantined_until = 0.0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+
+        # Usage statistics
+        self.requests = 0
+        self.auth_failures = 0
+        self.rate_failures = 0
+
+    @property
+    def label(self) -> str:
+        """Limiter name plus the key's last characters, safe for logs"""
+        return f"{self.limiter.name} (...{self.key[-4:]})"
+
+
+class ApiKeyPool:
+    """
+    Several API keys for one upstream, each behind its own token bucket.
+
+    Every request goes to the healthy key with the most budget left, so
+    throughput grows with the number of keys. A key that answers with an
+    auth or rate error is quarantined; repeated failures double the
+    quarantine. With a single key the pool uses the upstream's shared
+    limiter, which is exactly the behaviour without a pool.
+    """
+
+    def __init__(self, keys: Sequence[str], upstream: str = UPSTREAM_ETHERSCAN,
+                 clock: Callable[[], float] = time.monotonic):
+        keys = list(dict.fromkeys(key for key in keys if key))
+        if not keys:
+            raise ApiKeyPoolError(f"No {upstream} API key configured")
+        self.upstream = upstream
+        self.clock = clock
+        # The first key shares the upstream limiter; the others get "<upstream>#<n>" limiters
+        base = get_rate_limiter(upstream)
+        self.keys = [ApiKey(keys[0], base)]
+        for index, key in enumerate(keys[1:], start=2):
+            limiter = get_rate_limiter(f"{upstream}#{index}")
+            limiter.configure(base.base_rate, base.burst, base.max_rate)
+            self.keys.append(ApiKey(key, limiter))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def configure(self, rate: float, burst: Optional[float] = None, max_rate: Optional[float] = None):
+        """Set every key's bucket to the per-key rate"""
+        for api_key in self.keys:
+            api_key.limiter.configure(rate, burst, max_rate)
+
+    def _healthy(self, now: float) -> List[ApiKey]:
+        return [api_key for api_key in self.keys if api_key.quarantined_until <= now]
+
+    def _reserve(self) -> Tuple[ApiKey, float]:
+        """Pick the key with the most budget and reserve a token on it"""
+        with self._lock:
+            now = self.clock()
+            # With every key quarantined, use the one that comes back first rather than stall
+            candidates = self._healthy(now) or [min(self.keys, key=lambda api_key: api_key.quarantined_until)]
+            api_key = max(candidates, key=lambda candidate: (candidate.limiter.get_budget(), -candidate.requests))
+            api_key.requests += 1
+            return api_key, api_key.limiter.reserve()
+
+    def acquire(self) -> ApiKey:
+        """Block until a key's bucket has a token and return that key"""
+        api_key, wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return api_key
+
+    async def acquire_async(self) -> ApiKey:
+        """Wait asynchronously until a key's bucket has a token and return that key"""
+        api_key, wait = self._reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                api_key.limiter.cancel_reservation()
+                raise
+        return api_key
+
+    def record_success(self, api_key: ApiKey):
+        """The key worked: clear its failure streak"""
+        api_key.consecutive_failures = 0
+
+    def quarantine(self, api_key: ApiKey, reason: str, auth: bool = False, retry_after: Optional[float] = None):
+        """Leave a key out after an auth or rate error; repeated failures double the time"""
+        with self._lock:
+            if auth:
+                api_key.auth_failures += 1
+                seconds = API_KEY_AUTH_QUARANTINE_SECONDS
+            else:
+                api_key.rate_failures += 1
+                seconds = max(API_KEY_RATE_QUARANTINE_SECONDS, retry_after or 0)
+            seconds = min(API_KEY_MAX_QUARANTINE_SECONDS, seconds * 2 ** api_key.consecutive_failures)
+            api_key.consecutive_failures += 1
+            api_key.last_error = reason
+            api_key.quarantined_until = self.clock() + seconds
+        print(f"🔑 {self.upstream} key {api_key.label} quarantined for {seconds:.0f}s: {reason}")
+
+    def total_rate(self) -> float:
+        """Requests per second the healthy keys allow together"""
+        now = self.clock()
+        return sum(api_key.limiter.rate for api_key in self._healthy(now)) or self.keys[0].limiter.rate
+
+    def get_stats(self) -> List[Dict]:
+        """Per-key usage and health"""
+        now = self.clock()
+        return [
+            {
+                "key": api_key.label,
+                "rate": api_key.limiter.rate,
+                "requests": api_key.requests,
+                "auth_failures": api_key.auth_failures,
+                "rate_failures": api_key.rate_failures,
+                "quarantined_for": max(0.0, api_key.quarantined_until - now),
+                "last_error": api_key.last_error
+            }
+            for api_key in self.keys
+        ]
+
+    def format_stats(self) -> str:
+        """One-line per-key summary for cycle logs"""
+        parts = []
+        for stats in self.get_stats():
+            part = f"{stats['key']} {stats['requests']} req"
+            if stats["auth_failures"] or stats["rate_failures"]:
+                part += f", {stats['auth_failures']} auth/{stats['rate_failures']} rate errors"
+            if stats["quarantined_for"]:
+                part += f", quarantined {stats['quarantined_for']:.0f}s"
+            parts.append(part)
+        return "; ".join(parts)
+
+
+_pools: Dict[tuple, ApiKeyPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_api_key_pool(keys: Sequence[str], upstream: str = UPSTREAM_ETHERSCAN) -> ApiKeyPool:
+    """Process-wide pool for a set of keys, so every tracker shares the keys' budgets and health"""
+    pool_id = (upstream, tuple(dict.fromkeys(key for key in keys if key)))
+    with _pools_lock:
+        pool = _pools.get(pool_id)
+        if pool is None:
+            pool = ApiKeyPool(keys, upstream)
+            _pools[pool_id] = pool
+        return pool
@@ -10,7 +10,7 @@ import time
 import math
 import random
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, AsyncIterator, Callable, Awaitable
 
 # Import centralized constants
 from constants import (
@@ -29,17 +29,38 @@ from constants import (
     DEFAULT_POSITION_CHANGE_THRESHOLD,
     DEFAULT_CHECK_INTERVAL,
     DEFAULT_TIMEOUT_SECONDS,
-    DEFAULT_RATE_LIMIT_ETHERSCAN,
-    DEFAULT_RATE_LIMIT_HYPERLIQUID,
     MAX_CONCURRENT_REQUESTS,
+    ETHERSCAN_BALANCEMULTI_MAX_ADDRESSES,
+    ETHERSCAN_END_BLOCK,
+    ETHERSCAN_PAGE_SIZE,
+    ETHERSCAN_MAX_PAGES,
+    ETHERSCAN_ACTION_TXLIST,
+    ETHERSCAN_ACTION_TOKENTX,
+    DEFAULT_MAX_CONCURRENT_WALLETS,
+
+    # Connection pool limits
+    MEMORY_MAX_CONNECTIONS,
+    MEMORY_MAX_CONNECTIONS_PER_HOST,
+    MEMORY_DNS_CACHE_TTL,
+    MEMORY_KEEPALIVE_TIMEOUT,
 
     # Business rules
     SIGNIFICANT_BALANCE_CHANGE,
     POSITION_CHANGE_PERCENTAGE,
 
     # HTTP status codes
-    HTTP_SUCCESS_CODE
+    HTTP_SUCCESS_CODE,
+    HTTP_RATE_LIMIT_CODE,
+
+    # Upstream names
+    UPSTREAM_HYPERLIQUID
 )
+from api_key_pool import ApiKeyPool, get_api_key_pool, is_auth_error_reply
+from circuit_breaker import CircuitBreaker, CircuitBreakerError, get_circuit_breaker
+from rate_limiter import TokenBucketRateLimiter, RateLimitError, get_rate_limiter, parse_retry_after
+from transaction_cursor import TransactionCursor, filter_deposit_withdrawal
+from state_store import build_snapshot
+from utils import format_address
 
 # Custom exception hierarchy
 class AsyncWalletTrackerError(Exception):
@@ -50,86 +71,10 @@ class AsyncAPIError(AsyncWalletTrackerError):
     """API-related errors in async operations"""
     pass
 
-class CircuitBreakerError(AsyncWalletTrackerError):
-    """Circuit breaker specific errors"""
+class CheckDeferred(AsyncWalletTrackerError):
+    """A wallet check was cancelled at the cycle deadline and left for the next cycle"""
     pass
 
-class SimpleThrottler:
-    """Simple rate limiter for API calls"""
-
-    def __init__(self, calls_per_second: int):
-        self.calls_per_second = calls_per_second
-        self.min_interval = 1.0 / calls_per_second
-        self.last_call = 0.0
-
-    async def __aenter__(self):
-        """Context manager entry - throttle the call"""
-        elapsed = time.time() - self.last_call
-        if elapsed < self.min_interval:
-            await asyncio.sleep(self.min_interval - elapsed)
-        self.last_call = time.time()
-        return self
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit"""
-        pass
-
-class CircuitBreaker:
-    """Circuit Breaker Pattern implementation for API resilience"""
-
-    def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 60, expected_exception: type = Exception):
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout
-        self.expected_exception = expected_exception
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
-
-    async def call(self, func, *args, **kwargs):
-        """Execute function with circuit breaker protection"""
-        if self.state == "OPEN":
-            if self._should_attempt_reset():
-                self.state = "HALF_OPEN"
-            else:
-                raise CircuitBreakerError(f"Circuit breaker is OPEN. Last failure: {self._get_time_since_last_failure():.2f}s ago")
-
-        try:
-            if asyncio.iscoroutinefunction(func):
-                result = await func(*args, **kwargs)
-            else:
-                result = func(*args, **kwargs)
-
-            self._on_success()
-            return result
-        except self.expected_exception as e:
-            self._on_failure()
-            raise e
-
-    def _should_attempt_reset(self) -> bool:
-        """Check if circuit breaker should attempt reset"""
-        return time.time() - self.last_failure_time >= self.recovery_timeout
-
-    def _get_time_since_last_failure(self) -> float:
-        """Get time elapsed since last failure"""
-        return time.time() - (self.last_failure_time or 0)
-
-    def _on_success(self):
-        """Handle successful function call"""
-        self.failure_count = 0
-        self.state = "CLOSED"
-
-    def _on_failure(self):
-        """Handle failed function call"""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-
-        if self.failure_count >= self.failure_threshold:
-            self.state = "OPEN"
-
-    def get_state(self) -> str:
-        """Get current circuit breaker state"""
-        return self.state
-
 class RetryWithExponentialBackoff:
     """Retry mechanism with exponential backoff and jitter"""
 
@@ -165,6 +110,9 @@ class RetryWithExponentialBackoff:
                     print(f"✅ Retry successful on attempt {attempt}")
                 return result
 
+            except CircuitBreakerError:
+                # The endpoint is failing for every wallet; retrying only adds load
+                raise
             except Exception as e:
                 last_exception = e
                 if attempt < self.max_retries:
@@ -185,34 +133,150 @@ class RetryWithExponentialBackoff:
 
         return max(0, delay)  # Ensure non-negative
 
+def endpoint_breaker(url: str, endpoint: str) -> CircuitBreaker:
+    """Shared breaker for one upstream endpoint; network errors and HTTP error statuses count as failures"""
+    return get_circuit_breaker(url, endpoint, expected_exception=(aiohttp.ClientError, asyncio.TimeoutError))
+
+def _is_rate_limit_reply(data: Any) -> bool:
+    """Etherscan reports its rate limit as an HTTP 200 with status "0" and a "rate limit" result"""
+    return (
+        isinstance(data, dict) and str(data.get("status")) == "0"
+        and "rate limit" in f"{data.get('result', '')} {data.get('message', '')}".lower()
+    )
+
+async def read_json(limiter: TokenBucketRateLimiter, response: aiohttp.ClientResponse) -> Any:
+    """
+    Parse a response body and feed the outcome to the upstream's limiter.
+
+    A 429 or an Etherscan rate-limit reply backs the limiter off (honouring
+    Retry-After) and raises RateLimitError; anything else counts as healthy.
+    """
+    if response.status == HTTP_RATE_LIMIT_CODE:
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        limiter.record_throttled(retry_after)
+        raise RateLimitError(limiter.name, retry_after)
+    response.raise_for_status()
+    data = await response.json()
+    if _is_rate_limit_reply(data):
+        limiter.record_throttled()
+        raise RateLimitError(limiter.name)
+    limiter.record_success()
+    return data
+
+async def etherscan_get(session: aiohttp.ClientSession, key_pool: ApiKeyPool, url: str, params: Dict) -> Dict:
+    """
+    One Etherscan GET on the pooled API key with the most budget left.
+
+    A rate-limit reply quarantines the key briefly (when there are others
+    to use) and raises RateLimitError; an auth error quarantines it for
+    longer and raises AsyncAPIError, so a retry goes to another key.
+    """
+    api_key = await key_pool.acquire_async()
+    async with session.get(url, params={**params, "apikey": api_key.key}) as response:
+        try:
+            data = await read_json(api_key.limiter, response)
+        except RateLimitError as e:
+            if len(key_pool) > 1:
+                key_pool.quarantine(api_key, str(e), retry_after=e.retry_after)
+            raise
+
+    if is_auth_error_reply(data):
+        message = data.get("result") or data.get("message")
+        key_pool.quarantine(api_key, message, auth=True)
+        raise AsyncAPIError(f"Etherscan rejected API key {api_key.label}: {message}")
+    key_pool.record_success(api_key)
+    return data
+
+def create_pooled_session() -> aiohttp.ClientSession:
+    """
+    Open a pooled session on the running event loop.
+
+    One connector serves every wallet sharing the session, so DNS lookups,
+    TCP connections and TLS handshakes to Etherscan and Hyperliquid are
+    reused across wallets and across cycles.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=MEMORY_MAX_CONNECTIONS,
+        limit_per_host=MEMORY_MAX_CONNECTIONS_PER_HOST,
+        ttl_dns_cache=MEMORY_DNS_CACHE_TTL,
+        keepalive_timeout=MEMORY_KEEPALIVE_TIMEOUT
+    )
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT_SECONDS),
+        connector=connector
+    )
+
+async def fetch_eth_balances(session: aiohttp.ClientSession, key_pool: ApiKeyPool, addresses: List[str],
+                             retry: Optional[RetryWithExponentialBackoff] = None) -> Dict[str, float]:
+    """
+    Fetch ETH balances with batched balancemulti calls, keyed by lowercase address.
+
+    N addresses cost ceil(N / 20) requests instead of N. Addresses whose
+    chunk failed are left out so their check falls back to a single-wallet lookup.
+    """
+    retry = retry or RetryWithExponentialBackoff(max_retries=3, base_delay=1.0, max_delay=30.0)
+    addresses = list(dict.fromkeys(address.lower() for address in addresses))
+    balances = {}
+
+    for start in range(0, len(addresses), ETHERSCAN_BALANCEMULTI_MAX_ADDRESSES):
+        chunk = addresses[start:start + ETHERSCAN_BALANCEMULTI_MAX_ADDRESSES]
+        try:
+            balances.update(await retry.execute(
+                endpoint_breaker(ETHERSCAN_API_URL, "balancemulti").call, _fetch_balance_chunk, session, key_pool, chunk
+            ))
+        except Exception as e:
+            print(f"⚠️ Batched balance lookup failed for {len(chunk)} wallets: {e}")
+    return balances
+
+def parse_balance_multi(result: List[Dict]) -> Dict[str, float]:
+    """Convert a balancemulti result list into {lowercase address: ETH balance}"""
+    balances = {}
+    for entry in result:
+        account = entry.get("account")
+        if account and entry.get("balance") is not None:
+            balances[account.lower()] = float(entry["balance"]) / WEI_TO_ETH_DIVISOR
+    return balances
+
+async def _fetch_balance_chunk(session: aiohttp.ClientSession, key_pool: ApiKeyPool,
+                               addresses: List[str]) -> Dict[str, float]:
+    """Fetch one balancemulti chunk (up to 20 addresses)"""
+    params = {
+        "chainid": ETHERSCAN_CHAIN_ID,
+        "module": "account",
+        "action": "balancemulti",
+        "address": ",".join(addresses),
+        "tag": "latest"
+    }
+
+    data = await etherscan_get(session, key_pool, ETHERSCAN_API_URL, params)
+    if data["status"] == "1":
+        return parse_balance_multi(data["result"])
+    raise AsyncAPIError(f"Etherscan balancemulti error: {data.get('message', 'Unknown error')}")
+
 class AsyncWalletTracker:
-    """High-performance async wallet tracker with concurrent processing"""
+    """
+    The wallet tracking core: fetching and change detection for one wallet.
 
-    def __init__(self, wallet_address: str, etherscan_api_key: str):
+    Both tracking paths run on it: the async multi-tracker directly and
+    sync callers through the blocking WalletTracker facade.
+    """
+
+    def __init__(self, wallet_address: str, etherscan_api_key: str,
+                 session: Optional[aiohttp.ClientSession] = None, key_pool: Optional[ApiKeyPool] = None):
         self.wallet_address = wallet_address
         self.etherscan_api_key = etherscan_api_key
         self.base_url = ETHERSCAN_API_URL
         self.hyperliquid_url = HYPERLIQUID_API_URL
         self.last_known_balance = None
         self.last_known_positions = None
+        # Highest block seen per Etherscan action, kept between cycles
+        self.tx_cursor = TransactionCursor()
 
-        # Initialize rate limiters
-        self.etherscan_throttler = SimpleThrottler(DEFAULT_RATE_LIMIT_ETHERSCAN)
-        self.hyperliquid_throttler = SimpleThrottler(DEFAULT_RATE_LIMIT_HYPERLIQUID)
-
-        # Initialize circuit breakers and retry mechanisms
-        self.etherscan_circuit_breaker = CircuitBreaker(
-            failure_threshold=3,
-            recovery_timeout=60,
-            expected_exception=(aiohttp.ClientError, asyncio.TimeoutError)
-        )
-
-        self.hyperliquid_circuit_breaker = CircuitBreaker(
-            failure_threshold=3,
-            recovery_timeout=60,
-            expected_exception=(aiohttp.ClientError, asyncio.TimeoutError)
-        )
+        # Process-wide key pool and rate limiters shared by every tracker
+        self.key_pool = key_pool or get_api_key_pool([etherscan_api_key])
+        self.hyperliquid_throttler = get_rate_limiter(UPSTREAM_HYPERLIQUID)
 
+        # Retry mechanisms; every attempt goes through the endpoint's shared circuit breaker
         self.etherscan_retry = RetryWithExponentialBackoff(
             max_retries=3,
             base_delay=1.0,
@@ -225,35 +289,59 @@ class AsyncWalletTracker:
             max_delay=20.0
         )
 
-        self.session = None
+        # An injected session is shared and owned by the caller; otherwise
+        # the tracker opens its own session for the duration of `async with`
+        self.session = session
+        self._owns_session = session is None
+
+    def attach_session(self, session: aiohttp.ClientSession):
+        """Use a shared pooled session owned by the caller"""
+        self.session = session
+        self._owns_session = False
 
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT_SECONDS),
-            connector=aiohttp.TCPConnector(limit=MAX_CONCURRENT_REQUESTS)
-        )
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT_SECONDS),
+                connector=aiohttp.TCPConnector(limit=MAX_CONCURRENT_REQUESTS)
+            )
+            self._owns_session = True
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        if self._owns_session:
+            await self.close()
 
     async def close(self):
-        """Close the session"""
-        if self.session:
+        """Close the session if this tracker owns it"""
+        if self.session and self._owns_session:
             await self.session.close()
             self.session = None
 
-    async def check_balance_change(self) -> Tuple[bool, float, float]:
-        """Check if balance has changed significantly"""
-        current_balance = await self.get_eth_balance_async()
+    def export_state(self) -> Dict:
+        """Compact snapshot of the change-detection state for the state store"""
+        return build_snapshot(self)
+
+    def restore_state(self, snapshot: Dict):
+        """Resume change detection from a saved snapshot"""
+        self.last_known_balance = snapshot.get("balance")
+        self.last_known_positions = snapshot.get("positions")
+        self.tx_cursor = TransactionCursor(snapshot.get("tx_cursor"))
+
+    async def check_balance_change(self, current_balance: Optional[float] = None) -> Tuple[bool, float, float]:
+        """Check if balance has changed significantly
+
+        current_balance can be supplied from a batched balancemulti lookup;
+        when it is None the balance is fetched for this wallet alone.
+        """
+        if current_balance is None:
+            current_balance = await self.get_eth_balance_async()
         if current_balance is None:
             return False, 0, 0
 
         if self.last_known_balance is None:
-            self.last_balance = current_balance
             self.last_known_balance = current_balance
             return False, current_balance, 0
 
@@ -263,7 +351,6 @@ class AsyncWalletTracker:
         else:
             significant_change = False
 
-        self.last_balance = current_balance
         self.last_known_balance = current_balance
         return significant_change, current_balance, change
 
@@ -345,15 +432,111 @@ class AsyncWalletTracker:
         else:
             return False, current_positions, "no_change"
 
-    async def check_deposit_withdrawal(self):
-        """Placeholder for deposit/withdrawal checking"""
-        # This would be implemented similar to the sync version
-        return False, []
+    async def check_deposit_withdrawal(self) -> Tuple[bool, List[Dict]]:
+        """Check for new deposit or withdrawal transactions (ETH and tokens)"""
+        try:
+            # txlist and tokentx are fetched concurrently under the shared limiter
+            (recent_eth_txs, eth_incremental), (recent_token_txs, token_incremental) = await asyncio.gather(
+                self._read_transactions_async(ETHERSCAN_ACTION_TXLIST, 5),
+                self._read_transactions_async(ETHERSCAN_ACTION_TOKENTX, 10)
+            )
+
+            all_transfers = filter_deposit_withdrawal(
+                self.wallet_address, recent_eth_txs, eth_incremental, recent_token_txs, token_incremental
+            )
+
+            if all_transfers:
+                return True, all_transfers
+            return False, []
+
+        except (ValueError, TypeError, KeyError) as e:
+            print(f"Error checking deposits/withdrawals: {e}")
+            return False, []
+
+    async def _read_transactions_async(self, action: str, limit: int) -> Tuple[List[Dict], bool]:
+        """
+        Read transactions through the block cursor.
+
+        Returns (transactions, incremental). Once the cursor is tracking the
+        action only blocks after it are requested; before that the latest
+        `limit` rows are read and the cursor is seeded from them.
+        """
+        if self.tx_cursor.is_tracking(action):
+            return await self.get_new_transactions_async(action), True
+        return await self.get_recent_transactions_async(action, limit), False
+
+    async def get_recent_transactions_async(self, action: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+        """Get the latest txlist/tokentx rows (one server-side page) and seed the block cursor"""
+        transactions = await self.get_account_transactions_async(action, limit)
+        self.tx_cursor.seed(action, transactions)
+        return transactions
+
+    async def get_new_transactions_async(self, action: str) -> List[Dict]:
+        """Get transactions in blocks after the cursor for txlist/tokentx, oldest first"""
+        start_block = self.tx_cursor.next_start_block(action)
+
+        new_transactions = []
+        for page in range(1, ETHERSCAN_MAX_PAGES + 1):
+            batch = await self.get_account_transactions_async(
+                action, ETHERSCAN_PAGE_SIZE, start_block=start_block, page=page, sort="asc"
+            )
+            new_transactions.extend(batch)
+            if len(batch) < ETHERSCAN_PAGE_SIZE:
+                break
+
+        # Only advance once every page arrived, so a failed read is retried next cycle
+        self.tx_cursor.advance(action, new_transactions)
+        return new_transactions
+
+    async def get_account_transactions_async(self, action: str, limit: int = DEFAULT_LIMIT,
+                                             start_block: int = 0, page: int = 1,
+                                             sort: str = "desc") -> List[Dict]:
+        """Fetch one page of txlist/tokentx results with circuit breaker and retry protection"""
+        async def fetch_transactions():
+            params = {
+                "chainid": ETHERSCAN_CHAIN_ID,
+                "module": "account",
+                "action": action,
+                "address": self.wallet_address,
+                "startblock": start_block,
+                "endblock": ETHERSCAN_END_BLOCK,
+                "page": page,
+                "offset": limit,
+                "sort": sort
+            }
+
+            data = await etherscan_get(self.session, self.key_pool, self.base_url, params)
+            if data["status"] == "1":
+                return data["result"][:limit]
+            message = data.get('message', 'Unknown error')
+            if "No transactions found" in message:
+                # This is normal, not an error - just no transactions
+                return []
+            raise AsyncAPIError(f"Etherscan API error ({action}): {message}")
+
+        # Apply retry and circuit breaker protection
+        return await self.etherscan_retry.execute(
+            endpoint_breaker(self.base_url, action).call,
+            fetch_transactions
+        )
 
     async def get_eth_balance_async(self) -> Optional[float]:
-        """Get current ETH balance with enhanced error handling"""
-        async with self.etherscan_throttler:
+        """
+        Get current ETH balance, falling back to the V1 API when V2 fails.
+
+        V2 is tried with retry and circuit breaker protection; once those
+        attempts are used up, whether on network or API errors, V1 is asked
+        once. Raises when neither returns a balance, so a failed lookup never
+        reads as 0 ETH.
+        """
+        try:
             return await self._get_eth_balance_with_protection()
+        except (aiohttp.ClientError, asyncio.TimeoutError, CircuitBreakerError, AsyncAPIError) as e:
+            print(f"⚠️ Etherscan V2 balance failed ({e}), trying V1 fallback...")
+            balance = await self._get_eth_balance_v1_fallback()
+            if balance is None:
+                raise
+            return balance
 
     async def _get_eth_balance_with_protection(self) -> Optional[float]:
         """Internal method with circuit breaker and retry protection"""
@@ -363,27 +546,18 @@ class AsyncWalletTracker:
                 "module": "account",
                 "action": "balance",
                 "address": self.wallet_address,
-                "tag": "latest",
-                "apikey": self.etherscan_api_key
+                "tag": "latest"
             }
 
-            async with self.session.get(self.base_url, params=params) as response:
-                response.raise_for_status()
-                data = await response.json()
-
-                if data["status"] == "1":
-                    return float(data["result"]) / WEI_TO_ETH_DIVISOR
-                else:
-                    error_msg = data.get('message', 'Unknown error')
-                    if "deprecated" in error_msg.lower():
-                        print("⚠️ Etherscan API deprecated, attempting fallback...")
-                        return await self._get_eth_balance_v1_fallback()
-                    else:
-                        raise AsyncAPIError(f"Etherscan API error: {error_msg}")
+            # Throttle every attempt, retries included, on a pooled key's limiter
+            data = await etherscan_get(self.session, self.key_pool, self.base_url, params)
+            if data["status"] == "1":
+                return float(data["result"]) / WEI_TO_ETH_DIVISOR
+            raise AsyncAPIError(f"Etherscan API error: {data.get('message', 'Unknown error')}")
 
         # Apply retry and circuit breaker protection
-        return await self.etherscan_circuit_breaker.call(
-            self.etherscan_retry.execute,
+        return await self.etherscan_retry.execute(
+            endpoint_breaker(self.base_url, "balance").call,
             fetch_balance
         )
 
@@ -394,27 +568,23 @@ class AsyncWalletTracker:
                 "module": "account",
                 "action": "balance",
                 "address": self.wallet_address,
-                "tag": "latest",
-                "apikey": self.etherscan_api_key
+                "tag": "latest"
             }
 
-            async with self.session.get(ETHERSCAN_API_URL_V1, params=params) as response:
-                response.raise_for_status()
-                data = await response.json()
-
-                if data["status"] == "1":
-                    return float(data["result"]) / WEI_TO_ETH_DIVISOR
-                else:
-                    print(f"⚠️ V1 fallback also failed: {data.get('message', 'Unknown error')}")
-                    return None
+            data = await endpoint_breaker(ETHERSCAN_API_URL_V1, "balance").call(
+                etherscan_get, self.session, self.key_pool, ETHERSCAN_API_URL_V1, params
+            )
+            if data["status"] == "1":
+                return float(data["result"]) / WEI_TO_ETH_DIVISOR
+            print(f"⚠️ V1 fallback also failed: {data.get('message', 'Unknown error')}")
+            return None
         except Exception as e:
             print(f"⚠️ V1 fallback error: {e}")
             return None
 
     async def get_hyperliquid_positions_async(self) -> Optional[Dict]:
         """Get Hyperliquid perpetual positions with enhanced error handling"""
-        async with self.hyperliquid_throttler:
-            return await self._get_hyperliquid_positions_with_protection()
+        return await self._get_hyperliquid_positions_with_protection()
 
     async def _get_hyperliquid_positions_with_protection(self) -> Optional[Dict]:
         """Internal method with circuit breaker and retry protection"""
@@ -424,9 +594,9 @@ class AsyncWalletTracker:
                 "user": self.wallet_address
             }
 
+            await self.hyperliquid_throttler.acquire_async()
             async with self.session.post(self.hyperliquid_url, json=payload) as response:
-                response.raise_for_status()
-                data = await response.json()
+                data = await read_json(self.hyperliquid_throttler, response)
 
                 if data and "marginSummary" in data:
                     return data
@@ -434,89 +604,425 @@ class AsyncWalletTracker:
                     raise AsyncAPIError("Invalid response format from Hyperliquid API")
 
         # Apply retry and circuit breaker protection
-        return await self.hyperliquid_circuit_breaker.call(
-            self.hyperliquid_retry.execute,
+        return await self.hyperliquid_retry.execute(
+            endpoint_breaker(self.hyperliquid_url, "clearinghouseState").call,
             fetch_positions
         )
 
+    async def check_wallet(self, prefetched_balance: Optional[float] = None) -> Dict:
+        """
+        Check balance, positions and deposits/withdrawals in one go.
+
+        The three checks run concurrently, so a wallet costs the slowest round
+        trip instead of their sum. A failed part is reported under "errors"
+        and reads as "no change" while the other parts keep their data; the
+        result gets an "error" key when every part that made a request failed.
+        A prefetched balance can't fail, so then positions and deposits
+        failing together are enough.
+        """
+        # Read before the balance check moves the baseline
+        old_balance = self.last_known_balance
+
+        results = await asyncio.gather(
+            self.check_balance_change(prefetched_balance),
+            self.check_position_changes(),
+            self.check_deposit_withdrawal(),
+            return_exceptions=True
+        )
+
+        errors = {}
+        fallbacks = ((False, 0, 0), (False, {}, "position_data_unavailable"), (False, []))
+        parts = []
+        for part, result, fallback in zip(("balance", "positions", "deposits"), results, fallbacks):
+            if isinstance(result, BaseException):
+                print(f"⚠️ Wallet {format_address(self.wallet_address)} {part} check failed: {type(result).__name__}: {result}")
+                errors[part] = str(result)
+                result = fallback
+            parts.append(result)
+
+        (balance_changed, new_balance, balance_change), \
+            (positions_changed, new_positions, change_type), \
+            (has_deposit_withdrawal, deposit_txs) = parts
+
+        # Validate new_positions is a dict
+        if new_positions is not None and not isinstance(new_positions, dict):
+            print(f"⚠️ Warning: new_positions is not a dict: {type(new_positions)} - {new_positions}")
+            new_positions = {}
+
+        result = {
+            "balance_changed": balance_changed,
+            "new_balance": new_balance,
+            "balance_change": balance_change,
+            "old_balance": old_balance if old_balance is not None else new_balance,
+            "positions_changed": positions_changed,
+            "new_positions": new_positions,
+            "position_change_type": change_type,
+            "deposit_withdrawal": has_deposit_withdrawal,
+            "deposit_transactions": deposit_txs,
+            "timestamp": datetime.now().isoformat()
+        }
+        if errors:
+            result["errors"] = errors
+            requested = ("positions", "deposits") if prefetched_balance is not None else ("balance", "positions", "deposits")
+            if all(part in errors for part in requested):
+                result["error"] = "; ".join(f"{part}: {error}" for part, error in errors.items())
+        return result
+
     async def get_summary(self) -> Dict:
-        """Get comprehensive wallet summary"""
-        balance = await self.get_eth_balance_async()
-        positions = await self.get_hyperliquid_positions_async()
+        """
+        Get comprehensive wallet summary.
+
+        Balance, positions and the latest transactions are fetched
+        concurrently. A part that fails is reported under "errors" and left
+        empty; only when balance and positions both fail does the summary
+        carry an "error" key.
+        """
+        balance, positions, recent_txs, token_txs = await asyncio.gather(
+            self.get_eth_balance_async(),
+            self.get_hyperliquid_positions_async(),
+            self.get_recent_transactions_async(ETHERSCAN_ACTION_TXLIST, 5),
+            self.get_recent_transactions_async(ETHERSCAN_ACTION_TOKENTX, 5),
+            return_exceptions=True
+        )
 
-        return {
+        errors = {}
+        if isinstance(balance, BaseException):
+            errors["balance"] = str(balance)
+            balance = None
+        if isinstance(positions, BaseException):
+            errors["positions"] = str(positions)
+            positions = None
+        if isinstance(recent_txs, BaseException):
+            errors["transactions"] = str(recent_txs)
+            recent_txs = []
+        if isinstance(token_txs, BaseException):
+            errors["token_transfers"] = str(token_txs)
+            token_txs = []
+
+        summary = {
             "wallet_address": self.wallet_address,
             "eth_balance": balance if balance is not None else 0.0,
             "hyperliquid_positions": positions,
+            "position_stats": self.calculate_position_stats(positions) if positions else {},
+            "recent_transactions": recent_txs,
+            "token_transfers": token_txs,
             "timestamp": datetime.now().isoformat()
         }
+        if errors:
+            summary["errors"] = errors
+            if "balance" in errors and "positions" in errors:
+                summary["error"] = f"balance: {errors['balance']}; positions: {errors['positions']}"
+        return summary
+
+    @staticmethod
+    def calculate_position_stats(positions: Dict) -> Dict:
+        """
+        Hyperliquid / HyperDash istatistiklerini tek noktadan okur.
+
+        NOT:
+        - Win rate, leverage vb. metrikler bizim lokal hesapladığımız değerler
+          değil; HyperDash / backend tarafında zaten hesaplanmış geliyor.
+        - Burada amaç:
+          • Gelen JSON içindeki hazır alanları güvenli şekilde çekmek,
+          • Eksikse 0'a düşmek ama asla yanlış formülle "uydurmamak".
+        """
+        try:
+            # HyperDash / backend response yapısı üzerinden okuma
+            stats = positions.get("stats") or positions.get("hyperdashStats") or {}
+
+            # Asset positions'ı al
+            asset_positions = positions.get("assetPositions", [])
+
+            def _f(v, default=0.0):
+                try:
+                    if v is None or v == "":
+                        return float(default)
+                    return float(v)
+                except (TypeError, ValueError):
+                    return float(default)
+
+            account_value = _f(stats.get("account_value", stats.get("accountValue", 0.0)))
+            total_position_value = _f(stats.get("total_position_value", stats.get("totalPositionValue", 0.0)))
+            long_value = _f(stats.get("long_value", stats.get("longValue", 0.0)))
+            short_value = _f(stats.get("short_value", stats.get("shortValue", 0.0)))
+            total_unrealized_pnl = _f(stats.get("total_unrealized_pnl", stats.get("totalUnrealizedPnl", 0.0)))
+
+            # Hazır gelen metrikler (HyperDash kaynaklı)
+            win_rate = _f(stats.get("win_rate", 0.0))
+            leverage = _f(stats.get("leverage", 0.0))
+            roe_percentage = _f(stats.get("roe_percentage", stats.get("roe", 0.0)))
+
+            position_count = int(_f(stats.get("position_count", stats.get("open_positions", 0))))
+            winning_positions = int(_f(stats.get("winning_positions", stats.get("profitable_positions", 0))))
+
+            long_pct = _f(stats.get("long_percentage", stats.get("longPct", 0.0)))
+            short_pct = _f(stats.get("short_percentage", stats.get("shortPct", 0.0)))
+
+            # Pozisyonlardan hesaplanan toplamlar (açık pozisyon yoksa 0 kalır)
+            total_pnl = 0.0
+            total_position_val = 0.0
+            long_val = 0.0
+            short_val = 0.0
+
+            # Eğer API'dan stats gelmediyse, pozisyonlardan hesapla
+            if position_count == 0 and asset_positions:
+                # Pozisyonlardan stats hesapla
+                positions = []
+                total_margin = 0.0
+                win_count = 0
+                leverage_sum = 0.0
+
+                for pos_data in asset_positions:
+                    if "position" in pos_data and pos_data["position"]:
+                        position = pos_data["position"]
+                        size = float(position.get("szi", 0))
+
+                        if size != 0:  # Sadece aktif pozisyonlar
+                            pnl = float(position.get("unrealizedPnl", 0))
+                            pos_val = float(position.get("positionValue", 0))
+                            margin = float(position.get("marginUsed", 0))
+                            lev = float(position.get("leverage", {}).get("value", 0))
+
+                            positions.append(position)
+                            total_pnl += pnl
+                            total_position_val += pos_val
+                            total_margin += margin
+                            leverage_sum += lev if lev > 0 else 1
+
+                            if size > 0:
+                                long_val += pos_val
+                            else:
+                                short_val += pos_val
+
+                            # Win rate: pozitif PnL olan pozisyonlar
+                            if pnl > 0:
+                                win_count += 1
+
+                position_count = len(positions)
+                winning_positions = win_count
+                win_rate = (win_count / position_count * 100) if position_count > 0 else 0.0
+                leverage = leverage_sum / position_count if position_count > 0 else 0.0
+                long_pct = (long_val / total_position_val * 100) if total_position_val > 0 else 0.0
+                short_pct = (short_val / total_position_val * 100) if total_position_val > 0 else 0.0
+
+            return {
+                "account_value": account_value,
+                "total_position_value": total_position_value if total_position_value > 0 else total_position_val,
+                "long_value": long_value if long_value > 0 else long_val,
+                "short_value": short_value if short_value > 0 else short_val,
+                "total_unrealized_pnl": total_unrealized_pnl if total_unrealized_pnl != 0 else total_pnl,
+                "position_count": position_count,
+                "winning_positions": winning_positions,
+                "win_rate": win_rate,
+                "roe_percentage": roe_percentage,
+                "leverage": leverage,
+                "long_percentage": long_pct,
+                "short_percentage": short_pct,
+            }
+        except (ValueError, TypeError, KeyError, ZeroDivisionError) as e:
+            print(f"Error reading external position stats: {e}")
+            return {}
 
 # Multi-wallet async tracker for concurrent processing
 class AsyncMultiWalletTracker:
     """Multi-wallet tracker with concurrent processing capabilities"""
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, wallets: Optional[Dict[str, Dict]] = None,
+                 key_pool: Optional[ApiKeyPool] = None):
         self.config = config
-        self.wallet_configs = config.get("wallets", {})
+        self.wallet_configs = wallets if wallets is not None else config.get("wallets", {})
         self.trackers = {}
         self.notification_systems = {}
+        self.etherscan_api_key = config.get("etherscan_api_key", "")
+        # Size of the worker pool that checks wallets
+        self.max_concurrent_wallets = max(1, config.get("max_concurrent_wallets", DEFAULT_MAX_CONCURRENT_WALLETS))
+
+        # Pooled session shared by every tracker, bound to the loop that created it
+        self.session = None
+        self._session_loop = None
+
+        # Every tracker and the batched balance lookups share one Etherscan key pool
+        self.key_pool = key_pool or get_api_key_pool(config.get("etherscan_api_keys") or [self.etherscan_api_key])
+        self.etherscan_retry = RetryWithExponentialBackoff(
+            max_retries=3,
+            base_delay=1.0,
+            max_delay=30.0
+        )
 
         # Initialize async trackers for each wallet
         for wallet_id, wallet_config in self.wallet_configs.items():
             if wallet_config.get("enabled", True):
-                self.trackers[wallet_id] = AsyncWalletTracker(
-                    wallet_config["address"],
-                    config.get("etherscan_api_key", "")
-                )
-
-    async def check_all_wallets_async(self) -> Dict[str, Dict]:
-        """Check all wallets concurrently"""
-        tasks = []
-        wallet_ids = []
-
-        # Create tasks for all enabled wallets
-        for wallet_id, tracker in self.trackers.items():
-            tasks.append(self._check_single_wallet_async(wallet_id, tracker))
-            wallet_ids.append(wallet_id)
+                self.add_wallet(wallet_id, wallet_config)
+
+    def add_wallet(self, wallet_id: str, wallet_config: Dict) -> AsyncWalletTracker:
+        """Start tracking a wallet; it joins the next cycle on the existing pooled session"""
+        tracker = AsyncWalletTracker(wallet_config["address"], self.etherscan_api_key, key_pool=self.key_pool)
+        if self.session is not None and not self.session.closed:
+            tracker.attach_session(self.session)
+        self.trackers[wallet_id] = tracker
+        return tracker
+
+    def remove_wallet(self, wallet_id: str) -> Optional[AsyncWalletTracker]:
+        """Stop tracking a wallet; the shared session stays open for the others"""
+        return self.trackers.pop(wallet_id, None)
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared pooled session, creating it on the running event loop.
+
+        One connector serves every wallet, so DNS lookups, TCP connections and
+        TLS handshakes to Etherscan and Hyperliquid are reused across wallets
+        and across cycles for as long as the event loop lives.
+        """
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._session_loop is not loop:
+            self.session = create_pooled_session()
+            self._session_loop = loop
+
+            for tracker in self.trackers.values():
+                tracker.attach_session(self.session)
+
+        return self.session
+
+    async def get_eth_balances_async(self, wallet_ids: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Fetch ETH balances for all tracked wallets (or only wallet_ids) with batched balancemulti calls.
+
+        Returns {wallet_id: balance}. Wallets whose chunk failed are left out so
+        their check_balance_change falls back to a single-wallet lookup.
+        """
+        wallet_ids = list(self.trackers) if wallet_ids is None else wallet_ids
+        address_by_wallet = {
+            wallet_id: self.trackers[wallet_id].wallet_address.lower()
+            for wallet_id in wallet_ids
+        }
+        session = await self.get_session()
+        balances_by_address = await fetch_eth_balances(
+            session, self.key_pool, list(address_by_wallet.values()), self.etherscan_retry
+        )
 
-        # Execute all tasks concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return {
+            wallet_id: balances_by_address[address]
+            for wallet_id, address in address_by_wallet.items()
+            if address in balances_by_address
+        }
 
-        # Process results
+    async def check_all_wallets_async(self) -> Dict[str, Dict]:
+        """Check all wallets concurrently on the bounded worker pool"""
         wallet_results = {}
-        for i, result in enumerate(results):
-            wallet_id = wallet_ids[i]
+        async for wallet_id, result in self.iter_check_results_async():
+            wallet_results[wallet_id] = result
+        return wallet_results
+
+    async def iter_check_results_async(self, wallet_ids: Optional[List[str]] = None, stop_at: Optional[float] = None,
+                                       cancel_at: Optional[float] = None) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Check wallets on the bounded worker pool, yielding (wallet_id, result) as each finishes.
+
+        Results come out in completion order, so callers can act on a wallet
+        without waiting for the slowest one in the cycle. Wallets are started
+        in the given order until stop_at (time.monotonic()); checks still
+        running at cancel_at are cancelled with their tracker state rolled
+        back. Neither kind is yielded, so the caller sees them as deferred.
+        """
+        wallet_ids = list(self.trackers) if wallet_ids is None else [
+            wallet_id for wallet_id in wallet_ids if wallet_id in self.trackers
+        ]
+
+        # Attach the pooled session before any tracker makes a request
+        await self.get_session()
+
+        # One batched balance lookup serves every wallet in this cycle
+        balances = await self.get_eth_balances_async(wallet_ids)
+
+        async def check(wallet_id: str) -> Dict:
+            tracker = self.trackers[wallet_id]
+            check_wallet = self._check_single_wallet_async(wallet_id, tracker, balances.get(wallet_id))
+            if cancel_at is None:
+                return await check_wallet
+
+            # A cancelled check may have moved some baselines without reporting the
+            # change; restoring them lets the next cycle detect it again
+            snapshot = tracker.export_state()
+            try:
+                return await asyncio.wait_for(check_wallet, max(0.0, cancel_at - time.monotonic()))
+            except asyncio.TimeoutError:
+                tracker.restore_state(snapshot)
+                raise CheckDeferred(f"Check of wallet {wallet_id} hit the cycle deadline")
+
+        async for wallet_id, result in self._iter_bounded(wallet_ids, check, stop_at=stop_at):
+            if isinstance(result, CheckDeferred):
+                continue
             if isinstance(result, Exception):
                 print(f"❌ Error checking wallet {wallet_id}: {result}")
-                wallet_results[wallet_id] = {"error": str(result), "success": False}
+                yield wallet_id, {"error": str(result), "success": False}
             else:
-                wallet_results[wallet_id] = {**result, "success": True}
-
-        return wallet_results
-
-    async def _check_single_wallet_async(self, wallet_id: str, tracker: AsyncWalletTracker) -> Dict:
-        """Check a single wallet asynchronously"""
+                yield wallet_id, {**result, "success": "error" not in result}
+
+    async def _iter_bounded(self, wallet_ids: List[str], func: Callable[[str], Awaitable[Any]],
+                            max_concurrent: Optional[int] = None,
+                            stop_at: Optional[float] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Run func(wallet_id) on a fixed pool of workers pulling from a queue.
+
+        Only max_concurrent (default max_concurrent_wallets) coroutines exist
+        at any time, whatever the wallet count. The result queue is bounded
+        too, so workers pause when the consumer falls behind. Workers take no
+        new wallet after stop_at (time.monotonic()). Yields (wallet_id, result
+        or exception) for every wallet that was started.
+        """
+        if not wallet_ids:
+            return
+        pool_size = max(1, max_concurrent or self.max_concurrent_wallets)
+
+        pending = asyncio.Queue()
+        for wallet_id in wallet_ids:
+            pending.put_nowait(wallet_id)
+        finished = asyncio.Queue(maxsize=pool_size)
+
+        async def worker():
+            while stop_at is None or time.monotonic() < stop_at:
+                try:
+                    wallet_id = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                try:
+                    result = await func(wallet_id)
+                except Exception as e:
+                    result = e
+                await finished.put((wallet_id, result))
+            # Tell the consumer this worker is done
+            await finished.put(None)
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(pool_size, len(wallet_ids)))
+        ]
+        try:
+            running = len(workers)
+            while running:
+                item = await finished.get()
+                if item is None:
+                    running -= 1
+                    continue
+                yield item
+        finally:
+            # Also runs when the consumer stops early
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _check_single_wallet_async(self, wallet_id: str, tracker: AsyncWalletTracker,
+                                         prefetched_balance: Optional[float] = None) -> Dict:
+        """
+        Check a single wallet asynchronously.
+
+        Balance (Etherscan), positions (Hyperliquid) and deposits (Etherscan)
+        are checked concurrently by the tracker core; see AsyncWalletTracker.check_wallet.
+        """
         async with tracker:
             try:
-                balance_changed, new_balance, balance_change = await tracker.check_balance_change()
-                positions_changed, new_positions, change_type = await tracker.check_position_changes()
-
-                # Validate new_positions is a dict
-                if new_positions is not None and not isinstance(new_positions, dict):
-                    print(f"⚠️ Warning: new_positions is not a dict: {type(new_positions)} - {new_positions}")
-                    new_positions = {}
-
-                return {
-                    "wallet_id": wallet_id,
-                    "balance_changed": balance_changed,
-                    "new_balance": new_balance,
-                    "balance_change": balance_change,
-                    "old_balance": self.last_balance if hasattr(self, 'last_balance') else 0,
-                    "positions_changed": positions_changed,
-                    "new_positions": new_positions,
-                    "position_change_type": change_type,
-                    "timestamp": datetime.now().isoformat()
-                }
+                return {"wallet_id": wallet_id, **await tracker.check_wallet(prefetched_balance)}
             except Exception as e:
                 print(f"❌ Error checking wallet {wallet_id}: {e}")
                 import traceback
@@ -528,20 +1034,19 @@ class AsyncMultiWalletTracker:
                     "timestamp": datetime.now().isoformat()
                 }
 
-    async def get_all_summaries_async(self) -> Dict[str, Dict]:
-        """Get summaries for all wallets concurrently"""
-        tasks = []
-        wallet_ids = []
-
-        for wallet_id, tracker in self.trackers.items():
-            tasks.append(self._get_wallet_summary_async(wallet_id, tracker))
-            wallet_ids.append(wallet_id)
+    async def get_all_summaries_async(self, wallet_ids: Optional[List[str]] = None,
+                                      max_concurrent: Optional[int] = None) -> Dict[str, Dict]:
+        """Get summaries for all wallets (or only wallet_ids) concurrently on the bounded worker pool"""
+        wallet_ids = list(self.trackers) if wallet_ids is None else [
+            wallet_id for wallet_id in wallet_ids if wallet_id in self.trackers
+        ]
+        await self.get_session()
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def summarize(wallet_id: str) -> Dict:
+            return await self._get_wallet_summary_async(wallet_id, self.trackers[wallet_id])
 
         wallet_summaries = {}
-        for i, result in enumerate(results):
-            wallet_id = wallet_ids[i]
+        async for wallet_id, result in self._iter_bounded(wallet_ids, summarize, max_concurrent):
             if isinstance(result, Exception):
                 wallet_summaries[wallet_id] = {"error": str(result)}
             else:
@@ -560,10 +1065,15 @@ class AsyncMultiWalletTracker:
             return {"wallet_id": wallet_id, **summary}
 
     async def close_all(self):
-        """Close all tracker sessions"""
+        """Close all tracker sessions and the shared pool"""
         for tracker in self.trackers.values():
             await tracker.close()
 
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self._session_loop = None
+
 # Utility functions for standalone usage
 async def run_wallet_checks(config: Dict) -> Dict[str, Dict]:
     """Run checks for all configured wallets"""
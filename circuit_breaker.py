@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker - Process-wide breakers shared per upstream host and endpoint
+"""
+
+import asyncio
+import collections
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from constants import (
+    # Circuit breakers
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+    CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS,
+    CIRCUIT_BREAKER_HISTORY
+)
+
+# Breaker states
+STATE_CLOSED = "CLOSED"
+STATE_OPEN = "OPEN"
+STATE_HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitBreakerError(Exception):
+    """The breaker is open or its probe slots are taken; the request was not sent"""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker Pattern implementation for API resilience.
+
+    One breaker guards one upstream endpoint for every wallet, so failures
+    from all callers count together. After failure_threshold consecutive
+    failures it opens and rejects calls without sending them. Once
+    recovery_timeout has passed it turns half-open and lets at most
+    half_open_max_calls probes through: a successful probe closes it, a
+    failed one opens it again. Transitions and outage durations are kept
+    for the cycle logs.
+    """
+
+    def __init__(self, name: str = "circuit", failure_threshold: int = CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                 recovery_timeout: float = CIRCUIT_BREAKER_RECOVERY_TIMEOUT, expected_exception: type = Exception,
+                 half_open_max_calls: int = CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.expected_exception = expected_exception
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self.clock = clock
+        self.failure_count = 0
+        self.last_failure_time = None
+        self.state = STATE_CLOSED
+        self.opened_at: Optional[float] = None
+        self._outage_started: Optional[float] = None
+        self._probes = 0
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.rejected = 0
+        self.opened_count = 0
+        self.total_open_seconds = 0.0
+        self.last_open_duration: Optional[float] = None
+        # (wall-clock time, from state, to state)
+        self.transitions = collections.deque(maxlen=CIRCUIT_BREAKER_HISTORY)
+
+    async def call(self, func, *args, **kwargs):
+        """Execute function with circuit breaker protection"""
+        probe = self._before_call()
+        try:
+            if asyncio.iscoroutinefunction(func):
+                result = await func(*args, **kwargs)
+            else:
+                result = func(*args, **kwargs)
+        except self.expected_exception:
+            self._on_failure(probe)
+            raise
+        except BaseException:
+            # Neither success nor failure (cancelled, API-level error): just free the probe slot
+            self._release_probe(probe)
+            raise
+
+        self._on_success(probe)
+        return result
+
+    def _before_call(self) -> bool:
+        """Let the call through or raise CircuitBreakerError; True when the call is a half-open probe"""
+        with self._lock:
+            now = self.clock()
+            if self.state == STATE_OPEN:
+                if now - self.opened_at < self.recovery_timeout:
+                    self.rejected += 1
+                    remaining = self.recovery_timeout - (now - self.opened_at)
+                    raise CircuitBreakerError(f"Circuit breaker {self.name} is OPEN, next probe in {remaining:.0f}s")
+                self._transition(STATE_HALF_OPEN, now)
+
+            if self.state == STATE_HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    self.rejected += 1
+                    raise CircuitBreakerError(f"Circuit breaker {self.name} is HALF_OPEN, waiting for the probe")
+                self._probes += 1
+                return True
+            return False
+
+    def _release_probe(self, probe: bool):
+        if probe:
+            with self._lock:
+                self._probes -= 1
+
+    def _on_success(self, probe: bool):
+        """Handle successful function call"""
+        outage = None
+        with self._lock:
+            if probe:
+                self._probes -= 1
+            # Only a probe closes a tripped breaker; a call that started before it
+            # opened proves nothing about the upstream now
+            if self.state == STATE_CLOSED:
+                self.failure_count = 0
+            elif probe and self.state == STATE_HALF_OPEN:
+                self.failure_count = 0
+                outage = self._transition(STATE_CLOSED, self.clock())
+        if outage is not None:
+            print(f"✅ Circuit breaker {self.name} closed after {outage:.0f}s")
+
+    def _on_failure(self, probe: bool):
+        """Handle failed function call"""
+        with self._lock:
+            if probe:
+                self._probes -= 1
+            self.failure_count += 1
+            self.last_failure_time = time.time()
+            now = self.clock()
+            # A failed probe reopens at once; otherwise wait for the threshold
+            opened = (
+                self.state == STATE_HALF_OPEN
+                or (self.state == STATE_CLOSED and self.failure_count >= self.failure_threshold)
+            )
+            if opened:
+                self._transition(STATE_OPEN, now)
+        if opened:
+            print(f"🔌 Circuit breaker {self.name} OPEN after {self.failure_count} failure(s), "
+                  f"probing again in {self.recovery_timeout:g}s")
+
+    def _transition(self, state: str, now: float) -> Optional[float]:
+        """Move to state with the lock held; returns the outage length when the breaker closes"""
+        if state == self.state:
+            return None
+        outage = None
+        if state == STATE_OPEN:
+            self.opened_at = now
+            self.opened_count += 1
+            if self._outage_started is None:
+                self._outage_started = now
+        elif state == STATE_HALF_OPEN:
+            self._probes = 0
+        elif state == STATE_CLOSED and self._outage_started is not None:
+            outage = now - self._outage_started
+            self.last_open_duration = outage
+            self.total_open_seconds += outage
+            self._outage_started = None
+        self.transitions.append((time.time(), self.state, state))
+        self.state = state
+        return outage
+
+    def get_state(self) -> str:
+        """Get current circuit breaker state"""
+        return self.state
+
+    def get_stats(self) -> Dict:
+        """State, failure counters and outage durations"""
+        with self._lock:
+            now = self.clock()
+            return {
+                "name": self.name,
+                "state": self.state,
+                "failure_count": self.failure_count,
+                "opened": self.opened_count,
+                "rejected": self.rejected,
+                "open_for": now - self._outage_started if self._outage_started is not None else 0.0,
+                "last_open_duration": self.last_open_duration,
+                "total_open_seconds": self.total_open_seconds,
+                "transitions": list(self.transitions)
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def circuit_breaker_name(url: str, endpoint: str = "") -> str:
+    """Registry key: upstream host and path, plus the endpoint (action/request type) when given"""
+    parts = urlsplit(url)
+    name = f"{parts.netloc}{parts.path}"
+    return f"{name} {endpoint}" if endpoint else name
+
+
+def get_circuit_breaker(url: str, endpoint: str = "", expected_exception: type = Exception) -> CircuitBreaker:
+    """Get the process-wide breaker for an upstream endpoint, creating it on first use"""
+    name = circuit_breaker_name(url, endpoint)
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, expected_exception=expected_exception)
+            _breakers[name] = breaker
+        return breaker
+
+
+def get_circuit_breaker_stats() -> List[Dict]:
+    """Get statistics for every breaker created so far"""
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return [breaker.get_stats() for breaker in breakers]
+
+
+def format_circuit_breaker_stats() -> str:
+    """One-line summary of the breakers that have tripped, for cycle logs; empty when all stayed closed"""
+    parts = []
+    for stats in get_circuit_breaker_stats():
+        if not stats["opened"]:
+            continue
+        details = [f"opened {stats['opened']}x", f"{stats['rejected']} rejected"]
+        if stats["open_for"]:
+            details.append(f"down {stats['open_for']:.0f}s")
+        if stats["last_open_duration"] is not None:
+            details.append(f"last outage {stats['last_open_duration']:.0f}s")
+        parts.append(f"{stats['name']} {stats['state']} ({', '.join(details)})")
+    return ", ".join(parts)
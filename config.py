@@ -1,7 +1,6 @@
 import os
 import re
-from dotenv import load_dotenv
-from typing import Dict, Any
+from typing import Dict, Any, List, Mapping, Optional
 
 # Import centralized constants
 from constants import (
@@ -31,11 +30,47 @@ from constants import (
     ENV_FILE,
 
     # Validation patterns
-    ETH_ADDRESS_PATTERN
+    ETH_ADDRESS_PATTERN,
+
+    # Rate limiting
+    DEFAULT_RATE_LIMIT_ETHERSCAN,
+    DEFAULT_RATE_LIMIT_HYPERLIQUID,
+    DEFAULT_RATE_LIMIT_TELEGRAM,
+    MIN_RATE_LIMIT,
+    MAX_RATE_LIMIT,
+    UPSTREAM_ETHERSCAN,
+    UPSTREAM_HYPERLIQUID,
+    UPSTREAM_TELEGRAM,
+
+    # Adaptive polling
+    ADAPTIVE_POLL_MIN_INTERVAL,
+    ADAPTIVE_POLL_MAX_INTERVAL,
+    ADAPTIVE_POLL_DORMANT_AFTER,
+    MIN_CHECK_INTERVAL,
+    SECONDS_PER_DAY,
+    SCHEDULE_MODE_BURST,
+    SCHEDULE_MODE_SPREAD,
+    DEFAULT_SCHEDULE_MODE,
+
+    # Batch processing
+    DEFAULT_MAX_CONCURRENT_WALLETS,
+    MAX_ASYNC_CONCURRENT_TASKS,
+
+    # State persistence
+    STATE_BACKEND_SQLITE,
+    STATE_BACKEND_NONE,
+    DEFAULT_STATE_BACKEND,
+    DEFAULT_STATE_DB_PATH,
+
+    # Sharding
+    DEFAULT_SHARD_LEASE_PATH,
+    DEFAULT_SHARD_LEASE_TTL,
+    MAX_SHARD_COUNT,
+
+    # API key pool
+    MAX_ETHERSCAN_API_KEYS
 )
-
-# Load environment variables from .env file
-load_dotenv()
+from wallet_registry import WalletRegistry, WalletRegistryError, load_wallet_registry
 
 class ConfigurationError(Exception):
     """Configuration related errors"""
@@ -58,60 +93,57 @@ def validate_required_env_var(key: str, value: str, allow_default: bool = False)
 
     return value
 
-def load_wallets_config() -> Dict[str, Dict[str, Any]]:
-    """Load wallet configuration from JSON or individual environment variables"""
-    wallets = {}
-
-    # Try to load from JSON configuration first
-    wallets_json = os.getenv("WALLETS_JSON", "")
-    if wallets_json:
-        try:
-            import json
-            raw_wallets = json.loads(wallets_json)
-
-            for wallet_id, wallet_data in raw_wallets.items():
-                if not isinstance(wallet_data, dict):
-                    continue
-
-                address = wallet_data.get("address", "")
-                if not validate_ethereum_address(address):
-                    raise ConfigurationError(f"Invalid Ethereum address in WALLETS_JSON: {address}")
-
-                wallets[wallet_id] = {
-                    "address": address,
-                    "name": wallet_data.get("name", f"Wallet {wallet_id}"),
-                    "enabled": wallet_data.get("enabled", True),
-                    "telegram_chat_id": wallet_data.get("telegram_chat_id"),
-                    "email_recipient": wallet_data.get("email_recipient")
-                }
-        except json.JSONDecodeError as e:
-            raise ConfigurationError(f"Invalid JSON in WALLETS_JSON: {e}")
-
-    # Fallback to individual wallet environment variables
-    if not wallets:
-        # Check for wallets from WALLET_1 to WALLET_100 to support gaps
-        for i in range(1, 101):
-            address_key = f"WALLET_{i}_ADDRESS"
-            name_key = f"WALLET_{i}_NAME"
-            enabled_key = f"WALLET_{i}_ENABLED"
-
-            address = os.getenv(address_key, "")
-            if not address:
-                continue  # Skip if no address, but don't break - allow gaps
-
-            if not validate_ethereum_address(address):
-                raise ConfigurationError(f"Invalid Ethereum address in {address_key}: {address}")
-
-            wallet_id = f"wallet_{i}"
-            wallets[wallet_id] = {
-                "address": address,
-                "name": os.getenv(name_key, f"Wallet {i}"),
-                "enabled": os.getenv(enabled_key, "true").lower() == "true",
-                "telegram_chat_id": os.getenv(f"WALLET_{i}_TELEGRAM_CHAT_ID"),
-                "email_recipient": os.getenv(f"WALLET_{i}_EMAIL_RECIPIENT")
-            }
-
-    return wallets
+def validate_rate_limit(key: str, default: float) -> float:
+    """Read a requests-per-second limit and keep it inside the safety bounds"""
+    rate = float(os.getenv(key, str(default)))
+    if not MIN_RATE_LIMIT <= rate <= MAX_RATE_LIMIT:
+        raise ConfigurationError(f"{key} must be between {MIN_RATE_LIMIT} and {MAX_RATE_LIMIT} requests per second")
+    return rate
+
+def validate_int_range(key: str, default: int, minimum: int, maximum: int) -> int:
+    """Read an integer setting and keep it inside [minimum, maximum]"""
+    value = int(os.getenv(key, str(default)))
+    if not minimum <= value <= maximum:
+        raise ConfigurationError(f"{key} must be between {minimum} and {maximum}")
+    return value
+
+def load_etherscan_api_keys() -> List[str]:
+    """ETHERSCAN_API_KEY plus the comma-separated ETHERSCAN_API_KEYS, deduplicated in order"""
+    keys = [os.getenv("ETHERSCAN_API_KEY", "")] + os.getenv("ETHERSCAN_API_KEYS", "").split(",")
+    keys = list(dict.fromkeys(key.strip() for key in keys if key.strip()))
+    if not keys:
+        raise ConfigurationError("Required environment variable ETHERSCAN_API_KEY (or ETHERSCAN_API_KEYS) is not set")
+    if len(keys) > MAX_ETHERSCAN_API_KEYS:
+        raise ConfigurationError(f"At most {MAX_ETHERSCAN_API_KEYS} Etherscan API keys are supported")
+    return keys
+
+def load_wallets_config(environ: Optional[Mapping] = None) -> WalletRegistry:
+    """Load the wallet registry from WALLETS_FILE, WALLETS_JSON or WALLET_<n>_* variables"""
+    try:
+        return load_wallet_registry(os.environ if environ is None else environ)
+    except WalletRegistryError as e:
+        raise ConfigurationError(str(e))
+
+def load_wallet_registry_config(environ: Optional[Mapping] = None) -> WalletRegistry:
+    """Load the wallet registry, falling back to a single WALLET_ADDRESS wallet for backward compatibility"""
+    environ = os.environ if environ is None else environ
+    wallets = load_wallets_config(environ)
+    if wallets:
+        return wallets
+
+    wallet_address = environ.get("WALLET_ADDRESS", "")
+    if not wallet_address:
+        raise ConfigurationError("No wallet addresses configured. Use WALLETS_FILE, WALLETS_JSON or WALLET_ADDRESS")
+    if not validate_ethereum_address(wallet_address):
+        raise ConfigurationError(f"Invalid Ethereum address format: {wallet_address}")
+
+    return WalletRegistry([
+        ("default", {
+            "address": wallet_address,
+            "name": "Default Wallet",
+            "enabled": True
+        })
+    ], source="WALLET_ADDRESS")
 
 def load_secure_config() -> Dict[str, Any]:
     """Load and validate configuration securely"""
@@ -119,31 +151,12 @@ def load_secure_config() -> Dict[str, Any]:
 
     try:
         # Load multiple wallets
-        wallets = load_wallets_config()
+        wallets = load_wallet_registry_config()
         config["wallets"] = wallets
 
-        # If no wallets defined, fallback to single wallet for backward compatibility
-        if not wallets:
-            wallet_address = os.getenv("WALLET_ADDRESS", "")
-            if wallet_address:
-                wallet_address = validate_required_env_var("WALLET_ADDRESS", wallet_address)
-                if not validate_ethereum_address(wallet_address):
-                    raise ConfigurationError(f"Invalid Ethereum address format: {wallet_address}")
-
-                wallets = {
-                    "default": {
-                        "address": wallet_address,
-                        "name": "Default Wallet",
-                        "enabled": True
-                    }
-                }
-                config["wallets"] = wallets
-            else:
-                raise ConfigurationError("No wallet addresses configured. Use WALLETS_JSON or WALLET_ADDRESS")
-
-        # Validate Etherscan API key
-        etherscan_key = os.getenv("ETHERSCAN_API_KEY", "")
-        config["etherscan_api_key"] = validate_required_env_var("ETHERSCAN_API_KEY", etherscan_key)
+        # Validate Etherscan API keys; requests rotate over all of them, the first stays the default key
+        config["etherscan_api_keys"] = load_etherscan_api_keys()
+        config["etherscan_api_key"] = config["etherscan_api_keys"][0]
 
         # Optional Telegram configuration
         telegram_token = os.getenv("TELEGRAM_BOT_TOKEN", "")
@@ -178,6 +191,70 @@ def load_secure_config() -> Dict[str, Any]:
         config["balance_change_threshold"] = float(os.getenv("BALANCE_CHANGE_THRESHOLD", str(DEFAULT_BALANCE_CHANGE_THRESHOLD)))
         config["position_change_threshold"] = float(os.getenv("POSITION_CHANGE_THRESHOLD", str(DEFAULT_POSITION_CHANGE_THRESHOLD)))
 
+        # Process-wide rate limits per upstream API (requests per second, per key for Etherscan)
+        config["rate_limits"] = {
+            UPSTREAM_ETHERSCAN: validate_rate_limit("ETHERSCAN_RATE_LIMIT", DEFAULT_RATE_LIMIT_ETHERSCAN),
+            UPSTREAM_HYPERLIQUID: validate_rate_limit("HYPERLIQUID_RATE_LIMIT", DEFAULT_RATE_LIMIT_HYPERLIQUID),
+            UPSTREAM_TELEGRAM: validate_rate_limit("TELEGRAM_RATE_LIMIT", DEFAULT_RATE_LIMIT_TELEGRAM)
+        }
+
+        # Let the limiters probe above the configured rates (up to RATE_AIMD_MAX_FACTOR times) until throttled
+        config["adaptive_rate_limit"] = os.getenv("ADAPTIVE_RATE_LIMIT", "false").lower() == "true"
+
+        # Raise the check interval (up to MAX_CHECK_INTERVAL) when the wallets can't fit the rate budget
+        config["auto_tune_interval"] = os.getenv("AUTO_TUNE_INTERVAL", "false").lower() == "true"
+
+        # Size of the async worker pool or blocking thread pool; memory and sockets stay flat as wallets grow
+        config["max_concurrent_wallets"] = validate_int_range(
+            "MAX_CONCURRENT_WALLETS", DEFAULT_MAX_CONCURRENT_WALLETS, 1, MAX_ASYNC_CONCURRENT_TASKS
+        )
+
+        # Durable per-wallet state so restarts resume change detection
+        state_backend = os.getenv("STATE_BACKEND", DEFAULT_STATE_BACKEND).lower()
+        if state_backend not in (STATE_BACKEND_SQLITE, STATE_BACKEND_NONE):
+            raise ConfigurationError(f"STATE_BACKEND must be '{STATE_BACKEND_SQLITE}' or '{STATE_BACKEND_NONE}'")
+        config["state"] = {
+            "backend": state_backend,
+            "db_path": os.getenv("STATE_DB_PATH", DEFAULT_STATE_DB_PATH)
+        }
+        # Opt-in: send startup summaries from saved state and start checking right away
+        config["warm_start"] = os.getenv("WARM_START", "false").lower() == "true"
+
+        # Per-wallet poll intervals driven by activity and position risk
+        check_interval = config["check_interval"]
+        schedule_mode = os.getenv("SCHEDULE_MODE", DEFAULT_SCHEDULE_MODE).lower()
+        if schedule_mode not in (SCHEDULE_MODE_BURST, SCHEDULE_MODE_SPREAD):
+            raise ConfigurationError(f"SCHEDULE_MODE must be '{SCHEDULE_MODE_BURST}' or '{SCHEDULE_MODE_SPREAD}'")
+        config["polling"] = {
+            "adaptive": os.getenv("ADAPTIVE_POLLING", "false").lower() == "true",
+            "mode": schedule_mode,
+            "min_interval": validate_int_range(
+                "MIN_POLL_INTERVAL", min(ADAPTIVE_POLL_MIN_INTERVAL, check_interval),
+                min(MIN_CHECK_INTERVAL, check_interval), check_interval
+            ),
+            "max_interval": validate_int_range(
+                "MAX_POLL_INTERVAL", max(ADAPTIVE_POLL_MAX_INTERVAL, check_interval),
+                check_interval, max(7 * SECONDS_PER_DAY, check_interval)
+            ),
+            "dormant_after": validate_int_range(
+                "POLL_DORMANT_AFTER", ADAPTIVE_POLL_DORMANT_AFTER, 0, 30 * SECONDS_PER_DAY
+            )
+        }
+
+        # Sharded mode (SHARD_ID set, usually by `main.py --shards N` or `--shard-id`)
+        config["sharding"] = {
+            "shard_id": os.getenv("SHARD_ID", "").strip() or None,
+            "shard_count": validate_int_range("SHARD_COUNT", 1, 1, MAX_SHARD_COUNT),
+            "lease_path": os.getenv("SHARD_LEASE_PATH", DEFAULT_SHARD_LEASE_PATH),
+            "lease_ttl": validate_int_range("SHARD_LEASE_TTL", DEFAULT_SHARD_LEASE_TTL, 5, 3600)
+        }
+
+        # Pick up wallet additions and removals between cycles without a restart
+        config["wallet_reload"] = {
+            "enabled": os.getenv("WALLETS_RELOAD", "true").lower() == "true",
+            "watch_path": wallets.path or env_file_path()
+        }
+
         # Notification settings
         config["notification_settings"] = {
             "email": config["email"],
@@ -190,30 +267,72 @@ def load_secure_config() -> Dict[str, Any]:
     except (ValueError, TypeError) as e:
         raise ConfigurationError(f"Configuration validation error: {e}")
 
+_config_cache = None
+_env_loaded = False
+# Process environment as it was before .env was applied
+_process_environ = None
+
+def load_environment():
+    """Load variables from the .env file once, on first use"""
+    global _env_loaded, _process_environ
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        _process_environ = dict(os.environ)
+        load_dotenv()
+        _env_loaded = True
+
+def env_file_path() -> str:
+    """Path of the .env file in use, or an empty string if there is none"""
+    from dotenv import find_dotenv
+    return find_dotenv()
+
+def reload_wallet_registry() -> WalletRegistry:
+    """
+    Re-read the wallet registry for a hot reload.
+
+    .env is read again, so edits to WALLET_<n>_* or WALLETS_FILE apply; real
+    environment variables still take precedence over .env, as at startup.
+    """
+    load_environment()
+    from dotenv import dotenv_values
+    process_environ = _process_environ if _process_environ is not None else os.environ
+    env_file = env_file_path()
+    environ = {key: value for key, value in dotenv_values(env_file).items() if value is not None} if env_file else {}
+    environ.update(process_environ)
+    return load_wallet_registry_config(environ)
+
+def get_config() -> Dict[str, Any]:
+    """Parse and validate the configuration once, on first use, and reuse it afterwards"""
+    global _config_cache
+    if _config_cache is None:
+        load_environment()
+        _config_cache = load_secure_config()
+    return _config_cache
+
 def load_config():
     """Load and validate configuration"""
-    return load_secure_config()
-
-# Load configuration with validation
-CONFIG = load_secure_config()
-
-# Backward compatibility - export variables for existing code
-if "wallets" in CONFIG and CONFIG["wallets"]:
-    # Get first enabled wallet for backward compatibility
-    first_wallet = next((w for w in CONFIG["wallets"].values() if w.get("enabled", True)), None)
-    if first_wallet:
-        WALLET_ADDRESS = first_wallet["address"]
-    else:
-        WALLET_ADDRESS = ""
-else:
-    WALLET_ADDRESS = ""
-
-# Export configuration variables for backward compatibility
-ETHERSCAN_API_KEY = CONFIG["etherscan_api_key"]
-CHECK_INTERVAL = CONFIG["check_interval"]
-BALANCE_CHANGE_THRESHOLD = CONFIG["balance_change_threshold"]
-POSITION_CHANGE_THRESHOLD = CONFIG["position_change_threshold"]
-NOTIFICATION_SETTINGS = CONFIG["notification_settings"]
-TELEGRAM_BOT_TOKEN = CONFIG["telegram"]["bot_token"]
-TELEGRAM_CHAT_ID = CONFIG["telegram"]["chat_id"]
-
+    return get_config()
+
+def _first_enabled_wallet_address(config: Dict[str, Any]) -> str:
+    """Address of the first enabled wallet, for single-wallet backward compatibility"""
+    first_wallet = next((w for w in config.get("wallets", {}).values() if w.get("enabled", True)), None)
+    return first_wallet["address"] if first_wallet else ""
+
+# Backward compatibility - module attributes resolved lazily from get_config()
+_LEGACY_ATTRIBUTES = {
+    "CONFIG": lambda config: config,
+    "WALLET_ADDRESS": _first_enabled_wallet_address,
+    "ETHERSCAN_API_KEY": lambda config: config["etherscan_api_key"],
+    "CHECK_INTERVAL": lambda config: config["check_interval"],
+    "BALANCE_CHANGE_THRESHOLD": lambda config: config["balance_change_threshold"],
+    "POSITION_CHANGE_THRESHOLD": lambda config: config["position_change_threshold"],
+    "NOTIFICATION_SETTINGS": lambda config: config["notification_settings"],
+    "TELEGRAM_BOT_TOKEN": lambda config: config["telegram"]["bot_token"],
+    "TELEGRAM_CHAT_ID": lambda config: config["telegram"]["chat_id"],
+}
+
+def __getattr__(name: str):
+    """Resolve legacy module-level settings without parsing config at import time"""
+    if name in _LEGACY_ATTRIBUTES:
+        return _LEGACY_ATTRIBUTES[name](get_config())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -28,6 +28,28 @@ SECONDS_PER_DAY = HOURS_PER_DAY * SECONDS_PER_HOUR
 CHECK_INTERVAL_MINUTES = 10
 DEFAULT_CHECK_INTERVAL = CHECK_INTERVAL_MINUTES * SECONDS_PER_MINUTE
 
+# Adaptive per-wallet polling (in seconds)
+ADAPTIVE_POLL_MIN_INTERVAL = SECONDS_PER_MINUTE
+ADAPTIVE_POLL_MAX_INTERVAL = 6 * SECONDS_PER_HOUR
+ADAPTIVE_POLL_DORMANT_AFTER = SECONDS_PER_DAY
+ADAPTIVE_POLL_BACKOFF_FACTOR = 2
+ADAPTIVE_POLL_RISK_DIVISOR = 4  # risky wallets are polled at check_interval / 4
+ADAPTIVE_POLL_RISK_LEVERAGE = 10
+ADAPTIVE_POLL_RISK_LIQUIDATION_DISTANCE = 0.10  # within 10% of liquidation
+ADAPTIVE_POLL_MIN_SLEEP = 1  # shortest monitor loop sleep, so it never spins
+
+# Schedule modes: all wallets at once every interval, or spread across it
+SCHEDULE_MODE_BURST = "burst"
+SCHEDULE_MODE_SPREAD = "spread"
+DEFAULT_SCHEDULE_MODE = SCHEDULE_MODE_BURST
+SCHEDULE_SPREAD_SLOTS = 60  # slots per interval; wallets in one slot share balancemulti batches
+SCHEDULE_JITTER_FRACTION = 0.1  # +/-10% on adaptive intervals so wallets don't re-synchronize
+
+# Cycle deadline: share of check_interval a cycle may use
+CYCLE_SOFT_DEADLINE_FRACTION = 0.8  # no new wallet checks start after this
+CYCLE_HARD_DEADLINE_FRACTION = 0.95  # in-flight checks are cancelled and retried next cycle
+CYCLE_MAX_DEFERRALS = 3  # wallets deferred this many cycles in a row go first
+
 # =============================================================================
 # 🔧 DEFAULT VALUES
 # =============================================================================
@@ -39,12 +61,61 @@ DEFAULT_POSITION_CHANGE_THRESHOLD = 1000  # USD
 # API query limits
 DEFAULT_LIMIT = 10
 DEFAULT_RETRIES = 3
+ETHERSCAN_BALANCEMULTI_MAX_ADDRESSES = 20  # Etherscan balancemulti accepts up to 20 addresses
+ETHERSCAN_PAGE_SIZE = 100  # rows per page for incremental txlist/tokentx polling
+ETHERSCAN_MAX_PAGES = 10  # page cap per poll (Etherscan rejects page * offset > 10000)
+ETHERSCAN_END_BLOCK = 99999999  # "latest" sentinel accepted by Etherscan
+
+# Etherscan account actions tracked with a block cursor
+ETHERSCAN_ACTION_TXLIST = "txlist"
+ETHERSCAN_ACTION_TOKENTX = "tokentx"
 
 # Rate limiting
 DEFAULT_RATE_LIMIT_ETHERSCAN = 2  # requests per second (more conservative)
 DEFAULT_RATE_LIMIT_HYPERLIQUID = 10  # requests per second
+DEFAULT_RATE_LIMIT_TELEGRAM = 1  # messages per second
 DEFAULT_RATE_LIMIT_PERIOD = 1  # seconds
 
+# Window for the achieved request rate report (seconds)
+RATE_REPORT_WINDOW_SECONDS = 300
+
+# Etherscan API key pool: each key has its own token bucket at the configured rate
+API_KEY_AUTH_QUARANTINE_SECONDS = 900  # invalid or revoked key is left out this long
+API_KEY_RATE_QUARANTINE_SECONDS = 5  # rate-limited key is left out at least this long (or Retry-After)
+API_KEY_MAX_QUARANTINE_SECONDS = 3600  # repeated failures double the quarantine up to this
+MAX_ETHERSCAN_API_KEYS = 32
+
+# Adaptive (AIMD) rate limiting: back off on 429s / rate-limit replies, probe back up while healthy
+RATE_AIMD_DECREASE_FACTOR = 0.5  # rate multiplier on a throttled reply
+RATE_AIMD_DECREASE_COOLDOWN = 2.0  # seconds; throttled replies within it count as one event
+RATE_AIMD_INCREASE_FRACTION = 0.1  # share of the configured rate added per healthy interval
+RATE_AIMD_INCREASE_INTERVAL = 5.0  # seconds without throttling between increases
+RATE_AIMD_MIN_FRACTION = 0.1  # lowest rate as a share of the configured rate
+RATE_AIMD_MAX_FACTOR = 4  # with ADAPTIVE_RATE_LIMIT, probe up to this multiple of the configured rate
+
+# Circuit breakers: one per upstream host and endpoint, shared by every wallet
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3  # consecutive failed requests before the breaker opens
+CIRCUIT_BREAKER_RECOVERY_TIMEOUT = 60  # seconds open before probe requests are let through
+CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS = 1  # concurrent probe requests while half-open
+CIRCUIT_BREAKER_HISTORY = 20  # state transitions kept per breaker
+
+# Rate budget planning: API calls per wallet check (balances are batched separately)
+ETHERSCAN_CALLS_PER_WALLET = 2  # txlist + tokentx
+HYPERLIQUID_CALLS_PER_WALLET = 1  # clearinghouseState
+RATE_PLAN_HEADROOM = 1.2  # planned cycle must fit the interval with 20% to spare
+RATE_PLAN_DEFAULT_WALLET_SECONDS = 1.0  # assumed check latency per wallet until one is observed
+RATE_PLAN_LATENCY_SMOOTHING = 0.3  # weight of the newest cycle in the observed latency
+
+# Token bucket burst sizes (requests that may go out back-to-back)
+DEFAULT_RATE_LIMIT_BURST_ETHERSCAN = 2
+DEFAULT_RATE_LIMIT_BURST_HYPERLIQUID = 10
+DEFAULT_RATE_LIMIT_BURST_TELEGRAM = 3
+
+# Upstream API names used as shared rate limiter keys
+UPSTREAM_ETHERSCAN = "etherscan"
+UPSTREAM_HYPERLIQUID = "hyperliquid"
+UPSTREAM_TELEGRAM = "telegram"
+
 # Timeouts
 DEFAULT_TIMEOUT_SECONDS = 30
 DEFAULT_REQUEST_TIMEOUT = 30
@@ -203,7 +274,7 @@ MEMORY_KEEPALIVE_TIMEOUT = 60
 ETH_ADDRESS_PATTERN = r'^0x[a-fA-F0-9]{40}$'
 
 # Maximum values
-MAX_WALLET_COUNT = 1000
+MAX_WALLET_COUNT = 10000
 MAX_RETRY_ATTEMPTS = 10
 MAX_TIMEOUT_SECONDS = 300
 
@@ -270,6 +341,29 @@ CACHE_DIR = ".cache"
 TEMP_DIR = ".temp"
 BACKUP_DIR = ".backups"
 
+# State persistence (last known balances, positions and block cursors)
+STATE_BACKEND_SQLITE = "sqlite"
+STATE_BACKEND_NONE = "none"
+DEFAULT_STATE_BACKEND = STATE_BACKEND_SQLITE
+DEFAULT_STATE_DB_PATH = CACHE_DIR + "/wallet_state.db"
+
+# Wallets fetched at once for live startup summaries during a warm start
+WARM_START_REFRESH_CONCURRENCY = 2
+
+# Wallet registry files (WALLETS_FILE): JSONL, CSV or a SQLite table
+WALLET_REGISTRY_JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+WALLET_REGISTRY_CSV_EXTENSIONS = (".csv",)
+WALLET_REGISTRY_SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+WALLET_REGISTRY_TABLE = "wallets"
+
+# Sharding: wallets split across worker processes or hosts by consistent hashing
+DEFAULT_SHARD_LEASE_PATH = CACHE_DIR + "/shards.db"
+DEFAULT_SHARD_LEASE_TTL = 30  # seconds without a heartbeat before a shard's wallets move
+SHARD_VIRTUAL_NODES = 64  # ring points per shard; more points, more even split
+SHARD_JOIN_TIMEOUT = 15  # seconds a starting shard waits for the expected peers
+SHARD_RESTART_DELAY = 5  # seconds before --shards restarts a worker that exited
+MAX_SHARD_COUNT = 64
+
 # =============================================================================
 # 🎯 VERSION AND METADATA
 # =============================================================================
@@ -313,6 +407,9 @@ BATCH_SIZE_DEFAULT = 5
 MAX_CONCURRENT_REQUESTS = 20
 MAX_ASYNC_CONCURRENT_TASKS = 100
 
+# Wallets checked at once by the async worker pool or the blocking thread pool
+DEFAULT_MAX_CONCURRENT_WALLETS = 10
+
 # =============================================================================
 # 📦 PACKAGE EXPORTS
 # =============================================================================
@@ -332,19 +429,68 @@ __all__ = [
     "SECONDS_PER_DAY",
     "CHECK_INTERVAL_MINUTES",
     "DEFAULT_CHECK_INTERVAL",
+    "ADAPTIVE_POLL_MIN_INTERVAL",
+    "ADAPTIVE_POLL_MAX_INTERVAL",
+    "ADAPTIVE_POLL_DORMANT_AFTER",
+    "ADAPTIVE_POLL_BACKOFF_FACTOR",
+    "ADAPTIVE_POLL_RISK_DIVISOR",
+    "ADAPTIVE_POLL_RISK_LEVERAGE",
+    "ADAPTIVE_POLL_RISK_LIQUIDATION_DISTANCE",
+    "ADAPTIVE_POLL_MIN_SLEEP",
+    "SCHEDULE_MODE_BURST",
+    "SCHEDULE_MODE_SPREAD",
+    "DEFAULT_SCHEDULE_MODE",
+    "SCHEDULE_SPREAD_SLOTS",
+    "SCHEDULE_JITTER_FRACTION",
+    "CYCLE_SOFT_DEADLINE_FRACTION",
+    "CYCLE_HARD_DEADLINE_FRACTION",
+    "CYCLE_MAX_DEFERRALS",
 
     # Default values
     "DEFAULT_BALANCE_CHANGE_THRESHOLD",
     "DEFAULT_POSITION_CHANGE_THRESHOLD",
     "DEFAULT_LIMIT",
     "DEFAULT_RETRIES",
+    "ETHERSCAN_BALANCEMULTI_MAX_ADDRESSES",
+    "ETHERSCAN_PAGE_SIZE",
+    "ETHERSCAN_MAX_PAGES",
+    "ETHERSCAN_END_BLOCK",
+    "ETHERSCAN_ACTION_TXLIST",
+    "ETHERSCAN_ACTION_TOKENTX",
     "DEFAULT_TIMEOUT_SECONDS",
     "DEFAULT_REQUEST_TIMEOUT",
 
     # Rate limiting
     "DEFAULT_RATE_LIMIT_ETHERSCAN",
     "DEFAULT_RATE_LIMIT_HYPERLIQUID",
+    "DEFAULT_RATE_LIMIT_TELEGRAM",
     "DEFAULT_RATE_LIMIT_PERIOD",
+    "RATE_REPORT_WINDOW_SECONDS",
+    "API_KEY_AUTH_QUARANTINE_SECONDS",
+    "API_KEY_RATE_QUARANTINE_SECONDS",
+    "API_KEY_MAX_QUARANTINE_SECONDS",
+    "MAX_ETHERSCAN_API_KEYS",
+    "RATE_AIMD_DECREASE_FACTOR",
+    "RATE_AIMD_DECREASE_COOLDOWN",
+    "RATE_AIMD_INCREASE_FRACTION",
+    "RATE_AIMD_INCREASE_INTERVAL",
+    "RATE_AIMD_MIN_FRACTION",
+    "RATE_AIMD_MAX_FACTOR",
+    "CIRCUIT_BREAKER_FAILURE_THRESHOLD",
+    "CIRCUIT_BREAKER_RECOVERY_TIMEOUT",
+    "CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS",
+    "CIRCUIT_BREAKER_HISTORY",
+    "ETHERSCAN_CALLS_PER_WALLET",
+    "HYPERLIQUID_CALLS_PER_WALLET",
+    "RATE_PLAN_HEADROOM",
+    "RATE_PLAN_DEFAULT_WALLET_SECONDS",
+    "RATE_PLAN_LATENCY_SMOOTHING",
+    "DEFAULT_RATE_LIMIT_BURST_ETHERSCAN",
+    "DEFAULT_RATE_LIMIT_BURST_HYPERLIQUID",
+    "DEFAULT_RATE_LIMIT_BURST_TELEGRAM",
+    "UPSTREAM_ETHERSCAN",
+    "UPSTREAM_HYPERLIQUID",
+    "UPSTREAM_TELEGRAM",
 
     # API endpoints
     "ETHERSCAN_API_URL_V1",
@@ -462,6 +608,25 @@ __all__ = [
     "TEMP_DIR",
     "BACKUP_DIR",
 
+    # State persistence
+    "STATE_BACKEND_SQLITE",
+    "STATE_BACKEND_NONE",
+    "DEFAULT_STATE_BACKEND",
+    "DEFAULT_STATE_DB_PATH",
+    "WARM_START_REFRESH_CONCURRENCY",
+    "WALLET_REGISTRY_JSONL_EXTENSIONS",
+    "WALLET_REGISTRY_CSV_EXTENSIONS",
+    "WALLET_REGISTRY_SQLITE_EXTENSIONS",
+    "WALLET_REGISTRY_TABLE",
+
+    # Sharding
+    "DEFAULT_SHARD_LEASE_PATH",
+    "DEFAULT_SHARD_LEASE_TTL",
+    "SHARD_VIRTUAL_NODES",
+    "SHARD_JOIN_TIMEOUT",
+    "SHARD_RESTART_DELAY",
+    "MAX_SHARD_COUNT",
+
     # Application info
     "APP_NAME",
     "APP_VERSION",
@@ -491,5 +656,6 @@ __all__ = [
     # Batch processing
     "BATCH_SIZE_DEFAULT",
     "MAX_CONCURRENT_REQUESTS",
-    "MAX_ASYNC_CONCURRENT_TASKS"
+    "MAX_ASYNC_CONCURRENT_TASKS",
+    "DEFAULT_MAX_CONCURRENT_WALLETS"
 ]
\ No newline at end of file
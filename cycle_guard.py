@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Cycle Guard - Per-cycle deadlines, priority order and no overlapping check cycles
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from constants import (
+    # Cycle deadline
+    CYCLE_SOFT_DEADLINE_FRACTION,
+    CYCLE_HARD_DEADLINE_FRACTION,
+    CYCLE_MAX_DEFERRALS
+)
+
+
+class CycleGuard:
+    """
+    Keeps a check cycle inside its time budget.
+
+    - Only one cycle runs at a time; a cycle that would overlap is skipped.
+    - Wallets are checked in priority order: urgent ones (risky positions,
+      changed last cycle) first, then the ones deferred most often.
+    - After the soft deadline no new wallet check starts; after the hard
+      deadline async checks still in flight are cancelled. Both kinds are
+      deferred to the next cycle.
+    - A wallet deferred max_deferrals cycles in a row counts as urgent, so
+      low-priority wallets are delayed but never starved.
+    """
+
+    def __init__(self, soft_fraction: float = CYCLE_SOFT_DEADLINE_FRACTION,
+                 hard_fraction: float = CYCLE_HARD_DEADLINE_FRACTION,
+                 max_deferrals: int = CYCLE_MAX_DEFERRALS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.soft_fraction = soft_fraction
+        self.hard_fraction = hard_fraction
+        self.max_deferrals = max_deferrals
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self.soft_deadline: Optional[float] = None
+        self.hard_deadline: Optional[float] = None
+        # wallet_id -> cycles in a row the wallet was deferred
+        self._deferrals: Dict[str, int] = {}
+        # Wallets whose last check found a change
+        self._changed = set()
+
+        # Statistics
+        self.last_deferred: List[str] = []
+        self.total_deferred = 0
+        self.overlaps_skipped = 0
+
+    def begin(self, budget: float) -> bool:
+        """Start a cycle with `budget` seconds; False if another cycle is still running"""
+        if not self._lock.acquire(blocking=False):
+            self.overlaps_skipped += 1
+            return False
+        now = self.clock()
+        self.soft_deadline = now + budget * self.soft_fraction
+        self.hard_deadline = now + budget * self.hard_fraction
+        return True
+
+    def end(self, planned: Iterable[str], checked: Iterable[str]) -> List[str]:
+        """Finish the cycle; return the planned wallets that were deferred"""
+        checked = set(checked)
+        deferred = [wallet_id for wallet_id in planned if wallet_id not in checked]
+        for wallet_id in checked:
+            self._deferrals.pop(wallet_id, None)
+        for wallet_id in deferred:
+            self._deferrals[wallet_id] = self._deferrals.get(wallet_id, 0) + 1
+
+        self.last_deferred = deferred
+        self.total_deferred += len(deferred)
+        self.soft_deadline = self.hard_deadline = None
+        self._lock.release()
+        return deferred
+
+    def past_soft_deadline(self) -> bool:
+        """True once no new wallet check should start this cycle"""
+        return self.soft_deadline is not None and self.clock() >= self.soft_deadline
+
+    def record(self, wallet_id: str, changed: bool):
+        """Remember whether a wallet's check found a change, for next cycle's priority"""
+        if changed:
+            self._changed.add(wallet_id)
+        else:
+            self._changed.discard(wallet_id)
+
+    def forget(self, wallet_id: str):
+        """Drop a removed wallet's priority state"""
+        self._deferrals.pop(wallet_id, None)
+        self._changed.discard(wallet_id)
+
+    def prioritize(self, wallet_ids: Iterable[str], is_urgent: Callable[[str], bool] = lambda wallet_id: False) -> List[str]:
+        """Wallets in check order: urgent first, then most deferred; otherwise the given order"""
+        def key(item):
+            index, wallet_id = item
+            deferrals = self._deferrals.get(wallet_id, 0)
+            urgent = wallet_id in self._changed or deferrals >= self.max_deferrals or is_urgent(wallet_id)
+            return (0 if urgent else 1, -deferrals, index)
+
+        return [wallet_id for _, wallet_id in sorted(enumerate(wallet_ids), key=key)]
+
+    def get_stats(self) -> Dict:
+        """Deferral and overlap counters"""
+        return {
+            "last_deferred": len(self.last_deferred),
+            "total_deferred": self.total_deferred,
+            "waiting": len(self._deferrals),
+            "overlaps_skipped": self.overlaps_skipped
+        }
@@ -90,7 +90,7 @@ class DataProcessor:
             for key, value in wallet_results.items():
                 if key in ["old_balance", "new_balance", "balance_change"]:
                     normalized_wallet_results[key] = DataProcessor.safe_float(value, 0.0)
-                elif key in ["balance_changed", "positions_changed", "success"]:
+                elif key in ["balance_changed", "positions_changed", "deposit_withdrawal", "success"]:
                     normalized_wallet_results[key] = bool(value)
                 else:
                     normalized_wallet_results[key] = value
@@ -5,7 +5,6 @@ HyperDash Service - Fetch trading statistics from HyperLiquid dashboard
 
 import asyncio
 from typing import Dict, Optional
-from playwright.async_api import async_playwright
 from constants import DEFAULT_TIMEOUT_SECONDS
 
 
@@ -22,6 +21,9 @@ class HyperDashService:
         Returns:
             Dict with win_rate, total_positions, winning_positions, leverage, account_value
         """
+        # Playwright is heavy and optional; load it only when stats are requested
+        from playwright.async_api import async_playwright
+
         try:
             async with async_playwright() as p:
                 # Launch browser
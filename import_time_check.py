@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Import Time Check - `python -X importtime` regression check for the CLI startup paths
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Placeholder configuration so the paths run without a real .env or network
+CHECK_ENV = {
+    "ETHERSCAN_API_KEY": "import-time-check",
+    "WALLET_1_ADDRESS": "0x" + "1" * 40,
+    "WALLET_1_NAME": "Import Time Check",
+    "STATE_BACKEND": "none",
+    "EMAIL_ENABLED": "false",
+}
+
+# Path name -> (python arguments, modules that must not be imported, default budget in ms).
+# --check is measured up to its first network call (building the monitor),
+# since the check itself talks to live APIs.
+CLI_PATHS = {
+    "--list": (
+        ["main.py", "--list"],
+        ["multi_wallet_tracker", "aiohttp", "requests", "smtplib", "playwright", "schedule", "sqlite3"],
+        150
+    ),
+    "--check": (
+        ["-c", "import main; main.CryptoWalletMonitor()"],
+        ["smtplib", "playwright", "schedule"],
+        600
+    ),
+}
+
+
+def measure_imports(arguments: List[str]) -> Dict[str, int]:
+    """Run python -X importtime and return {module: cumulative microseconds}"""
+    env = {key: os.environ[key] for key in ("PATH", "HOME", "SYSTEMROOT") if key in os.environ}
+    env.update(CHECK_ENV)
+    env["PYTHONPATH"] = REPO_DIR
+
+    # Run from a scratch directory so log files don't land in the repo
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        script_arguments = [
+            os.path.join(REPO_DIR, argument) if argument.endswith(".py") else argument
+            for argument in arguments
+        ]
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime"] + script_arguments,
+            cwd=scratch_dir, env=env, capture_output=True, text=True
+        )
+
+    if completed.returncode != 0:
+        raise RuntimeError(f"{' '.join(arguments)} exited with {completed.returncode}:\n{completed.stderr[-2000:]}")
+
+    imports = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def _is_repo_module(name: str) -> bool:
+    """Check whether a module is one of the repo's top-level modules"""
+    return os.path.exists(os.path.join(REPO_DIR, f"{name}.py"))
+
+
+def check_path(path: str, budget_ms: float) -> bool:
+    """Measure one CLI path against its forbidden modules and time budget"""
+    arguments, forbidden, _ = CLI_PATHS[path]
+    imports = measure_imports(arguments)
+
+    loaded_forbidden = [name for name in forbidden if name in imports]
+    # Cumulative times nest, so the slowest repo module covers the whole import tree under it
+    repo_ms = max(
+        (cumulative / 1000 for name, cumulative in imports.items() if _is_repo_module(name)),
+        default=0.0
+    )
+
+    print(f"\n⏱️ {path}: slowest repo-level import {repo_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:8]
+    for name, cumulative in slowest:
+        print(f"   {cumulative / 1000:8.1f} ms  {name}")
+
+    ok = True
+    if loaded_forbidden:
+        print(f"❌ {path} imported modules it should not need: {', '.join(loaded_forbidden)}")
+        ok = False
+    if repo_ms > budget_ms:
+        print(f"❌ {path} is over its import-time budget")
+        ok = False
+    if ok:
+        print(f"✅ {path} is within budget")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check CLI import time against a budget")
+    for path, (_, _, budget_ms) in CLI_PATHS.items():
+        parser.add_argument(f"{path}-budget-ms", type=float, default=budget_ms,
+                            help=f"Import-time budget for {path} in milliseconds (default {budget_ms})")
+    args = parser.parse_args()
+
+    results = [
+        check_path(path, getattr(args, f"{path.lstrip('-')}_budget_ms"))
+        for path in CLI_PATHS
+    ]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
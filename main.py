@@ -4,11 +4,14 @@ Crypto Wallet Tracker
 Monitors multiple Ethereum wallets and Hyperliquid positions for changes
 """
 
+import threading
 import time
 import os
 from datetime import datetime
-import schedule
-from multi_wallet_tracker import MultiWalletTracker
+from constants import (
+    ADAPTIVE_POLL_MIN_SLEEP, MAX_SHARD_COUNT, SHARD_RESTART_DELAY, UPSTREAM_ETHERSCAN,
+    SCHEDULE_MODE_SPREAD, SCHEDULE_SPREAD_SLOTS
+)
 from logger_config import (
     setup_logging, get_logger, log_startup, log_wallet_summary,
     log_wallet_action, log_error, log_notification
@@ -32,8 +35,11 @@ class CryptoWalletMonitor:
 
         # Check if async mode is enabled via environment variable
         use_async = os.getenv("USE_ASYNC_TRACKER", "true").lower() == "true"
+        # Imported here so --list never pays for the tracker stack (requests, aiohttp)
+        from multi_wallet_tracker import MultiWalletTracker
         self.multi_tracker = MultiWalletTracker(self.config, use_async=use_async)
-        self.check_interval = self.config["check_interval"]
+        # The tracker's interval, possibly raised by the rate budget planner
+        self.check_interval = self.multi_tracker.check_interval
 
         wallet_count = len(self.multi_tracker.trackers)
 
@@ -44,6 +50,17 @@ class CryptoWalletMonitor:
         telegram_enabled = self.config['notification_settings']['telegram']['enabled']
         self.logger.info(f"📧 Email notifications: {'Enabled' if email_enabled else 'Disabled'}")
         self.logger.info(f"📱 Telegram notifications: {'Enabled' if telegram_enabled else 'Disabled'}")
+        poll_scheduler = self.multi_tracker.poll_scheduler
+        if hasattr(poll_scheduler, "min_interval"):
+            self.logger.info(
+                f"⏱️ Adaptive polling: {poll_scheduler.min_interval:.0f}-{poll_scheduler.max_interval:.0f}s "
+                f"per wallet around the {self.check_interval}s check interval"
+            )
+        elif poll_scheduler:
+            self.logger.info(
+                f"⏱️ Spread schedule: wallets checked across {poll_scheduler.slots} slots "
+                f"of each {self.check_interval}s interval"
+            )
 
         # List configured wallets
         for wallet_id, wallet_config in self.multi_tracker.wallets.items():
@@ -59,20 +76,77 @@ class CryptoWalletMonitor:
             current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             log_wallet_action("Checking all wallets", f"at {current_time}")
 
-            # Check all wallets
-            results = self.multi_tracker.check_all_wallets()
+            # Check all wallets, or only the due ones with a per-wallet schedule
+            results = self.multi_tracker.check_due_wallets()
+            self._log_check_results(results)
 
-            # Count total changes
-            total_changes = sum(len(changes) for changes in results.values())
+        except Exception as e:
+            log_error("wallet check", e, "Multi-wallet tracker")
 
-            # Only print completion message if there were no important changes
-            if total_changes == 0:
-                self.logger.info("✅ No important changes detected across all wallets")
-            else:
-                self.logger.info(f"✅ Check completed - {total_changes} notifications sent")
+    async def send_initial_summary_async(self):
+        """Send initial wallet summary on startup, on the daemon event loop"""
+        try:
+            await self.multi_tracker.send_initial_summary_async()
+            self.logger.info("✅ Initial summaries sent")
+        except Exception as e:
+            log_error("initial summary", e, "Multi-wallet tracker")
+
+    def send_live_summaries(self, wallet_ids):
+        """Send live summaries for wallets a warm start had no saved state for"""
+        try:
+            self.multi_tracker.send_live_summaries(wallet_ids)
+            self.logger.info("✅ Initial summaries sent")
+        except Exception as e:
+            log_error("initial summary", e, "Multi-wallet tracker")
+
+    async def finish_warm_start_async(self, snapshot_summaries):
+        """Wait for the saved-state summaries, then send live ones for wallets without saved state"""
+        try:
+            await self.multi_tracker.send_live_summaries_async(await snapshot_summaries)
+            self.logger.info("✅ Initial summaries sent")
+        except Exception as e:
+            log_error("initial summary", e, "Multi-wallet tracker")
+
+    async def check_wallet_changes_async(self):
+        """Main check function for wallet changes, run on the daemon event loop"""
+        try:
+            current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            log_wallet_action("Checking all wallets", f"at {current_time}")
+
+            # Check all wallets, or only the due ones with a per-wallet schedule
+            results = await self.multi_tracker.check_due_wallets_async()
+            self._log_check_results(results)
 
         except Exception as e:
             log_error("wallet check", e, "Multi-wallet tracker")
+
+    def _log_check_results(self, results):
+        """Log the outcome of a check cycle"""
+        # Count total changes
+        total_changes = sum(self.multi_tracker.count_changes(wallet_results) for wallet_results in results.values())
+
+        # Only print completion message if there were no important changes
+        if total_changes == 0:
+            self.logger.info("✅ No important changes detected across all wallets")
+        else:
+            self.logger.info(f"✅ Check completed - {total_changes} notifications sent")
+
+        # Follow the interval if the rate budget planner re-tuned it after this cycle
+        self.check_interval = self.multi_tracker.check_interval
+
+        from rate_limiter import format_rate_limiter_stats, format_rate_report
+        self.logger.info(f"🚦 Rate limiters: {format_rate_limiter_stats()}")
+        rate_report = format_rate_report()
+        if rate_report:
+            self.logger.info(f"📈 Achieved request rate: {rate_report}")
+        from circuit_breaker import format_circuit_breaker_stats
+        breaker_stats = format_circuit_breaker_stats()
+        if breaker_stats:
+            self.logger.info(f"🔌 Circuit breakers: {breaker_stats}")
+        if len(self.multi_tracker.key_pool) > 1:
+            self.logger.info(f"🔑 Etherscan keys: {self.multi_tracker.key_pool.format_stats()}")
+        if self.multi_tracker.poll_scheduler:
+            self.logger.info(f"⏱️ Poll schedule: {self.multi_tracker.poll_scheduler.format_stats()}")
     
     def send_initial_summary(self):
         """Send initial wallet summary on startup"""
@@ -85,7 +159,11 @@ class CryptoWalletMonitor:
     def run_manual_check(self):
         """Run a one-time check and display full summary"""
         self.logger.info("🔍 Running manual multi-wallet check...")
-        summaries = self.multi_tracker.get_all_wallets_summary()
+        try:
+            summaries = self.multi_tracker.get_all_wallets_summary()
+        finally:
+            # One-shot run: release the session, state store and core loop before printing
+            self.multi_tracker.close()
 
         separator = "=" * 80
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -138,65 +216,271 @@ class CryptoWalletMonitor:
         self.logger.info(f"📱 ACTIVE WALLETS: {active_wallets}")
         self.logger.info(f"{separator}")
     
+    def _watch_wallet_registry(self):
+        """Reload the wallet set between cycles when its file changes or on SIGHUP"""
+        import signal
+        watch_path = self.multi_tracker.registry_watcher.path
+        if watch_path:
+            self.logger.info(f"📂 Watching {watch_path} for wallet changes")
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, lambda signum, frame: self.multi_tracker.request_wallet_reload())
+            self.logger.info("🔄 Send SIGHUP to reload wallets without restarting")
+
     def start_monitoring(self):
         """Start continuous monitoring"""
-        self.send_initial_summary()
-
-        # Schedule regular checks
-        schedule.every(self.check_interval).seconds.do(self.check_wallet_changes)
+        self._watch_wallet_registry()
+
+        if self.multi_tracker.use_async:
+            self.start_async_monitoring()
+            return
+
+        if self.multi_tracker.warm_start:
+            # Saved-state summaries only read the state store, so they go out while the first check
+            # runs; live summaries share the trackers with the check and wait until it is done
+            without_state = []
+            snapshot_summaries = threading.Thread(
+                target=lambda: without_state.extend(self.multi_tracker.send_snapshot_summaries()), daemon=True
+            )
+            snapshot_summaries.start()
+            self.check_wallet_changes()
+            snapshot_summaries.join()
+            self.send_live_summaries(without_state)
+        else:
+            self.send_initial_summary()
 
         self.logger.info(f"🔄 Multi-wallet monitoring started. Checking every {self.check_interval} seconds.")
         self.logger.info("Press Ctrl+C to stop")
 
         try:
+            if self.multi_tracker.poll_scheduler:
+                # Per-wallet schedule: wake whenever the next wallet is due
+                while True:
+                    time.sleep(max(ADAPTIVE_POLL_MIN_SLEEP, self.multi_tracker.next_check_in()))
+                    self.check_wallet_changes()
+
+            # Schedule regular checks
+            import schedule
+            job = schedule.every(self.check_interval).seconds.do(self.check_wallet_changes)
             while True:
                 schedule.run_pending()
+                if job.interval != self.check_interval:
+                    # Interval re-tuned by the rate budget planner
+                    schedule.cancel_job(job)
+                    job = schedule.every(self.check_interval).seconds.do(self.check_wallet_changes)
                 time.sleep(1)
         except KeyboardInterrupt:
             self.logger.info("\n👋 Multi-wallet monitoring stopped by user")
+        finally:
+            self.multi_tracker.close()
 
-def main():
-    monitor = CryptoWalletMonitor()
+    def start_async_monitoring(self):
+        """Start continuous monitoring on one event loop that lives as long as the process"""
+        self.logger.info(f"🔄 Multi-wallet async monitoring started. Checking every {self.check_interval} seconds.")
+        self.logger.info("Press Ctrl+C to stop")
 
+        try:
+            # Runs on the tracker's own loop, so the pooled session, limiters
+            # and per-wallet state survive from one cycle to the next
+            self.multi_tracker.run_async(self.monitor_async())
+        except KeyboardInterrupt:
+            self.logger.info("\n👋 Multi-wallet monitoring stopped by user")
+        finally:
+            self.multi_tracker.close()
+
+    async def monitor_async(self):
+        """Send the initial summary, then run check cycles on a drift-corrected schedule"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+
+        snapshot_summaries = None
+        if self.multi_tracker.warm_start:
+            # Saved-state summaries only read the state store, so they go out while the first
+            # cycle runs; live summaries share the trackers with it and wait until it is done
+            snapshot_summaries = loop.run_in_executor(None, self.multi_tracker.send_snapshot_summaries)
+            next_run = loop.time()
+        else:
+            await self.send_initial_summary_async()
+            next_run = loop.time() + self.check_interval
+
+        while True:
+            await asyncio.sleep(max(0.0, next_run - loop.time()))
+            await self.check_wallet_changes_async()
+
+            if snapshot_summaries is not None:
+                await self.finish_warm_start_async(snapshot_summaries)
+                snapshot_summaries = None
+
+            if self.multi_tracker.poll_scheduler:
+                # Per-wallet schedule: wake whenever the next wallet is due
+                next_run = loop.time() + max(ADAPTIVE_POLL_MIN_SLEEP, self.multi_tracker.next_check_in())
+                continue
+
+            # Schedule against fixed ticks rather than "now + interval" so a
+            # slow cycle doesn't push every later cycle back
+            next_run += self.check_interval
+            now = loop.time()
+            if next_run <= now:
+                missed = int((now - next_run) // self.check_interval) + 1
+                self.logger.warning(f"⏱️ Check cycle overran the interval, skipping {missed} tick(s)")
+                next_run += missed * self.check_interval
+
+def list_wallets():
+    """List configured wallets from config alone, without building trackers or sessions"""
+    setup_logging(level="INFO", log_file="wallet_tracker.log")
+    config = load_config()
+    from utils import format_address
+
+    logger = get_logger(__name__)
+    logger.info("\n📱 Configured Wallets:")
+    logger.info(f"{'='*60}")
+
+    # Display notification settings summary
+    email_enabled = config['notification_settings']['email']['enabled']
+    telegram_enabled = config['notification_settings']['telegram']['enabled']
+    check_interval = config['check_interval']
+
+    logger.info(f"📧 Email: {'✅ Enabled' if email_enabled else '❌ Disabled'}")
+    logger.info(f"📱 Telegram: {'✅ Enabled' if telegram_enabled else '❌ Disabled'}")
+    logger.info(f"⏰ Check Interval: {check_interval} seconds ({check_interval//60} minutes)")
+    logger.info(f"{'='*60}")
+
+    for wallet_id, wallet_config in config["wallets"].items():
+        status = "✅ Active" if wallet_config.get("enabled", True) else "❌ Disabled"
+
+        logger.info(f"  {status} {wallet_config['name']}")
+        logger.info(f"      Address: {format_address(wallet_config['address'])}")
+        logger.info(f"      System ID: {wallet_id} (internal identifier)")
+
+        # Show custom notification settings
+        custom_telegram = wallet_config.get("telegram_chat_id")
+        custom_email = wallet_config.get("email_recipient")
+
+        if custom_telegram or custom_email:
+            logger.info(f"      📨 Custom Notifications:")
+            if custom_telegram:
+                logger.info(f"        📱 Telegram Chat: {custom_telegram}")
+            if custom_email:
+                logger.info(f"        📧 Email: {custom_email}")
+        logger.info("")
+
+def print_rate_plan(shard_count=None):
+    """Show whether a check cycle fits the interval under the configured rate limits"""
+    setup_logging(level="INFO", log_file="wallet_tracker.log")
+    config = load_config()
+    from rate_planner import plan_cycle, format_plan
+    logger = get_logger(__name__)
+
+    shards = shard_count or config["sharding"]["shard_count"]
+    wallet_count = len(config["wallets"].enabled_ids())
+    # Each shard gets a share of the wallets and of every rate limit
+    wallets_per_shard = -(-wallet_count // shards)
+    rate_limits = {upstream: rate / shards for upstream, rate in config["rate_limits"].items()}
+    # The Etherscan limit is per key, so every key adds to the budget
+    rate_limits[UPSTREAM_ETHERSCAN] *= len(config["etherscan_api_keys"])
+    # Spread schedules check each slot separately, so every slot sends its own balancemulti calls
+    batches = 1
+    if config["polling"]["mode"] == SCHEDULE_MODE_SPREAD:
+        batches = wallets_per_shard if config["polling"]["adaptive"] else min(SCHEDULE_SPREAD_SLOTS, wallets_per_shard)
+    plan = plan_cycle(
+        wallets_per_shard, rate_limits, config["check_interval"], config["max_concurrent_wallets"], batches=batches
+    )
+
+    logger.info("\n📐 Rate Budget Plan:")
+    logger.info(f"{'='*60}")
+    logger.info(f"Wallets: {wallet_count} enabled" + (f", {wallets_per_shard} per shard across {shards} shards" if shards > 1 else ""))
+    for line in format_plan(plan, rate_limits):
+        logger.info(f"  {line}")
+
+def _pop_option(args, name):
+    """Remove `name VALUE` from args and return VALUE (None if absent)"""
+    if name not in args:
+        return None
+    index = args.index(name)
+    if index + 1 >= len(args):
+        raise SystemExit(f"{name} needs a value")
+    value = args[index + 1]
+    del args[index:index + 2]
+    return value
+
+def run_shards(shard_count, args):
+    """Run shard_count worker processes on this host and restart any that exit with an error"""
+    import subprocess
+    import sys
+    setup_logging(level="INFO", log_file="wallet_tracker.log")
+    logger = get_logger(__name__)
+
+    def spawn(shard_id):
+        command = [sys.executable, os.path.abspath(__file__), "--shard-id", shard_id, "--shards", str(shard_count)]
+        return subprocess.Popen(command + args)
+
+    workers = {f"shard-{index}": None for index in range(shard_count)}
+    restart_at = {}
+    logger.info(f"🧩 Starting {shard_count} shard worker(s)")
+    try:
+        while True:
+            for shard_id, process in workers.items():
+                if process is None:
+                    if time.monotonic() >= restart_at.get(shard_id, 0):
+                        workers[shard_id] = spawn(shard_id)
+                    continue
+                code = process.poll()
+                if code is None:
+                    continue
+                workers[shard_id] = None
+                if code == 0:
+                    # A finished one-off run (e.g. --check); nothing to restart
+                    restart_at[shard_id] = float("inf")
+                else:
+                    logger.warning(f"⚠️ Shard {shard_id} exited with code {code}, restarting in {SHARD_RESTART_DELAY}s")
+                    restart_at[shard_id] = time.monotonic() + SHARD_RESTART_DELAY
+            if all(process is None and restart_at.get(shard_id) == float("inf") for shard_id, process in workers.items()):
+                return
+            time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info("\n👋 Stopping shard workers")
+    finally:
+        for process in workers.values():
+            if process is not None and process.poll() is None:
+                process.terminate()
+        for process in workers.values():
+            if process is not None:
+                process.wait()
+
+def main():
     # Check command line arguments
     import sys
-    if len(sys.argv) > 1 and sys.argv[1] == "--check":
+    args = sys.argv[1:]
+    shards = _pop_option(args, "--shards")
+    shard_id = _pop_option(args, "--shard-id")
+    if shards is not None:
+        if not shards.isdigit() or not 1 <= int(shards) <= MAX_SHARD_COUNT:
+            raise SystemExit(f"--shards must be between 1 and {MAX_SHARD_COUNT}")
+        if args and args[0] == "--plan":
+            print_rate_plan(int(shards))
+            return
+        if shard_id is None:
+            # Supervisor: one worker process per shard on this host
+            run_shards(int(shards), args)
+            return
+        os.environ["SHARD_COUNT"] = shards
+    if shard_id is not None:
+        # Worker: config reads the shard from the environment
+        os.environ["SHARD_ID"] = shard_id
+
+    if args and args[0] == "--plan":
+        # Planning only needs config, like --list
+        print_rate_plan()
+        return
+
+    if args and args[0] == "--list":
+        # Listing only needs config; skip tracker, session and notification setup
+        list_wallets()
+        return
+
+    monitor = CryptoWalletMonitor()
+
+    if args and args[0] == "--check":
         monitor.run_manual_check()
-    elif len(sys.argv) > 1 and sys.argv[1] == "--list":
-        # List configured wallets
-        logger = get_logger(__name__)
-        logger.info("\n📱 Configured Wallets:")
-        logger.info(f"{'='*60}")
-
-        # Display notification settings summary
-        email_enabled = monitor.config['notification_settings']['email']['enabled']
-        telegram_enabled = monitor.config['notification_settings']['telegram']['enabled']
-        check_interval = monitor.config['check_interval']
-
-        logger.info(f"📧 Email: {'✅ Enabled' if email_enabled else '❌ Disabled'}")
-        logger.info(f"📱 Telegram: {'✅ Enabled' if telegram_enabled else '❌ Disabled'}")
-        logger.info(f"⏰ Check Interval: {check_interval} seconds ({check_interval//60} minutes)")
-        logger.info(f"{'='*60}")
-
-        for wallet_id, wallet_config in monitor.multi_tracker.wallets.items():
-            status = "✅ Active" if monitor.multi_tracker.is_wallet_enabled(wallet_id) else "❌ Disabled"
-            from utils import format_address
-
-            logger.info(f"  {status} {wallet_config['name']}")
-            logger.info(f"      Address: {format_address(wallet_config['address'])}")
-            logger.info(f"      System ID: {wallet_id} (internal identifier)")
-
-            # Show custom notification settings
-            custom_telegram = wallet_config.get("telegram_chat_id")
-            custom_email = wallet_config.get("email_recipient")
-
-            if custom_telegram or custom_email:
-                logger.info(f"      📨 Custom Notifications:")
-                if custom_telegram:
-                    logger.info(f"        📱 Telegram Chat: {custom_telegram}")
-                if custom_email:
-                    logger.info(f"        📧 Email: {custom_email}")
-            logger.info("")
     else:
         monitor.start_monitoring()
 
@@ -4,12 +4,37 @@ Multi-Wallet Tracker - Orchestrates multiple wallet trackers with single respons
 """
 
 import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from wallet_tracker import WalletTracker, WalletTrackerError
-from async_wallet_tracker import AsyncMultiWalletTracker, AsyncWalletTrackerError
+from typing import Container, Dict, List, Mapping, Optional, Any
+from wallet_tracker import WalletTracker, WalletTrackerError, acquire_core_loop, release_core_loop, get_eth_balances
+from rate_limiter import configure_rate_limiter, get_rate_limiter
+from api_key_pool import get_api_key_pool
+from state_store import create_state_store, NullStateStore, StateStoreError
+from scheduler import AdaptivePollScheduler, SpreadPollScheduler, position_risk
+from constants import (
+    WARM_START_REFRESH_CONCURRENCY,
+    ADAPTIVE_POLL_MIN_INTERVAL,
+    ADAPTIVE_POLL_MAX_INTERVAL,
+    ADAPTIVE_POLL_DORMANT_AFTER,
+    ADAPTIVE_POLL_RISK_LEVERAGE,
+    ADAPTIVE_POLL_RISK_LIQUIDATION_DISTANCE,
+    SCHEDULE_MODE_SPREAD,
+    DEFAULT_SCHEDULE_MODE,
+    DEFAULT_SHARD_LEASE_PATH,
+    DEFAULT_SHARD_LEASE_TTL,
+    DEFAULT_MAX_CONCURRENT_WALLETS,
+    RATE_AIMD_MAX_FACTOR,
+    UPSTREAM_ETHERSCAN,
+    UPSTREAM_HYPERLIQUID
+)
 from notification_gateway import NotificationGateway
 from data_processor import DataProcessor
+from wallet_registry import LazyWalletObjects, RegistryWatcher, as_registry
+from sharding import ShardCoordinator
+from rate_planner import RatePlanner
+from cycle_guard import CycleGuard
 from utils import format_address
 
 class MultiWalletTracker:
@@ -17,135 +42,613 @@ class MultiWalletTracker:
 
     def __init__(self, config: Dict[str, Any], use_async: bool = True):
         self.config = config
-        self.wallets = config.get("wallets", {})
+        self.wallets = as_registry(config.get("wallets", {}))
+        # Every configured wallet; self.wallets is this shard's part of it when sharded
+        self._all_wallets = self.wallets
         self.etherscan_api_key = config.get("etherscan_api_key", "")
+        # Etherscan requests rotate over every configured key, each with its own budget
+        self.key_pool = get_api_key_pool(config.get("etherscan_api_keys") or [self.etherscan_api_key])
         self.check_interval = config.get("check_interval", 600)
         self.balance_threshold = config.get("balance_change_threshold", 0.1)
+        # Startup summaries from saved state; checks start without waiting for them
+        self.warm_start = config.get("warm_start", False)
 
         # Choose between sync and async implementation
         self.use_async = use_async
 
+        # Sharded mode: join the other shards and keep only the wallets hashed to this one
+        self.shard = None
+        sharding = config.get("sharding", {})
+        if sharding.get("shard_id"):
+            self.shard = ShardCoordinator(
+                sharding["shard_id"],
+                path=sharding.get("lease_path", DEFAULT_SHARD_LEASE_PATH),
+                lease_ttl=sharding.get("lease_ttl", DEFAULT_SHARD_LEASE_TTL)
+            )
+            live_shards = self.shard.join(sharding.get("shard_count", 1))
+            self.shard.take_membership_change()
+            self.wallets = self.shard.owned(self._all_wallets)
+            print(
+                f"🧩 Shard {self.shard.shard_id}: {len(self.wallets)} of {len(self._all_wallets)} wallet(s), "
+                f"{len(live_shards)} live shard(s)"
+            )
+
+        # Apply configured limits to the process-wide limiters before any tracker uses them
+        self._apply_rate_budget()
+
         # Initialize components with single responsibilities
         self.trackers = {}
         self.async_tracker = None
-        self.notification_gateway = NotificationGateway(config)
+        # Long-lived event loop so the async tracker's pooled session survives between cycles
+        self._loop = None
+        # Sync trackers share the process-wide core loop; hold it open until close()
+        acquire_core_loop()
+        self._holds_core_loop = True
+        # Which path served each wallet in the last cycle
+        self.last_cycle_report = {}
+        self.notification_gateway = NotificationGateway(config, self.wallets)
         self.data_processor = DataProcessor()
 
+        # Durable last-known state so a restart resumes change detection
+        try:
+            self.state_store = create_state_store(config)
+        except (StateStoreError, OSError) as e:
+            print(f"⚠️ State store unavailable, starting without saved state: {e}")
+            self.state_store = NullStateStore()
+        self.snapshots = {}
+        self._saved_snapshots = {}
+
+        # Wallet registry hot reload: polled between cycles, or requested (SIGHUP)
+        reload_settings = config.get("wallet_reload", {})
+        self.registry_watcher = RegistryWatcher(
+            reload_settings.get("watch_path") if reload_settings.get("enabled", False) else None
+        )
+        # Background initial summaries for wallets added by a reload
+        self._warm_tasks = set()
+
+        # Per-wallet schedule; None polls every wallet at once every check_interval
+        polling = config.get("polling", {})
+        spread = polling.get("mode", DEFAULT_SCHEDULE_MODE) == SCHEDULE_MODE_SPREAD
+        if polling.get("adaptive", False):
+            self.poll_scheduler = AdaptivePollScheduler(
+                self.check_interval,
+                min_interval=polling.get("min_interval", ADAPTIVE_POLL_MIN_INTERVAL),
+                max_interval=polling.get("max_interval", ADAPTIVE_POLL_MAX_INTERVAL),
+                dormant_after=polling.get("dormant_after", ADAPTIVE_POLL_DORMANT_AFTER),
+                spread=spread
+            )
+        elif spread:
+            self.poll_scheduler = SpreadPollScheduler(self.check_interval)
+        else:
+            self.poll_scheduler = None
+
+        # Checks the cycle fits the interval under the rate limits; may tune the interval
+        self.rate_planner = RatePlanner(self.check_interval, auto_tune=config.get("auto_tune_interval", False))
+        # Seconds the last cycle spent checking wallets, without notifications or state saving
+        self._check_seconds = None
+        # Per-cycle deadline, priority order and no overlapping cycles
+        self.cycle_guard = CycleGuard()
+
         if self.use_async:
             print("🚀 Using Async Multi-Wallet Tracker for improved performance")
         else:
-            print("🔄 Using Sync Multi-Wallet Tracker")
+            print("🔄 Using blocking Multi-Wallet Tracker (worker threads over the async core)")
 
         self._initialize_wallets()
+        self._plan_rate_budget()
+
+    def _check_concurrency(self) -> int:
+        """Wallets checked at the same time, by async workers or blocking worker threads"""
+        return self.config.get("max_concurrent_wallets", DEFAULT_MAX_CONCURRENT_WALLETS)
+
+    def _plan_rate_budget(self):
+        """Re-plan the cycle for the current wallets, limits and latency; apply a tuned interval"""
+        if self.poll_scheduler and self.poll_scheduler.checks_per_interval():
+            # Per-wallet intervals: dormant wallets cost less than one check per interval, hot ones more
+            wallet_checks = self.poll_scheduler.checks_per_interval()
+        else:
+            wallet_checks = len(self.wallets.enabled_ids())
+        rate_limits = {
+            UPSTREAM_ETHERSCAN: self.key_pool.total_rate(),
+            UPSTREAM_HYPERLIQUID: get_rate_limiter(UPSTREAM_HYPERLIQUID).rate
+        }
+
+        # Spread schedules check in separate slots, each with its own balancemulti calls
+        batches = self.poll_scheduler.batches_per_interval() if self.poll_scheduler else 1
+        self.rate_planner.update(wallet_checks, rate_limits, self._check_concurrency(), batches)
+        if self.rate_planner.check_interval != self.check_interval:
+            self.check_interval = self.rate_planner.check_interval
+            if self.poll_scheduler:
+                self.poll_scheduler.set_base_interval(self.check_interval)
 
     def _initialize_wallets(self):
-        """Initialize wallet trackers and setup notification gateway"""
-        for wallet_id, wallet_config in self.wallets.items():
-            if not wallet_config.get("enabled", True):
-                continue
+        """Set up lazily built wallet trackers and the notification gateway"""
+        # Trackers are built on first use, so startup cost doesn't grow with the registry
+        self.trackers = LazyWalletObjects(self.wallets, self._create_tracker, "wallet tracker")
+        print(f"✅ Registered {len(self.wallets.enabled_ids())} wallet(s) from {self.wallets.source}")
 
-            try:
-                # Create tracker for this wallet
-                tracker = WalletTracker(
-                    wallet_config["address"],
-                    self.etherscan_api_key
-                )
-                self.trackers[wallet_id] = tracker
+        self.notification_gateway.create_notification_systems()
 
-                print(f"✅ Initialized wallet: {wallet_config['name']} ({format_address(wallet_config['address'])})")
+        self._load_state()
+
+    def _create_tracker(self, wallet_id: str, wallet_config: Dict[str, Any]) -> WalletTracker:
+        """Create the sync tracker for one wallet, resuming from its saved snapshot"""
+        tracker = WalletTracker(wallet_config["address"], self.etherscan_api_key, key_pool=self.key_pool)
+        snapshot = self.snapshots.get(wallet_id)
+        if snapshot:
+            tracker.restore_state(snapshot)
+        return tracker
+
+    def _load_state(self):
+        """Load saved snapshots of registered wallets; trackers restore them when built"""
+        try:
+            snapshots = self.state_store.load_all()
+        except Exception as e:
+            print(f"⚠️ Failed to load saved wallet state: {e}")
+            return
+
+        for wallet_id, snapshot in snapshots.items():
+            wallet_config = self.wallets.get(wallet_id)
+            # A snapshot only applies if the wallet still points at the same address
+            if (wallet_config and self.wallets.is_enabled(wallet_id)
+                    and snapshot.get("address") == wallet_config["address"].lower()):
+                self.snapshots[wallet_id] = snapshot
+
+        self._saved_snapshots = {
+            wallet_id: self._comparable(snapshot) for wallet_id, snapshot in self.snapshots.items()
+        }
+        if self.snapshots:
+            print(f"💾 Restored saved state for {len(self.snapshots)} wallet(s)")
+
+    def _ensure_async_tracker(self) -> "AsyncMultiWalletTracker":
+        """Create the async tracker on first use and restore saved state into it"""
+        if not self.async_tracker:
+            # aiohttp is only imported once async mode is actually used
+            from async_wallet_tracker import AsyncMultiWalletTracker
+            self.async_tracker = AsyncMultiWalletTracker(self.config, self.wallets, key_pool=self.key_pool)
+            for wallet_id, snapshot in self.snapshots.items():
+                tracker = self.async_tracker.trackers.get(wallet_id)
+                if tracker:
+                    tracker.restore_state(snapshot)
+        return self.async_tracker
+
+    def request_wallet_reload(self):
+        """Reload the wallet registry before the next cycle; safe to call from a signal handler"""
+        self.registry_watcher.request()
+
+    def _apply_rate_budget(self):
+        """Configure the process-wide limiters with the full budget, or this shard's slice of it"""
+        rates = self.config.get("rate_limits", {})
+        if self.shard:
+            rates = self.shard.rate_share(rates)
+        # Adaptive limiters may find the upstream accepts more than configured
+        max_factor = RATE_AIMD_MAX_FACTOR if self.config.get("adaptive_rate_limit", False) else 1
+        for upstream, rate in rates.items():
+            if upstream == UPSTREAM_ETHERSCAN:
+                # ETHERSCAN_RATE_LIMIT is per key
+                self.key_pool.configure(rate, max_rate=rate * max_factor)
+            else:
+                configure_rate_limiter(upstream, rate, max_rate=rate * max_factor)
+
+    def reload_wallets_if_changed(self) -> List[str]:
+        """
+        Reload the registry if it changed since the last cycle, and rebalance if
+        shards joined or left; return the wallets that were started.
+        """
+        registry_changed = self.registry_watcher.poll()
+        membership_changed = self.shard is not None and self.shard.take_membership_change()
+        if not (registry_changed or membership_changed):
+            return []
+
+        registry = self._all_wallets
+        if registry_changed:
+            from config import reload_wallet_registry, ConfigurationError
+            try:
+                registry = reload_wallet_registry()
+            except ConfigurationError as e:
+                print(f"⚠️ Wallet registry reload failed, keeping the current wallets: {e}")
+                if not membership_changed:
+                    return []
+
+        if self.shard is None:
+            self._all_wallets = registry
+            return self.apply_wallet_registry(registry)
+        return self._rebalance_shard(registry, membership_changed)
+
+    def _rebalance_shard(self, registry: Mapping, membership_changed: bool) -> List[str]:
+        """Track this shard's part of registry; return the wallets that are new to the deployment"""
+        previous = self._all_wallets
+        self._all_wallets = registry
+        if membership_changed:
+            self._apply_rate_budget()
+            print(f"🧩 Shards changed: {', '.join(self.shard.live_shards())}")
+
+        # Wallets still in the registry moved to another shard, which picks up their saved state
+        started = self.apply_wallet_registry(self.shard.owned(registry), handed_off=registry)
+
+        # Wallets handed over by another shard were already announced there; no second summary
+        return [
+            wallet_id for wallet_id in started
+            if not (wallet_id in previous and previous.is_enabled(wallet_id)
+                    and previous[wallet_id]["address"].lower() == registry[wallet_id]["address"].lower())
+        ]
+
+    def apply_wallet_registry(self, registry: Mapping, handed_off: Container = ()) -> List[str]:
+        """
+        Bring the tracked wallets in line with a reloaded registry; return the wallets that were started.
 
+        Only added, removed and edited wallets are touched: other trackers keep
+        their baselines and the async tracker keeps its pooled session.
+        Removed wallets in handed_off keep their saved state for the shard that takes them over.
+        """
+        added, removed, changed = self.wallets.diff(registry)
+        if not (added or removed or changed):
+            return []
+
+        stopped, started, relabeled = [], [], []
+        forgotten = [wallet_id for wallet_id in removed if wallet_id not in handed_off]
+        for wallet_id in removed:
+            if self.wallets.is_enabled(wallet_id):
+                stopped.append(wallet_id)
+        for wallet_id in added:
+            if registry[wallet_id].get("enabled", True):
+                started.append(wallet_id)
+        for wallet_id in changed:
+            old, new = self.wallets[wallet_id], registry[wallet_id]
+            was_enabled, is_enabled = old.get("enabled", True), new.get("enabled", True)
+            if old["address"].lower() != new["address"].lower():
+                # A new address is a new wallet; the old baseline no longer applies
+                forgotten.append(wallet_id)
+                if was_enabled:
+                    stopped.append(wallet_id)
+                if is_enabled:
+                    started.append(wallet_id)
+            elif was_enabled and not is_enabled:
+                stopped.append(wallet_id)
+            elif is_enabled and not was_enabled:
+                started.append(wallet_id)
+            else:
+                relabeled.append(wallet_id)
+
+        for wallet_id in stopped:
+            self._stop_wallet(wallet_id)
+        for wallet_id in forgotten:
+            try:
+                self.state_store.delete(wallet_id)
             except Exception as e:
-                print(f"❌ Failed to initialize wallet {wallet_id}: {e}")
+                print(f"⚠️ Failed to delete saved state for wallet {wallet_id}: {e}")
 
-        # Initialize notification gateway after all wallets are set up
-        self.notification_gateway.create_notification_systems()
+        self.wallets.apply(registry)
+
+        # Name or notification target changed: rebuild the notification system on next use
+        for wallet_id in relabeled:
+            self.notification_gateway.notification_systems.discard(wallet_id)
+        if started:
+            self._start_wallets(started)
 
-    def check_all_wallets(self) -> Dict[str, List[Dict]]:
-        """Check all enabled wallets for changes (sync or async based on configuration)"""
+        print(f"🔄 Wallet registry reloaded: {len(added)} added, {len(removed)} removed, {len(changed)} changed")
+        return started
+
+    def _stop_wallet(self, wallet_id: str):
+        """Drop a wallet's trackers and notification system; its saved state stays in the store"""
+        self.cycle_guard.forget(wallet_id)
+        self.trackers.discard(wallet_id)
+        self.notification_gateway.notification_systems.discard(wallet_id)
+        if self.async_tracker:
+            self.async_tracker.remove_wallet(wallet_id)
+        self.snapshots.pop(wallet_id, None)
+        self._saved_snapshots.pop(wallet_id, None)
+
+    def _start_wallets(self, wallet_ids: List[str]):
+        """Restore saved state for newly enabled wallets and add them to the async tracker"""
+        try:
+            saved = self.state_store.load_all()
+        except Exception as e:
+            print(f"⚠️ Failed to load saved wallet state: {e}")
+            saved = {}
+
+        for wallet_id in wallet_ids:
+            wallet_config = self.wallets[wallet_id]
+            snapshot = saved.get(wallet_id)
+            if snapshot and snapshot.get("address") == wallet_config["address"].lower():
+                self.snapshots[wallet_id] = snapshot
+                self._saved_snapshots[wallet_id] = self._comparable(snapshot)
+
+            # Sync trackers and notification systems are built lazily from the registry
+            if self.async_tracker:
+                tracker = self.async_tracker.add_wallet(wallet_id, wallet_config)
+                if wallet_id in self.snapshots:
+                    tracker.restore_state(self.snapshots[wallet_id])
+
+    def _summarize_from_snapshots(self, wallet_ids: List[str]) -> List[str]:
+        """Send saved-state summaries where warm start allows; return the wallets that need a live summary"""
+        if self.warm_start and any(wallet_id in self.snapshots for wallet_id in wallet_ids):
+            return self.send_snapshot_summaries(wallet_ids)
+        return list(wallet_ids)
+
+    def _warm_new_wallets_sync(self, wallet_ids: List[str]):
+        """Send initial summaries for wallets added by a reload (synchronous implementation)"""
+        missing = self._summarize_from_snapshots(wallet_ids)
+        if missing:
+            self._send_initial_summary_sync(missing)
+
+    async def _warm_new_wallets_async(self, wallet_ids: List[str]):
+        """Send initial summaries for wallets added by a reload (asynchronous implementation)"""
+        loop = asyncio.get_running_loop()
+        missing = await loop.run_in_executor(None, self._summarize_from_snapshots, wallet_ids)
+        if missing:
+            await self._send_initial_summary_async(missing, WARM_START_REFRESH_CONCURRENCY)
+
+    async def _wait_for_warm_tasks(self):
+        """Wait for pending reload summaries"""
+        await asyncio.gather(*self._warm_tasks, return_exceptions=True)
+
+    def save_state(self, wallet_ids: Optional[List[str]] = None):
+        """Save snapshots of wallets (all, or only wallet_ids) whose state changed since the last save"""
+        # Sync trackers that were never built have nothing new to save
+        trackers = self.async_tracker.trackers if self.use_async and self.async_tracker else self.trackers.built()
+        if wallet_ids is not None:
+            trackers = {wallet_id: trackers[wallet_id] for wallet_id in wallet_ids if wallet_id in trackers}
+
+        changed = {}
+        for wallet_id, tracker in trackers.items():
+            snapshot = tracker.export_state()
+            comparable = self._comparable(snapshot)
+            if self._saved_snapshots.get(wallet_id) != comparable:
+                changed[wallet_id] = snapshot
+                self.snapshots[wallet_id] = snapshot
+
+        if not changed:
+            return
+        try:
+            self.state_store.save_many(changed)
+        except Exception as e:
+            print(f"⚠️ Failed to save wallet state: {e}")
+            return
+        for wallet_id, snapshot in changed.items():
+            self._saved_snapshots[wallet_id] = self._comparable(snapshot)
+
+    @staticmethod
+    def _comparable(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Snapshot without its timestamp, for change detection between saves"""
+        return {key: value for key, value in snapshot.items() if key != "updated_at"}
+
+    def check_all_wallets(self, wallet_ids: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        """Check all enabled wallets (or only wallet_ids) for changes (sync or async based on configuration)"""
         if self.use_async:
-            return self._check_all_wallets_async()
+            return self._check_all_wallets_async(wallet_ids)
         else:
-            return self._check_all_wallets_sync()
+            return self._check_all_wallets_sync(wallet_ids)
+
+    def check_due_wallets(self) -> Dict[str, List[Dict]]:
+        """Check the wallets whose scheduled poll time has come, or every wallet without a per-wallet schedule"""
+        if not self.poll_scheduler:
+            return self.check_all_wallets()
+        wallet_ids = self.poll_scheduler.due(self.get_wallet_ids())
+        return self.check_all_wallets(wallet_ids) if wallet_ids else {}
+
+    def next_check_in(self) -> float:
+        """Seconds until the next wallet is due; the full check interval without a per-wallet schedule"""
+        if not self.poll_scheduler:
+            return self.check_interval
+        return self.poll_scheduler.next_due_in()
+
+    def _record_poll_results(self, results: Dict[str, Any]):
+        """Reschedule each checked wallet and update its priority from its result and current positions"""
+        for wallet_id, wallet_results in results.items():
+            changed = self.count_changes(wallet_results) > 0
+            self.cycle_guard.record(wallet_id, changed)
+            if self.poll_scheduler:
+                self.poll_scheduler.record(
+                    wallet_id, changed, self._last_known_positions(wallet_id), failed=self._has_error(wallet_results)
+                )
+
+    def _is_urgent(self, wallet_id: str) -> bool:
+        """High leverage or a position near liquidation: check before the other wallets"""
+        leverage, liquidation_distance = position_risk(self._last_known_positions(wallet_id))
+        return leverage >= ADAPTIVE_POLL_RISK_LEVERAGE or (
+            liquidation_distance is not None and liquidation_distance <= ADAPTIVE_POLL_RISK_LIQUIDATION_DISTANCE
+        )
+
+    def _begin_cycle(self) -> bool:
+        """Start a cycle under the deadline budget; False if the previous one is still running"""
+        if not self.cycle_guard.begin(self.check_interval):
+            print("⏭️ Previous check cycle is still running, skipping this one")
+            return False
+        self._check_seconds = None
+        return True
+
+    def _last_known_positions(self, wallet_id: str) -> Optional[Dict]:
+        """Latest positions of a wallet from whichever tracker checked it"""
+        tracker = None
+        if self.use_async and self.async_tracker:
+            tracker = self.async_tracker.trackers.get(wallet_id)
+        if tracker is None:
+            tracker = self.trackers.built().get(wallet_id)
+        return tracker.last_known_positions if tracker else None
+
+    def _check_all_wallets_sync(self, wallet_ids: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        """Check all enabled wallets (or only wallet_ids) for changes on a bounded thread pool (synchronous implementation)"""
+        if not self._begin_cycle():
+            return {}
 
-    def _check_all_wallets_sync(self) -> Dict[str, List[Dict]]:
-        """Check all enabled wallets for changes (synchronous implementation)"""
         results = {}
+        planned = []
+        try:
+            new_wallet_ids = self.reload_wallets_if_changed()
+            planned = self.cycle_guard.prioritize(
+                list(self.trackers) if wallet_ids is None else [
+                    wallet_id for wallet_id in wallet_ids if wallet_id in self.trackers
+                ],
+                self._is_urgent
+            )
+
+            check_started = time.monotonic()
+            # One batched balance lookup serves every wallet in this cycle
+            balances = self._get_eth_balances_sync(planned)
+
+            def check(wallet_id: str) -> Optional[List[Dict]]:
+                # No new wallet starts past the soft deadline; it is deferred instead
+                if self.cycle_guard.past_soft_deadline():
+                    return None
+                return self._check_single_wallet_sync(wallet_id, balances.get(wallet_id))
+
+            # Workers share the pooled session and the process-wide rate limiters
+            max_workers = max(1, min(self._check_concurrency(), len(planned)))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wallet-check") as executor:
+                for wallet_id, wallet_results in zip(planned, executor.map(check, planned)):
+                    if wallet_results is not None:
+                        results[wallet_id] = wallet_results
+            # Timed before state saving; sync workers send their own notifications, so those stay in
+            self._check_seconds = time.monotonic() - check_started
+        finally:
+            deferred = self.cycle_guard.end(planned, results)
+
+        self._record_cycle_report(self._served_by(results, "sync"), deferred)
+        self._record_poll_results(results)
+        self.save_state(list(results))
+
+        # New wallets were baselined by this cycle; their summaries go out after it
+        if new_wallet_ids:
+            self._warm_new_wallets_sync(new_wallet_ids)
+        return results
 
-        for wallet_id, tracker in self.trackers.items():
-            wallet_config = self.wallets[wallet_id]
+    def _check_single_wallet_sync(self, wallet_id: str, prefetched_balance: Optional[float] = None) -> List[Dict]:
+        """Check one wallet with its sync tracker and send notifications for any changes"""
+        tracker = self.trackers[wallet_id]
+        wallet_config = self.wallets[wallet_id]
 
-            wallet_results = []
+        wallet_results = []
 
-            try:
-                print(f"\n🔍 Checking wallet: {wallet_config['name']} ({format_address(wallet_config['address'])}) at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-                # Check balance changes
-                balance_changed, current_balance, change = tracker.check_balance_change()
-                if balance_changed:
-                    old_balance = tracker.last_known_balance - change
-                    success = self.notification_gateway.send_balance_change_notification(wallet_id, old_balance, current_balance, change)
-                    if not success:
-                        print(f"❌ Failed to send balance change notification for wallet {wallet_id}")
-
-                    wallet_results.append({
-                        "type": "balance_change",
-                        "wallet_id": wallet_id,
-                        "wallet_name": wallet_config["name"],
-                        "old_balance": old_balance,
-                        "new_balance": current_balance,
-                        "change": change
-                    })
-
-                # Check position changes
-                positions_changed, positions, change_type = tracker.check_position_changes()
-                if positions_changed:
-                    success = self.notification_gateway.send_position_change_notification(wallet_id, positions, change_type)
-                    if not success:
-                        print(f"❌ Failed to send position change notification for wallet {wallet_id}")
-
-                    changed_coin = positions.get("_changed_coin", "Unknown")
-                    wallet_results.append({
-                        "type": "position_change",
-                        "wallet_id": wallet_id,
-                        "wallet_name": wallet_config["name"],
-                        "change_type": change_type,
-                        "positions": positions,
-                        "changed_coin": changed_coin
-                    })
-
-                # Check for deposit/withdrawal transactions
-                has_deposit_withdrawal, deposit_txs = tracker.check_deposit_withdrawal()
-                if has_deposit_withdrawal:
-                    success = self.notification_gateway.send_deposit_withdrawal_notification(wallet_id, deposit_txs)
-                    if not success:
-                        print(f"❌ Failed to send deposit/withdrawal notification for wallet {wallet_id}")
-
-                    wallet_results.append({
-                        "type": "deposit_withdrawal",
-                        "wallet_id": wallet_id,
-                        "wallet_name": wallet_config["name"],
-                        "transactions": deposit_txs
-                    })
-
-                # Only print completion message if there were no important changes
-                if not wallet_results:
-                    print("✅ No important changes detected")
-                else:
-                    print(f"✅ Found {len(wallet_results)} changes")
+        try:
+            print(f"\n🔍 Checking wallet: {wallet_config['name']} ({format_address(wallet_config['address'])}) at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-                results[wallet_id] = wallet_results
+            # Balance, positions and deposits are checked concurrently by the tracker core
+            result = tracker.check_wallet(prefetched_balance)
+            self._send_result_notifications(wallet_id, result)
 
-            except Exception as e:
-                print(f"❌ Error checking wallet {wallet_id}: {e}")
+            if result["balance_changed"]:
                 wallet_results.append({
-                    "type": "error",
+                    "type": "balance_change",
                     "wallet_id": wallet_id,
                     "wallet_name": wallet_config["name"],
-                    "error": str(e)
+                    "old_balance": result["old_balance"],
+                    "new_balance": result["new_balance"],
+                    "change": result["balance_change"]
                 })
-                results[wallet_id] = wallet_results
 
-        return results
+            if result["positions_changed"]:
+                positions = result["new_positions"]
+                wallet_results.append({
+                    "type": "position_change",
+                    "wallet_id": wallet_id,
+                    "wallet_name": wallet_config["name"],
+                    "change_type": result["position_change_type"],
+                    "positions": positions,
+                    "changed_coin": positions.get("_changed_coin", "Unknown")
+                })
+
+            if result["deposit_withdrawal"]:
+                wallet_results.append({
+                    "type": "deposit_withdrawal",
+                    "wallet_id": wallet_id,
+                    "wallet_name": wallet_config["name"],
+                    "transactions": result["deposit_transactions"]
+                })
+
+            # A prefetched balance change still counts when the wallet's own requests all failed
+            if "error" in result:
+                raise WalletTrackerError(result["error"])
+
+            # Only print completion message if there were no important changes
+            if not wallet_results:
+                print("✅ No important changes detected")
+            else:
+                print(f"✅ Found {len(wallet_results)} changes")
+
+        except Exception as e:
+            print(f"❌ Error checking wallet {wallet_id}: {e}")
+            wallet_results.append({
+                "type": "error",
+                "wallet_id": wallet_id,
+                "wallet_name": wallet_config["name"],
+                "error": str(e)
+            })
+
+        return wallet_results
+
+    @staticmethod
+    def _has_error(wallet_results) -> bool:
+        """Check whether a sync (list) or async (dict) wallet result is a failure"""
+        if isinstance(wallet_results, dict):
+            return not wallet_results.get("success", True)
+        return any(result.get("type") == "error" for result in wallet_results)
+
+    @staticmethod
+    def count_changes(wallet_results) -> int:
+        """Number of changes (notifications) in a sync (list) or async (dict) wallet result"""
+        if isinstance(wallet_results, dict):
+            return sum(bool(wallet_results.get(key)) for key in ("balance_changed", "positions_changed", "deposit_withdrawal"))
+        return sum(result.get("type") != "error" for result in wallet_results)
+
+    def _served_by(self, results: Dict[str, Any], path: str) -> Dict[str, str]:
+        """Map each wallet in results to path, or to "failed" if its result is an error"""
+        return {
+            wallet_id: "failed" if self._has_error(wallet_results) else path
+            for wallet_id, wallet_results in results.items()
+        }
+
+    def _record_cycle_report(self, paths: Dict[str, str], deferred: Optional[List[str]] = None):
+        """Remember which path (async, sync, failed) served each wallet and which were deferred"""
+        self.last_cycle_report = {
+            "timestamp": datetime.now().isoformat(),
+            "paths": paths,
+            "deferred": list(deferred or [])
+        }
+        print(f"📋 Cycle report: {self.format_cycle_report()}")
+
+        if self._check_seconds is not None:
+            self.rate_planner.observe_cycle(len(paths), self._check_seconds, self._check_concurrency())
+            self._check_seconds = None
+        self._plan_rate_budget()
+
+    def format_cycle_report(self) -> str:
+        """One-line summary of the last cycle report for logs"""
+        paths = self.last_cycle_report.get("paths", {})
+        deferred = self.last_cycle_report.get("deferred", [])
+        if not paths and not deferred:
+            return "no wallets checked"
+
+        parts = []
+        for path in ("async", "sync", "failed"):
+            wallet_ids = [wallet_id for wallet_id, served_by in paths.items() if served_by == path]
+            if not wallet_ids:
+                continue
+            # Listing every async wallet is noise; the exceptions are what matter
+            if path in ("async", "sync"):
+                parts.append(f"{len(wallet_ids)} {path}")
+            else:
+                parts.append(f"{len(wallet_ids)} {path} ({', '.join(wallet_ids)})")
+        if deferred:
+            # Deadline reached: these go first next cycle
+            parts.append(f"{len(deferred)} deferred ({', '.join(deferred[:10])}{', ...' if len(deferred) > 10 else ''})")
+        return ", ".join(parts)
+
+    def _get_eth_balances_sync(self, wallet_ids: Optional[List[str]] = None) -> Dict[str, float]:
+        """Fetch balances for all tracked wallets (or only wallet_ids) in balancemulti batches, keyed by wallet ID"""
+        address_by_wallet = {
+            wallet_id: self.wallets[wallet_id]["address"].lower()
+            for wallet_id in (self.trackers if wallet_ids is None else wallet_ids)
+        }
+        if not address_by_wallet:
+            return {}
+
+        balances_by_address = get_eth_balances(list(address_by_wallet.values()), self.key_pool)
+        return {
+            wallet_id: balances_by_address[address]
+            for wallet_id, address in address_by_wallet.items()
+            if address in balances_by_address
+        }
 
     def get_all_wallets_summary(self) -> Dict[str, Dict]:
         """Get comprehensive summary of all wallets"""
@@ -176,26 +679,95 @@ class MultiWalletTracker:
     def send_initial_summary(self):
         """
         Send initial summary notifications for all wallets (sync or async based on configuration).
+
+        With warm start, wallets that have a saved snapshot are summarized from
+        it without any API call; only the rest are fetched live, at low
+        concurrency so they don't compete with the check cycle.
         """
         print("📊 Generating initial multi-wallet summary...")
 
+        if self.warm_start and self.snapshots:
+            self.send_live_summaries(self.send_snapshot_summaries())
+            return
+
         if self.use_async:
             try:
-                # Use asyncio.run() which handles event loop creation properly
-                asyncio.run(self._send_initial_summary_async())
+                self.run_async(self._send_initial_summary_async())
             except Exception as e:
                 print(f"❌ Error in async initial summary, falling back to sync: {e}")
                 self._send_initial_summary_sync()
         else:
             self._send_initial_summary_sync()
 
-    def _send_initial_summary_sync(self):
-        """Send initial summary notifications (synchronous implementation)"""
-        for wallet_id, tracker in self.trackers.items():
+    def send_live_summaries(self, wallet_ids: List[str]):
+        """
+        Fetch and send live summaries for the wallets a warm start had no saved state for.
+
+        A live summary uses the wallet's tracker, so with warm start this runs
+        after the first check rather than alongside it.
+        """
+        if not wallet_ids:
+            return
+        print(f"📊 Fetching live summaries for {len(wallet_ids)} wallet(s) without saved state...")
+        if self.use_async:
+            self.run_async(self._send_initial_summary_async(wallet_ids, WARM_START_REFRESH_CONCURRENCY))
+        else:
+            self._send_initial_summary_sync(wallet_ids)
+
+    async def send_live_summaries_async(self, wallet_ids: List[str]):
+        """Fetch and send live summaries for wallets without saved state, from inside a running event loop"""
+        if not wallet_ids:
+            return
+        print(f"📊 Fetching live summaries for {len(wallet_ids)} wallet(s) without saved state...")
+        await self._send_initial_summary_async(wallet_ids, WARM_START_REFRESH_CONCURRENCY)
+
+    def send_snapshot_summaries(self, wallet_ids: Optional[List[str]] = None) -> List[str]:
+        """Send initial summaries rendered from saved snapshots; return the wallets that have none"""
+        missing = []
+        sent = 0
+        for wallet_id in (list(self.trackers) if wallet_ids is None else wallet_ids):
             if not self.is_wallet_enabled(wallet_id):
                 continue
 
-            wallet_config = self.wallets[wallet_id]
+            snapshot = self.snapshots.get(wallet_id)
+            if not snapshot:
+                missing.append(wallet_id)
+                continue
+
+            try:
+                summary = self.data_processor.normalize_summary(self._summary_from_snapshot(wallet_id, snapshot))
+                self.notification_gateway.send_initial_summary(wallet_id, summary, use_async=self.use_async)
+                sent += 1
+            except Exception as e:
+                print(f"❌ Error sending saved-state summary for wallet {wallet_id}: {e}")
+
+        print(f"⚡ Warm start: sent {sent} summaries from saved state")
+        return missing
+
+    def _summary_from_snapshot(self, wallet_id: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a get_summary()-shaped dict from a saved snapshot"""
+        # The stats helper is static, so no tracker is built just to summarise a snapshot
+        from async_wallet_tracker import AsyncWalletTracker
+        positions = snapshot.get("positions")
+        stats = AsyncWalletTracker.calculate_position_stats(positions) if positions else {}
+        snapshot_time = datetime.fromtimestamp(snapshot.get("updated_at", 0)).strftime('%Y-%m-%d %H:%M:%S')
+
+        return {
+            "wallet_address": self.wallets[wallet_id]["address"],
+            "eth_balance": snapshot.get("balance") or 0.0,
+            "hyperliquid_positions": positions,
+            "position_stats": stats,
+            "snapshot_time": snapshot_time,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _send_initial_summary_sync(self, wallet_ids: Optional[List[str]] = None):
+        """Send initial summary notifications for all wallets or only wallet_ids (synchronous implementation)"""
+        for wallet_id in (list(self.trackers) if wallet_ids is None else wallet_ids):
+            if not self.is_wallet_enabled(wallet_id):
+                continue
+
+            tracker = self.trackers[wallet_id]
 
             try:
                 summary = tracker.get_summary()
@@ -209,14 +781,15 @@ class MultiWalletTracker:
                 # Log and continue with other wallets instead of aborting all
                 print(f"❌ Error sending initial summary for wallet {wallet_id}: {e}")
 
-    async def _send_initial_summary_async(self):
-        """Send initial summary notifications (asynchronous implementation)"""
-        if not self.async_tracker:
-            self.async_tracker = AsyncMultiWalletTracker(self.config)
+    async def _send_initial_summary_async(self, wallet_ids: Optional[List[str]] = None,
+                                          max_concurrent: Optional[int] = None):
+        """Send initial summary notifications for all wallets or only wallet_ids (asynchronous implementation)"""
+        self._ensure_async_tracker()
+        loop = asyncio.get_running_loop()
 
         try:
             # Get async summaries for all wallets
-            summaries = await self.async_tracker.get_all_summaries_async()
+            summaries = await self.async_tracker.get_all_summaries_async(wallet_ids, max_concurrent)
 
             for wallet_id, summary in summaries.items():
                 if not self.is_wallet_enabled(wallet_id) or "error" in summary:
@@ -226,8 +799,10 @@ class MultiWalletTracker:
                     # Normalize summary data
                     normalized_summary = self.data_processor.normalize_summary(summary)
 
-                    # Send notification through gateway
-                    self.notification_gateway.send_initial_summary(wallet_id, normalized_summary, use_async=True)
+                    # Send notification through gateway; blocking sends run in a worker thread
+                    await loop.run_in_executor(
+                        None, self.notification_gateway.send_initial_summary, wallet_id, normalized_summary, True
+                    )
 
                 except Exception as e:
                     # Log and continue with other wallets instead of aborting all
@@ -236,19 +811,51 @@ class MultiWalletTracker:
         except Exception as e:
             print(f"❌ Error in async initial summary: {e}")
 
+    def run_async(self, coro):
+        """
+        Run a coroutine on the tracker's long-lived event loop.
+
+        asyncio.run() would build and close a new loop on every call, which
+        throws away the pooled aiohttp session and its keep-alive connections.
+        The async monitoring daemon also runs on this loop for its whole life.
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    # Backward compatible private name
+    _run_coroutine = run_async
+
+    def close(self):
+        """Cancel leftover tasks, close pooled sessions and the long-lived event loop"""
+        if self.shard:
+            self.shard.leave()
+        # Sync trackers run on a background loop shared with other owners; only drop our reference
+        if self._holds_core_loop:
+            self._holds_core_loop = False
+            release_core_loop()
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            # A KeyboardInterrupt can leave the daemon task pending on the loop
+            pending = [task for task in asyncio.all_tasks(self._loop) if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+            if self.async_tracker:
+                self._loop.run_until_complete(self.async_tracker.close_all())
+        finally:
+            self._loop.close()
+            self._loop = None
+
     def __del__(self):
         """Cleanup when object is destroyed"""
-        if self.async_tracker:
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # Schedule cleanup in the background
-                    asyncio.create_task(self.async_tracker.close_all())
-                else:
-                    # Run cleanup immediately
-                    loop.run_until_complete(self.async_tracker.close_all())
-            except Exception:
-                pass  # Ignore cleanup errors
+        try:
+            self.close()
+        except Exception:
+            pass  # Ignore cleanup errors
 
     def get_wallet_ids(self) -> List[str]:
         """Get list of all wallet IDs"""
@@ -260,76 +867,182 @@ class MultiWalletTracker:
 
     def is_wallet_enabled(self, wallet_id: str) -> bool:
         """Check if a wallet is enabled"""
-        wallet_config = self.wallets.get(wallet_id)
-        return wallet_config.get("enabled", True) if wallet_config else False
+        return self.wallets.is_enabled(wallet_id)
 
-    def _check_all_wallets_async(self) -> Dict[str, List[Dict]]:
-        """Check all enabled wallets for changes (asynchronous implementation)"""
+    def _check_all_wallets_async(self, wallet_ids: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        """Check all enabled wallets (or only wallet_ids) for changes (asynchronous implementation)"""
         try:
-            # Use asyncio.run() which handles event loop creation properly
-            return asyncio.run(self._run_async_checks())
+            results = self.run_async(self._run_async_checks(wallet_ids))
+            # The loop only runs inside run_async, so finish reload summaries before returning
+            if self._warm_tasks:
+                self.run_async(self._wait_for_warm_tasks())
+            return results
         except Exception as e:
+            # Unchecked wallets were deferred by the cycle guard and go first next cycle
             print(f"❌ Error in async wallet checks: {e}")
-            # Fallback to sync mode
-            print("🔄 Falling back to synchronous mode")
-            return self._check_all_wallets_sync()
+            return {}
 
-    async def _run_async_checks(self) -> Dict[str, List[Dict]]:
-        """Run async wallet checks and handle notifications"""
-        if not self.async_tracker:
-            self.async_tracker = AsyncMultiWalletTracker(self.config)
+    async def check_all_wallets_async(self, wallet_ids: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        """
+        Check all wallets (or only wallet_ids) from inside an already running event loop.
 
-        try:
-            # Get async results
-            async_results = await self.async_tracker.check_all_wallets_async()
-
-            # Normalize async results to ensure consistent data types
-            normalized_results = self.data_processor.normalize_async_results(async_results)
-
-            # Process notifications for each wallet through gateway
-            for wallet_id, wallet_results in normalized_results.items():
-                # Check for balance change
-                if wallet_results.get("balance_changed", False):
-                    success = self.notification_gateway.send_balance_change_notification(
-                        wallet_id,
-                        wallet_results.get("old_balance", 0),
-                        wallet_results.get("new_balance", 0),
-                        wallet_results.get("balance_change", 0)
-                    )
-                    if not success:
-                        print(f"❌ Failed to send async balance change notification for wallet {wallet_id}")
+        Used by the async monitoring daemon, which keeps one loop (and with it
+        the pooled session, limiters and tracker state) alive between cycles.
+        """
+        return await self._run_async_checks(wallet_ids)
+
+    async def check_due_wallets_async(self) -> Dict[str, List[Dict]]:
+        """Check the wallets whose scheduled poll time has come, from inside a running event loop"""
+        if not self.poll_scheduler:
+            return await self._run_async_checks()
+        wallet_ids = self.poll_scheduler.due(self.get_wallet_ids())
+        return await self._run_async_checks(wallet_ids) if wallet_ids else {}
+
+    async def send_initial_summary_async(self):
+        """Send initial summary notifications from inside an already running event loop"""
+        print("📊 Generating initial multi-wallet summary...")
 
-                # Check for position change
-                if wallet_results.get("positions_changed", False):
-                    positions = wallet_results.get("new_positions", {})
-                    change_type = wallet_results.get("position_change_type", "position_changed")
+        if self.warm_start and self.snapshots:
+            loop = asyncio.get_running_loop()
+            await self.send_live_summaries_async(await loop.run_in_executor(None, self.send_snapshot_summaries))
+            return
 
-                    success = self.notification_gateway.send_position_change_notification(wallet_id, positions, change_type)
-                    if not success:
-                        print(f"❌ Failed to send async position change notification for wallet {wallet_id}")
+        await self._send_initial_summary_async()
+
+    async def _run_async_checks(self, wallet_ids: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        """Run async wallet checks (all wallets, or only wallet_ids) within the cycle deadline"""
+        if not self._begin_cycle():
+            return {}
+
+        results = {}
+        planned = []
+        try:
+            self._ensure_async_tracker()
+
+            # Reloaded wallets join this cycle; their summaries are sent alongside it
+            new_wallet_ids = self.reload_wallets_if_changed()
+            if new_wallet_ids:
+                task = asyncio.create_task(self._warm_new_wallets_async(new_wallet_ids))
+                self._warm_tasks.add(task)
+                task.add_done_callback(self._warm_tasks.discard)
+
+            planned = self.cycle_guard.prioritize(
+                self.get_wallet_ids() if wallet_ids is None else [
+                    wallet_id for wallet_id in wallet_ids if wallet_id in self.trackers
+                ],
+                self._is_urgent
+            )
+            results = await self._check_planned_wallets_async(planned)
+            return results
+        finally:
+            self.cycle_guard.end(planned, results)
+
+    async def _check_planned_wallets_async(self, wallet_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Check wallets in the given order and handle notifications; wallets left at the deadline are deferred"""
+        from async_wallet_tracker import AsyncWalletTrackerError
+
+        try:
+            # Results stream in as each wallet finishes; notifications go out from a
+            # consumer task meanwhile instead of waiting for the slowest wallet
+            async_results = {}
+            notifications = asyncio.Queue()
+            sender = asyncio.create_task(self._send_notifications_from_queue(notifications))
+            check_started = time.monotonic()
+            try:
+                async for wallet_id, wallet_results in self.async_tracker.iter_check_results_async(
+                    wallet_ids, stop_at=self.cycle_guard.soft_deadline, cancel_at=self.cycle_guard.hard_deadline
+                ):
+                    async_results[wallet_id] = wallet_results
+                    notifications.put_nowait((wallet_id, wallet_results))
+                # The planner's latency bound covers checking only; notifications and saving come on top
+                self._check_seconds = time.monotonic() - check_started
+            finally:
+                notifications.put_nowait(None)
+                await sender
+
+            # Failed wallets are not retried here: a retry would go through the same
+            # core and breakers. The poll scheduler and the next cycle pick them up.
+            self._record_cycle_report(
+                self._served_by(async_results, "async"),
+                [wallet_id for wallet_id in wallet_ids if wallet_id not in async_results]
+            )
+            self._record_poll_results(async_results)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.save_state, list(async_results))
 
             return async_results
 
         except AsyncWalletTrackerError as e:
+            # No wallet was checked; all of them are deferred to the next cycle
             print(f"❌ Async wallet tracker error: {e}")
-            # Fallback to sync mode
-            return self._check_all_wallets_sync()
+            self._record_cycle_report({}, wallet_ids)
+            return {}
         except Exception as e:
             print(f"❌ Unexpected error in async checks: {e}")
             import traceback
             print(f"🔍 Full traceback: {traceback.format_exc()}")
             return {}
 
+    async def _send_notifications_from_queue(self, notifications: asyncio.Queue):
+        """
+        Send notifications for (wallet_id, async result) items until a None sentinel arrives.
+
+        Gateway sends block on HTTP/SMTP, so each one runs in a worker thread
+        and the event loop keeps polling the remaining wallets.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await notifications.get()
+            if item is None:
+                return
+
+            wallet_id, wallet_results = item
+            try:
+                await loop.run_in_executor(None, self._send_result_notifications, wallet_id, wallet_results)
+            except Exception as e:
+                print(f"❌ Error sending async notifications for wallet {wallet_id}: {e}")
+
+    def _send_result_notifications(self, wallet_id: str, wallet_results: Dict[str, Any]):
+        """Send the balance, position and deposit/withdrawal notifications for one core check result"""
+        # Normalize async results to ensure consistent data types
+        wallet_results = self.data_processor.normalize_async_results({wallet_id: wallet_results}).get(wallet_id, {})
+
+        # Check for balance change
+        if wallet_results.get("balance_changed", False):
+            success = self.notification_gateway.send_balance_change_notification(
+                wallet_id,
+                wallet_results.get("old_balance", 0),
+                wallet_results.get("new_balance", 0),
+                wallet_results.get("balance_change", 0)
+            )
+            if not success:
+                print(f"❌ Failed to send balance change notification for wallet {wallet_id}")
+
+        # Check for position change
+        if wallet_results.get("positions_changed", False):
+            positions = wallet_results.get("new_positions", {})
+            change_type = wallet_results.get("position_change_type", "position_changed")
+
+            success = self.notification_gateway.send_position_change_notification(wallet_id, positions, change_type)
+            if not success:
+                print(f"❌ Failed to send position change notification for wallet {wallet_id}")
+
+        # Check for deposit/withdrawal transactions
+        if wallet_results.get("deposit_withdrawal", False):
+            deposit_txs = wallet_results.get("deposit_transactions", [])
+            success = self.notification_gateway.send_deposit_withdrawal_notification(wallet_id, deposit_txs)
+            if not success:
+                print(f"❌ Failed to send deposit/withdrawal notification for wallet {wallet_id}")
+
     async def get_all_wallets_summary_async(self) -> Dict[str, Dict]:
         """Get comprehensive summary of all wallets asynchronously"""
-        if not self.async_tracker:
-            self.async_tracker = AsyncMultiWalletTracker(self.config)
+        self._ensure_async_tracker()
 
         try:
             return await self.async_tracker.get_all_summaries_async()
         except Exception as e:
             print(f"❌ Error getting async summary: {e}")
-            # Fallback to sync mode
+            # Fall back to the blocking facade
             return self.get_all_wallets_summary()
 
     def get_all_wallets_summary(self) -> Dict[str, Dict]:
@@ -344,7 +1057,7 @@ class MultiWalletTracker:
                         future = executor.submit(asyncio.run, self.get_all_wallets_summary_async())
                         return future.result()
                 else:
-                    return asyncio.run(self.get_all_wallets_summary_async())
+                    return self.run_async(self.get_all_wallets_summary_async())
             except Exception as e:
                 print(f"❌ Error in async summary, falling back to sync: {e}")
                 return self._get_all_wallets_summary_sync()
@@ -3,43 +3,39 @@
 Notification Gateway - Handles notification sending and formatting coordination
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from notification_system import NotificationSystem
 from utils import save_transaction_log, format_address
+from wallet_registry import WalletRegistry, LazyWalletObjects, as_registry
 from datetime import datetime
 
 
 class NotificationGateway:
     """Manages notification sending and formatting coordination"""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], wallets: Optional[WalletRegistry] = None):
         self.config = config
-        self.notification_systems = {}
         self.notification_settings = config.get("notification_settings", {})
-        self.wallets = config.get("wallets", {})
+        # Share the caller's registry so both see the same wallet updates
+        self.wallets = wallets if wallets is not None else as_registry(config.get("wallets", {}))
+        self.notification_systems = {}
 
     def create_notification_systems(self):
-        """Create notification systems for all enabled wallets"""
-        for wallet_id, wallet_config in self.wallets.items():
-            if not wallet_config.get("enabled", True):
-                continue
-
-            try:
-                # Create notification configuration for this wallet
-                notification_config = self._create_notification_config(wallet_config)
-
-                # Create notification system
-                notification_system = NotificationSystem(notification_config)
-                self.notification_systems[wallet_id] = notification_system
-
-                print(f"✅ Initialized notifications for: {wallet_config['name']} ({format_address(wallet_config['address'])})")
+        """Set up notification systems for enabled wallets; each is built on its first notification"""
+        self.notification_systems = LazyWalletObjects(self.wallets, self._create_notification_system, "notifications")
+        print(f"✅ Notifications ready for {len(self.wallets.enabled_ids())} wallet(s)")
 
-            except Exception as e:
-                print(f"❌ Failed to initialize notifications for wallet {wallet_id}: {e}")
+    def _create_notification_system(self, wallet_id: str, wallet_config: Dict[str, Any]) -> NotificationSystem:
+        """Create the notification system for one wallet"""
+        return NotificationSystem(self._create_notification_config(wallet_config))
 
     def _create_notification_config(self, wallet_config: Dict[str, Any]) -> Dict[str, Any]:
         """Create notification configuration for a specific wallet"""
-        notification_config = self.notification_settings.copy()
+        # Copy each channel too, so per-wallet overrides don't leak into other wallets
+        notification_config = {
+            key: value.copy() if isinstance(value, dict) else value
+            for key, value in self.notification_settings.items()
+        }
         notification_config["wallet_address"] = wallet_config["address"]
         notification_config["wallet_name"] = wallet_config["name"]
 
@@ -59,11 +55,10 @@ class NotificationGateway:
 
     def send_balance_change_notification(self, wallet_id: str, old_balance: float, new_balance: float, change: float) -> bool:
         """Send balance change notification"""
-        if wallet_id not in self.notification_systems:
+        notification_system = self.get_notification_system(wallet_id)
+        if notification_system is None:
             return False
 
-        notification_system = self.notification_systems[wallet_id]
-
         try:
             message = notification_system.format_balance_change(old_balance, new_balance, change)
             success = notification_system.send_notification(message, "BALANCE CHANGE")
@@ -84,11 +79,10 @@ class NotificationGateway:
 
     def send_position_change_notification(self, wallet_id: str, positions: Dict, change_type: str) -> bool:
         """Send position change notification"""
-        if wallet_id not in self.notification_systems:
+        notification_system = self.get_notification_system(wallet_id)
+        if notification_system is None:
             return False
 
-        notification_system = self.notification_systems[wallet_id]
-
         try:
             changed_coin = positions.get("_changed_coin", "Unknown")
             print(f"\n🔥 POSITION DETECTED: {change_type.upper()} - {changed_coin}")
@@ -113,11 +107,10 @@ class NotificationGateway:
 
     def send_deposit_withdrawal_notification(self, wallet_id: str, transactions: List[Dict]) -> bool:
         """Send deposit/withdrawal notification"""
-        if wallet_id not in self.notification_systems:
+        notification_system = self.get_notification_system(wallet_id)
+        if notification_system is None:
             return False
 
-        notification_system = self.notification_systems[wallet_id]
-
         try:
             message = notification_system.format_deposit_withdrawal(transactions)
             success = notification_system.send_notification(message, "DEPOSIT/WITHDRAWAL")
@@ -136,10 +129,9 @@ class NotificationGateway:
 
     def send_initial_summary(self, wallet_id: str, summary: Dict, use_async: bool = False):
         """Send initial summary notification for a wallet"""
-        if wallet_id not in self.notification_systems:
+        notification_system = self.get_notification_system(wallet_id)
+        if notification_system is None:
             return
-
-        notification_system = self.notification_systems[wallet_id]
         wallet_config = self.wallets[wallet_id]
 
         try:
@@ -171,6 +163,10 @@ class NotificationGateway:
                     message_lines.append("")
                     message_lines.append(hl_summary)
 
+            # Warm-start summaries are rendered from the last saved state
+            if summary.get("snapshot_time"):
+                message_lines.append(f"Data From: saved state ({summary['snapshot_time']})")
+
             # Add recent transactions count
             recent_txs = summary.get("recent_transactions")
             if isinstance(recent_txs, list) and recent_txs:
@@ -1,7 +1,4 @@
-import smtplib
 import requests
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from typing import Dict, Optional, List
 from utils import format_address
@@ -28,15 +25,20 @@ from constants import (
 
     # HTTP status codes
     HTTP_SUCCESS_CODE,
+    HTTP_RATE_LIMIT_CODE,
 
     # Ethereum constants
     WEI_TO_ETH_DIVISOR,
 
     # Timeouts and limits
     TELEGRAM_MESSAGE_MAX_LENGTH,
-    DEFAULT_TIMEOUT_SECONDS
+    DEFAULT_TIMEOUT_SECONDS,
+
+    # Upstream names
+    UPSTREAM_TELEGRAM
 )
 from position_formatter import PositionFormatter
+from rate_limiter import get_rate_limiter, parse_retry_after
 
 class NotificationError(Exception):
     """Notification system related errors"""
@@ -133,6 +135,11 @@ class NotificationSystem:
     
     def _send_email(self, message: str, title: str) -> bool:
         """Send email notification"""
+        # Imported here so processes with email disabled never load smtplib/email
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+
         try:
             msg = MIMEMultipart()
             msg['From'] = self.email_config["sender_email"]
@@ -172,8 +179,16 @@ class NotificationSystem:
                 "text": message,
                 "parse_mode": "HTML"
             }
+            # Shared across all wallets' notification systems
+            limiter = get_rate_limiter(UPSTREAM_TELEGRAM)
+            limiter.acquire()
             response = requests.post(url, json=payload, timeout=DEFAULT_TIMEOUT_SECONDS)
+            if response.status_code == HTTP_RATE_LIMIT_CODE:
+                limiter.record_throttled(parse_retry_after(response.headers.get("Retry-After")))
+                print(f"Telegram rate limit reached: {response.text}")
+                return False
             if response.status_code == HTTP_SUCCESS_CODE:
+                limiter.record_success()
                 print("Telegram notification sent successfully")
                 return True
             else:
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Process-wide token-bucket limiters shared per upstream API
+"""
+
+import asyncio
+import collections
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, List, Optional
+
+from constants import (
+    # Rate limiting
+    DEFAULT_RATE_LIMIT_ETHERSCAN,
+    DEFAULT_RATE_LIMIT_HYPERLIQUID,
+    DEFAULT_RATE_LIMIT_TELEGRAM,
+    DEFAULT_RATE_LIMIT_BURST_ETHERSCAN,
+    DEFAULT_RATE_LIMIT_BURST_HYPERLIQUID,
+    DEFAULT_RATE_LIMIT_BURST_TELEGRAM,
+
+    # Upstream names
+    UPSTREAM_ETHERSCAN,
+    UPSTREAM_HYPERLIQUID,
+    UPSTREAM_TELEGRAM,
+
+    # Reporting
+    RATE_REPORT_WINDOW_SECONDS,
+
+    # Adaptive rate limiting
+    RATE_AIMD_DECREASE_FACTOR,
+    RATE_AIMD_DECREASE_COOLDOWN,
+    RATE_AIMD_INCREASE_FRACTION,
+    RATE_AIMD_INCREASE_INTERVAL,
+    RATE_AIMD_MIN_FRACTION
+)
+
+
+class RateLimitError(Exception):
+    """An upstream answered 429 or a rate-limit reply; its shared limiter has already backed off"""
+
+    def __init__(self, upstream: str, retry_after: Optional[float] = None):
+        self.upstream = upstream
+        self.retry_after = retry_after
+        message = f"{upstream} rate limit reached"
+        if retry_after:
+            message += f", retry after {retry_after:g}s"
+        super().__init__(message)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta seconds or HTTP date); None if absent or invalid"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket limiter usable from both sync and async code.
+
+    Every caller reserves a token under a lock and then sleeps for the time
+    the reservation says. Reservations are handed out in arrival order, so
+    concurrent wallets are served first-come first-served and none of them
+    can starve the others. Up to `burst` calls may go out back-to-back after
+    an idle period.
+
+    The rate adapts AIMD-style to what the upstream accepts: a throttled
+    reply cuts it multiplicatively and honours Retry-After, and every
+    healthy interval adds a fixed step back. It recovers to the configured
+    rate, and probes beyond it up to max_rate only while callers are queuing.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float = 1, max_rate: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.clock = clock
+        self.burst = float(max(1, burst))
+        self._tokens = self.burst
+        self._last_refill = clock()
+        self._lock = threading.Lock()
+        self._set_rate(rate, max_rate)
+
+        # Usage statistics
+        self.total_acquired = 0
+        self.total_wait_time = 0.0
+        self.total_throttled = 0
+        # Requests per whole second of send time, for the achieved-rate report
+        self._sent_per_second: collections.OrderedDict = collections.OrderedDict()
+
+    def _set_rate(self, rate: float, max_rate: Optional[float] = None):
+        """Start adapting from a configured rate; called with the lock held or before sharing"""
+        self.base_rate = float(rate)
+        self.rate = self.base_rate
+        self.max_rate = max(self.base_rate, float(max_rate or rate))
+        self.min_rate = self.base_rate * RATE_AIMD_MIN_FRACTION
+        # Rate at which the upstream last pushed back, None until it does
+        self.throttled_at_rate: Optional[float] = None
+        self._last_decrease = float("-inf")
+        self._last_increase = self.clock()
+        # Callers had to wait since the last increase: more rate would be used
+        self._saturated = False
+
+    def _refill(self, now: float):
+        """Add tokens for the time elapsed since the last refill"""
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def reserve(self) -> float:
+        """Reserve one token and return how many seconds the caller must wait before using it"""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate)
+            if wait > 0:
+                self._saturated = True
+            self.total_acquired += 1
+            self.total_wait_time += wait
+            self._record_send(now + wait)
+            return wait
+
+    def _record_send(self, send_time: float):
+        """Count a request in its send second and drop seconds older than the report window"""
+        second = int(send_time)
+        self._sent_per_second[second] = self._sent_per_second.get(second, 0) + 1
+        oldest = second - RATE_REPORT_WINDOW_SECONDS
+        while self._sent_per_second and next(iter(self._sent_per_second)) < oldest:
+            self._sent_per_second.popitem(last=False)
+
+    def record_throttled(self, retry_after: Optional[float] = None):
+        """
+        The upstream rejected a request for its rate: cut the rate and pause.
+
+        Replies within the decrease cooldown belong to the same burst of
+        in-flight requests and cut the rate only once. With retry_after no
+        new reservation is usable before that many seconds have passed.
+        """
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.total_throttled += 1
+            if now - self._last_decrease >= RATE_AIMD_DECREASE_COOLDOWN:
+                self.throttled_at_rate = self.rate
+                self.rate = max(self.min_rate, self.rate * RATE_AIMD_DECREASE_FACTOR)
+                self._last_decrease = now
+                # No burst right after being throttled
+                self._tokens = min(self._tokens, 0.0)
+                print(f"🚦 {self.name} throttled by upstream, rate {self.throttled_at_rate:g}/s -> {self.rate:.2f}/s")
+            if retry_after:
+                self._tokens = min(self._tokens, -retry_after * self.rate)
+
+    def record_success(self):
+        """A request went through: after a healthy interval add some rate back"""
+        with self._lock:
+            now = self.clock()
+            if self.rate >= self.max_rate:
+                return
+            # Above the configured rate, only probe while callers are actually waiting
+            if self.rate >= self.base_rate and not self._saturated:
+                return
+            if now - max(self._last_increase, self._last_decrease) < RATE_AIMD_INCREASE_INTERVAL:
+                return
+            self._refill(now)
+            self.rate = min(self.max_rate, self.rate + self.base_rate * RATE_AIMD_INCREASE_FRACTION)
+            self._last_increase = now
+            self._saturated = False
+
+    def cancel_reservation(self):
+        """Return a reserved token when the caller gives up before using it"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+            self.total_acquired -= 1
+
+    def acquire(self):
+        """Block the current thread until a token is available"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait asynchronously until a token is available"""
+        wait = self.reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.cancel_reservation()
+                raise
+
+    def get_budget(self) -> float:
+        """Seconds of sending the current tokens cover; negative while callers are queued"""
+        with self._lock:
+            self._refill(self.clock())
+            return self._tokens / self.rate
+
+    def get_wait_time(self) -> float:
+        """Seconds a new caller would wait right now"""
+        with self._lock:
+            self._refill(self.clock())
+            if self._tokens >= 1:
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def get_achieved_rate(self, window: float = RATE_REPORT_WINDOW_SECONDS) -> Dict:
+        """
+        Requests actually sent per second over the last `window` seconds.
+
+        Utilization compares the average with the configured rate; idle is the
+        share of seconds with no request at all. A bursty schedule shows up as
+        a low average with a high idle share, a spread one as steady use.
+        """
+        with self._lock:
+            now = self.clock()
+            window = max(1, min(int(window), RATE_REPORT_WINDOW_SECONDS))
+            # Only count seconds since the first request, so a fresh limiter isn't diluted
+            first = next(iter(self._sent_per_second), None)
+            end = int(now)
+            start = end - window + 1 if first is None else max(end - window + 1, first)
+            counts = [self._sent_per_second.get(second, 0) for second in range(start, end + 1)]
+            rate = self.rate
+
+        sent = sum(counts)
+        seconds = len(counts)
+        achieved = sent / seconds if seconds else 0.0
+        return {
+            "window": seconds,
+            "sent": sent,
+            "achieved_rate": achieved,
+            "utilization": achieved / rate if rate else 0.0,
+            "idle": sum(1 for count in counts if count == 0) / seconds if seconds else 1.0,
+            "peak": max(counts) if counts else 0
+        }
+
+    def configure(self, rate: float, burst: Optional[float] = None, max_rate: Optional[float] = None):
+        """Change the rate (and optionally the burst and adaptive ceiling) in place for all holders"""
+        with self._lock:
+            self._refill(self.clock())
+            self._set_rate(rate, max_rate)
+            if burst is not None:
+                self.burst = float(max(1, burst))
+                self._tokens = min(self._tokens, self.burst)
+
+    def get_stats(self) -> Dict:
+        """Get limiter configuration and usage statistics"""
+        return {
+            "name": self.name,
+            "rate": self.rate,
+            "base_rate": self.base_rate,
+            "max_rate": self.max_rate,
+            "throttled": self.total_throttled,
+            "throttled_at_rate": self.throttled_at_rate,
+            "burst": self.burst,
+            "acquired": self.total_acquired,
+            "average_wait": self.total_wait_time / self.total_acquired if self.total_acquired else 0.0,
+            "current_wait": self.get_wait_time()
+        }
+
+    def __enter__(self):
+        """Context manager entry - throttle the call"""
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        pass
+
+    async def __aenter__(self):
+        """Async context manager entry - throttle the call"""
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        pass
+
+
+# Default (rate, burst) per upstream API
+DEFAULT_UPSTREAM_LIMITS = {
+    UPSTREAM_ETHERSCAN: (DEFAULT_RATE_LIMIT_ETHERSCAN, DEFAULT_RATE_LIMIT_BURST_ETHERSCAN),
+    UPSTREAM_HYPERLIQUID: (DEFAULT_RATE_LIMIT_HYPERLIQUID, DEFAULT_RATE_LIMIT_BURST_HYPERLIQUID),
+    UPSTREAM_TELEGRAM: (DEFAULT_RATE_LIMIT_TELEGRAM, DEFAULT_RATE_LIMIT_BURST_TELEGRAM),
+}
+
+_limiters: Dict[str, TokenBucketRateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str) -> TokenBucketRateLimiter:
+    """Get the process-wide limiter for an upstream, creating it with defaults on first use"""
+    with _registry_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            rate, burst = DEFAULT_UPSTREAM_LIMITS.get(name, (1, 1))
+            limiter = TokenBucketRateLimiter(name, rate, burst)
+            _limiters[name] = limiter
+        return limiter
+
+
+def configure_rate_limiter(name: str, rate: float, burst: Optional[float] = None,
+                           max_rate: Optional[float] = None) -> TokenBucketRateLimiter:
+    """Set the rate of a shared limiter; existing holders see the change immediately"""
+    limiter = get_rate_limiter(name)
+    limiter.configure(rate, burst, max_rate)
+    return limiter
+
+
+def get_rate_limiter_stats() -> List[Dict]:
+    """Get statistics for every limiter created so far"""
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return [limiter.get_stats() for limiter in limiters]
+
+
+def format_rate_limiter_stats() -> str:
+    """One-line summary of all limiters for cycle logs"""
+    parts = []
+    for stats in get_rate_limiter_stats():
+        details = [f"wait {stats['current_wait']:.1f}s", f"{stats['acquired']} req"]
+        # The rate has adapted away from the configured one
+        if stats["rate"] != stats["base_rate"] or stats["throttled"]:
+            details.append(f"configured {stats['base_rate']:g}/s, {stats['throttled']} throttled")
+        parts.append(f"{stats['name']} {stats['rate']:.3g}/s ({', '.join(details)})")
+    return ", ".join(parts)
+
+
+def format_rate_report(window: float = RATE_REPORT_WINDOW_SECONDS) -> str:
+    """One-line achieved request rate per upstream over the recent window"""
+    with _registry_lock:
+        limiters = list(_limiters.values())
+
+    parts = []
+    for limiter in limiters:
+        report = limiter.get_achieved_rate(window)
+        if not report["sent"]:
+            continue
+        parts.append(
+            f"{limiter.name} {report['achieved_rate']:.2f}/s of {limiter.rate:g}/s "
+            f"({report['utilization']:.0%} used, peak {report['peak']}/s, idle {report['idle']:.0%} "
+            f"over {report['window']}s)"
+        )
+    return ", ".join(parts)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Rate Planner - Checks that a check cycle fits the interval under the API rate limits
+"""
+
+import math
+from typing import Dict, List, Mapping, Optional
+
+from constants import (
+    # Safety bounds
+    MIN_CHECK_INTERVAL,
+    MAX_CHECK_INTERVAL,
+
+    # Rate budget planning
+    ETHERSCAN_CALLS_PER_WALLET,
+    HYPERLIQUID_CALLS_PER_WALLET,
+    ETHERSCAN_BALANCEMULTI_MAX_ADDRESSES,
+    RATE_PLAN_HEADROOM,
+    RATE_PLAN_DEFAULT_WALLET_SECONDS,
+    RATE_PLAN_LATENCY_SMOOTHING,
+
+    # Upstream names
+    UPSTREAM_ETHERSCAN,
+    UPSTREAM_HYPERLIQUID
+)
+
+
+# Average calls one wallet check adds per upstream, balancemulti share included
+CALLS_PER_WALLET_CHECK = {
+    UPSTREAM_ETHERSCAN: ETHERSCAN_CALLS_PER_WALLET + 1 / ETHERSCAN_BALANCEMULTI_MAX_ADDRESSES,
+    UPSTREAM_HYPERLIQUID: HYPERLIQUID_CALLS_PER_WALLET
+}
+
+
+def balancemulti_calls(wallet_checks: float, batches: float = 1) -> int:
+    """balancemulti calls for wallet_checks checks made in `batches` separate groups (e.g. spread slots)"""
+    if wallet_checks <= 0:
+        return 0
+    batches = max(1, min(math.ceil(batches), math.ceil(wallet_checks)))
+    return batches * math.ceil(wallet_checks / batches / ETHERSCAN_BALANCEMULTI_MAX_ADDRESSES)
+
+
+def calls_per_cycle(wallet_checks: float, batches: float = 1) -> Dict[str, float]:
+    """API calls needed to check wallet_checks wallets once, per upstream; each batch sends its own balancemulti"""
+    return {
+        UPSTREAM_ETHERSCAN: wallet_checks * ETHERSCAN_CALLS_PER_WALLET + balancemulti_calls(wallet_checks, batches),
+        UPSTREAM_HYPERLIQUID: wallet_checks * HYPERLIQUID_CALLS_PER_WALLET
+    }
+
+
+def plan_cycle(wallet_checks: float, rate_limits: Mapping[str, float], check_interval: float,
+               concurrency: int = 1, seconds_per_wallet: Optional[float] = None,
+               headroom: float = RATE_PLAN_HEADROOM, batches: float = 1) -> Dict:
+    """
+    Minimum cycle time for wallet_checks wallet checks and whether it fits check_interval.
+
+    A cycle can't be shorter than the calls each upstream needs divided by its
+    rate limit, nor than the wallets checked `concurrency` at a time at the
+    observed (or assumed) seconds per wallet. `batches` is how many separate
+    groups the checks go out in per interval (spread slots); each group
+    sends its own balancemulti calls.
+    """
+    concurrency = max(1, concurrency)
+    seconds_per_wallet = RATE_PLAN_DEFAULT_WALLET_SECONDS if seconds_per_wallet is None else seconds_per_wallet
+
+    calls = calls_per_cycle(wallet_checks, batches)
+    bounds = {
+        upstream: upstream_calls / rate_limits[upstream]
+        for upstream, upstream_calls in calls.items() if rate_limits.get(upstream)
+    }
+    bounds["latency"] = math.ceil(wallet_checks / concurrency) * seconds_per_wallet
+    bottleneck = max(bounds, key=bounds.get)
+    min_cycle = bounds[bottleneck]
+    required_interval = min_cycle * headroom
+
+    # Seconds of cycle time one more wallet costs, to size the interval's capacity;
+    # split into batches, a wallet costs its share of the actual balancemulti calls
+    calls_per_wallet = dict(CALLS_PER_WALLET_CHECK)
+    if batches > 1 and wallet_checks > 0:
+        calls_per_wallet = {upstream: upstream_calls / wallet_checks for upstream, upstream_calls in calls.items()}
+    per_wallet = max(
+        [seconds_per_wallet / concurrency]
+        + [calls_per_wallet[upstream] / rate_limits[upstream] for upstream in bounds if upstream in calls]
+    )
+
+    return {
+        "wallet_checks": wallet_checks,
+        "batches": batches,
+        "check_interval": check_interval,
+        "concurrency": concurrency,
+        "seconds_per_wallet": seconds_per_wallet,
+        "calls": calls,
+        "bounds": bounds,
+        "bottleneck": bottleneck,
+        "min_cycle": min_cycle,
+        "required_interval": required_interval,
+        "fits": required_interval <= check_interval,
+        "achievable": required_interval <= MAX_CHECK_INTERVAL,
+        "recommended_interval": min(MAX_CHECK_INTERVAL, max(MIN_CHECK_INTERVAL, math.ceil(required_interval))),
+        "max_wallets": int(check_interval / headroom / per_wallet) if per_wallet else 0
+    }
+
+
+def format_plan(plan: Dict, rate_limits: Mapping[str, float]) -> List[str]:
+    """Readable breakdown of a plan, one line per entry"""
+    lines = [f"Wallet checks per cycle: {plan['wallet_checks']:.0f}"]
+    if plan["batches"] > 1:
+        lines[0] += f" in {plan['batches']:.0f} separate batches (one balancemulti each)"
+    for upstream, upstream_calls in plan["calls"].items():
+        if upstream in plan["bounds"]:
+            lines.append(
+                f"{upstream}: {upstream_calls:.0f} calls at {rate_limits[upstream]:g}/s -> "
+                f"{plan['bounds'][upstream]:.0f}s"
+            )
+    lines.append(
+        f"latency: {plan['wallet_checks']:.0f} wallets, {plan['concurrency']} at a time, "
+        f"{plan['seconds_per_wallet']:.2f}s each -> {plan['bounds']['latency']:.0f}s"
+    )
+    lines.append(
+        f"Minimum cycle: {plan['min_cycle']:.0f}s (bottleneck: {plan['bottleneck']}), "
+        f"{plan['required_interval']:.0f}s with headroom"
+    )
+    # Shards split the rate limits, so they only help when latency is the bottleneck
+    if plan["bottleneck"] == "latency":
+        remedy = "raise MAX_CONCURRENT_WALLETS or shard (--shards N)"
+    else:
+        remedy = f"raise the {plan['bottleneck']} rate limit"
+    if plan["fits"]:
+        lines.append(f"✅ Fits the {plan['check_interval']}s interval (room for about {plan['max_wallets']} wallets)")
+    elif plan["achievable"]:
+        lines.append(
+            f"⚠️ Overruns the {plan['check_interval']}s interval: set CHECK_INTERVAL to at least "
+            f"{plan['recommended_interval']}s or {remedy}"
+        )
+    else:
+        lines.append(
+            f"❌ Can't fit even the {MAX_CHECK_INTERVAL}s maximum interval: {remedy}; "
+            f"about {plan['max_wallets']} wallets fit now"
+        )
+    return lines
+
+
+class RatePlanner:
+    """
+    Re-plans the cycle as wallets, limits and observed latency change.
+
+    Without auto-tuning it warns when the cycle stops fitting. With it, the
+    interval is raised as far as MAX_CHECK_INTERVAL when needed and eased back
+    toward the configured interval (never below it) once there is room again.
+    """
+
+    def __init__(self, check_interval: int, auto_tune: bool = False, headroom: float = RATE_PLAN_HEADROOM):
+        self.configured_interval = check_interval
+        self.check_interval = check_interval
+        self.auto_tune = auto_tune
+        self.headroom = headroom
+        # Observed seconds per wallet at the configured concurrency; None until a cycle ran
+        self.seconds_per_wallet: Optional[float] = None
+        self.last_plan: Dict = {}
+        self._warned = False
+
+    def observe_cycle(self, wallets_checked: int, seconds: float, concurrency: int = 1):
+        """Fold a finished cycle's duration into the observed latency"""
+        if wallets_checked <= 0 or seconds <= 0:
+            return
+        observed = seconds / math.ceil(wallets_checked / max(1, concurrency))
+        if self.seconds_per_wallet is None:
+            self.seconds_per_wallet = observed
+        else:
+            self.seconds_per_wallet += RATE_PLAN_LATENCY_SMOOTHING * (observed - self.seconds_per_wallet)
+
+    def update(self, wallet_checks: float, rate_limits: Mapping[str, float], concurrency: int = 1,
+               batches: float = 1) -> Dict:
+        """Re-plan; with auto-tuning this may change check_interval"""
+        plan = plan_cycle(
+            wallet_checks, rate_limits, self.check_interval, concurrency, self.seconds_per_wallet, self.headroom,
+            batches
+        )
+
+        if self.auto_tune:
+            required = plan["required_interval"]
+            interval = self.check_interval
+            if required > interval:
+                interval = min(MAX_CHECK_INTERVAL, math.ceil(required))
+            elif interval > self.configured_interval and required * self.headroom < interval:
+                # Ease back only with a full headroom to spare, so noise doesn't flap the interval
+                interval = max(self.configured_interval, math.ceil(required))
+            if interval != self.check_interval:
+                print(
+                    f"📐 Check interval tuned {self.check_interval}s -> {interval}s "
+                    f"(minimum cycle {plan['min_cycle']:.0f}s, bottleneck {plan['bottleneck']})"
+                )
+                self.check_interval = interval
+                plan = plan_cycle(
+                    wallet_checks, rate_limits, interval, concurrency, self.seconds_per_wallet, self.headroom,
+                    batches
+                )
+
+        if not plan["fits"] and not self._warned:
+            print(f"⚠️ Rate budget: {format_plan(plan, rate_limits)[-1]}")
+        self._warned = not plan["fits"]
+        self.last_plan = plan
+        return plan
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Scheduler - Per-wallet poll schedules: adaptive intervals or checks spread across the interval
+"""
+
+import hashlib
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from constants import (
+    # Adaptive polling
+    ADAPTIVE_POLL_MIN_INTERVAL,
+    ADAPTIVE_POLL_MAX_INTERVAL,
+    ADAPTIVE_POLL_DORMANT_AFTER,
+    ADAPTIVE_POLL_BACKOFF_FACTOR,
+    ADAPTIVE_POLL_RISK_DIVISOR,
+    ADAPTIVE_POLL_RISK_LEVERAGE,
+    ADAPTIVE_POLL_RISK_LIQUIDATION_DISTANCE,
+
+    # Schedule spreading
+    SCHEDULE_SPREAD_SLOTS,
+    SCHEDULE_JITTER_FRACTION
+)
+
+
+def slot_fraction(wallet_id: str) -> float:
+    """Stable position in [0, 1) for a wallet, the same in every process"""
+    digest = hashlib.md5(wallet_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+
+def position_risk(positions: Optional[Dict]) -> Tuple[float, Optional[float]]:
+    """
+    (highest leverage, smallest distance to liquidation) over open Hyperliquid positions.
+
+    The mark price is positionValue / |szi|; distance is |mark - liquidationPx| / mark.
+    Distance is None when no position has a liquidation price.
+    """
+    max_leverage = 0.0
+    min_distance = None
+    if not isinstance(positions, dict):
+        return max_leverage, min_distance
+
+    for entry in positions.get("assetPositions", []):
+        position = entry.get("position") or {}
+        try:
+            size = abs(float(position.get("szi", 0)))
+            if size == 0:
+                continue
+
+            leverage = position.get("leverage") or {}
+            leverage_value = leverage.get("value", 0) if isinstance(leverage, dict) else leverage
+            max_leverage = max(max_leverage, float(leverage_value or 0))
+
+            liquidation_price = position.get("liquidationPx")
+            mark_price = float(position.get("positionValue", 0)) / size
+            if liquidation_price is not None and mark_price > 0:
+                distance = abs(mark_price - float(liquidation_price)) / mark_price
+                min_distance = distance if min_distance is None else min(min_distance, distance)
+        except (TypeError, ValueError, AttributeError):
+            continue
+
+    return max_leverage, min_distance
+
+
+class PollScheduler(ABC):
+    """Per-wallet next-due times; subclasses decide when each wallet is due again"""
+
+    def __init__(self, base_interval: float, clock: Callable[[], float] = time.monotonic):
+        self.base_interval = float(base_interval)
+        self.clock = clock
+        # wallet_id -> {"interval", "next_due", ...}
+        self._wallets: Dict[str, Dict] = {}
+
+    @abstractmethod
+    def _new_state(self, wallet_id: str, now: float) -> Dict:
+        """Initial schedule state of a newly tracked wallet"""
+
+    def _state(self, wallet_id: str, now: float) -> Dict:
+        state = self._wallets.get(wallet_id)
+        if state is None:
+            state = self._new_state(wallet_id, now)
+            self._wallets[wallet_id] = state
+        return state
+
+    def sync(self, wallet_ids: Iterable[str], now: Optional[float] = None):
+        """Track exactly wallet_ids: new ones are scheduled, removed ones are forgotten"""
+        now = self.clock() if now is None else now
+        wallet_ids = list(wallet_ids)
+        active = set(wallet_ids)
+        for wallet_id in [wallet_id for wallet_id in self._wallets if wallet_id not in active]:
+            del self._wallets[wallet_id]
+        for wallet_id in wallet_ids:
+            self._state(wallet_id, now)
+
+    def due(self, wallet_ids: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """Wallets whose next check is due, most overdue first"""
+        now = self.clock() if now is None else now
+        self.sync(wallet_ids, now)
+        due = [(state["next_due"], wallet_id) for wallet_id, state in self._wallets.items() if state["next_due"] <= now]
+        return [wallet_id for _, wallet_id in sorted(due)]
+
+    def next_due_in(self, now: Optional[float] = None) -> float:
+        """Seconds until the next wallet is due (0 if one is overdue)"""
+        now = self.clock() if now is None else now
+        if not self._wallets:
+            return self.base_interval
+        return max(0.0, min(state["next_due"] for state in self._wallets.values()) - now)
+
+    @abstractmethod
+    def record(self, wallet_id: str, changed: bool, positions: Optional[Dict] = None,
+               failed: bool = False, now: Optional[float] = None) -> float:
+        """Record a finished check and schedule the wallet's next one; return the new interval"""
+
+    def get_interval(self, wallet_id: str) -> Optional[float]:
+        """Current poll interval of a wallet, if it is scheduled"""
+        state = self._wallets.get(wallet_id)
+        return state["interval"] if state else None
+
+    def checks_per_interval(self) -> float:
+        """Wallet checks the current schedule makes per base interval"""
+        return sum(self.base_interval / state["interval"] for state in self._wallets.values())
+
+    def batches_per_interval(self) -> float:
+        """Separate groups the checks go out in per base interval; each sends its own balancemulti"""
+        return 1
+
+    def set_base_interval(self, base_interval: float):
+        """Change the base interval; wallets move to it from their next check on"""
+        self.base_interval = float(base_interval)
+
+
+class SpreadPollScheduler(PollScheduler):
+    """
+    Every wallet once per interval, each in its own slot.
+
+    Wallets are ordered by a hash of their ID and dealt evenly over `slots`
+    slots per interval, so requests go out at a steady rate instead of one
+    burst per interval. Hash order keeps slots nearly stable as wallets come and go.
+    """
+
+    def __init__(self, base_interval: float, slots: int = SCHEDULE_SPREAD_SLOTS,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__(base_interval, clock)
+        self.slots = max(1, int(slots))
+        # Slot times are counted from the first sync
+        self.epoch: Optional[float] = None
+        self._members = frozenset()
+
+    def _slot_time(self, phase: float, after: float) -> float:
+        """First time at or after `after` that falls on the given phase of the interval"""
+        periods = max(0, math.ceil((after - self.epoch - phase) / self.base_interval))
+        return self.epoch + phase + periods * self.base_interval
+
+    def _new_state(self, wallet_id: str, now: float) -> Dict:
+        return {"interval": self.base_interval, "phase": 0.0, "next_due": None}
+
+    def sync(self, wallet_ids: Iterable[str], now: Optional[float] = None):
+        now = self.clock() if now is None else now
+        wallet_ids = list(wallet_ids)
+        if self.epoch is None:
+            self.epoch = now
+        super().sync(wallet_ids, now)
+        if self._members == frozenset(wallet_ids):
+            return
+
+        # Re-deal slots only when the wallet set changes
+        self._members = frozenset(wallet_ids)
+        ordered = sorted(wallet_ids, key=slot_fraction)
+        slot_length = self.base_interval / self.slots
+        for rank, wallet_id in enumerate(ordered):
+            state = self._wallets[wallet_id]
+            state["phase"] = (rank * self.slots // len(ordered)) * slot_length
+            if state["next_due"] is None:
+                state["next_due"] = self._slot_time(state["phase"], now)
+
+    def set_base_interval(self, base_interval: float):
+        super().set_base_interval(base_interval)
+        for state in self._wallets.values():
+            state["interval"] = self.base_interval
+        # Re-deal slots over the new interval at the next sync
+        self._members = frozenset()
+
+    def record(self, wallet_id: str, changed: bool, positions: Optional[Dict] = None,
+               failed: bool = False, now: Optional[float] = None) -> float:
+        now = self.clock() if now is None else now
+        state = self._state(wallet_id, now)
+        # Next slot at least half an interval away, so a late check doesn't run twice in a row
+        state["next_due"] = self._slot_time(state["phase"], now + self.base_interval / 2)
+        return state["next_due"] - now
+
+    def batches_per_interval(self) -> float:
+        """Every occupied slot is a group of its own"""
+        return min(self.slots, len(self._wallets)) or 1
+
+    def get_stats(self) -> Dict:
+        """Wallets per slot and time to the next slot"""
+        return {
+            "wallets": len(self._wallets),
+            "slots": self.slots,
+            "wallets_per_slot": len(self._wallets) / self.slots,
+            "slot_length": self.base_interval / self.slots,
+            "next_due_in": self.next_due_in()
+        }
+
+    def format_stats(self) -> str:
+        """One-line summary of the schedule for cycle logs"""
+        stats = self.get_stats()
+        return (
+            f"{stats['wallets']} wallets spread over {stats['slots']} slots of {stats['slot_length']:.0f}s "
+            f"(~{stats['wallets_per_slot']:.1f} per slot); next due in {stats['next_due_in']:.0f}s"
+        )
+
+
+class AdaptivePollScheduler(PollScheduler):
+    """
+    Gives every wallet its own next-due time.
+
+    - A detected change drops the wallet to min_interval; later quiet checks
+      double it back up to check_interval.
+    - High leverage or a position near liquidation caps it at check_interval / 4.
+    - A wallet with no change for dormant_after backs off exponentially up to
+      max_interval.
+    - A failed check keeps the wallet at no more than check_interval so it is retried.
+
+    With spread=True new wallets start in hash slots across the first interval
+    and every interval gets +/-10% jitter, so wallets don't fire together.
+    """
+
+    def __init__(self, base_interval: float,
+                 min_interval: float = ADAPTIVE_POLL_MIN_INTERVAL,
+                 max_interval: float = ADAPTIVE_POLL_MAX_INTERVAL,
+                 dormant_after: float = ADAPTIVE_POLL_DORMANT_AFTER,
+                 backoff_factor: float = ADAPTIVE_POLL_BACKOFF_FACTOR,
+                 risk_leverage: float = ADAPTIVE_POLL_RISK_LEVERAGE,
+                 risk_liquidation_distance: float = ADAPTIVE_POLL_RISK_LIQUIDATION_DISTANCE,
+                 spread: bool = False,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__(base_interval, clock)
+        self._min_interval = float(min_interval)
+        self._max_interval = float(max_interval)
+        self._apply_bounds()
+        self.dormant_after = dormant_after
+        self.backoff_factor = backoff_factor
+        self.risk_leverage = risk_leverage
+        self.risk_liquidation_distance = risk_liquidation_distance
+        self.spread = spread
+
+    def batches_per_interval(self) -> float:
+        """Jittered due times rarely line up, so with spread every check is assumed to go out alone"""
+        return max(1, self.checks_per_interval()) if self.spread else 1
+
+    def _apply_bounds(self):
+        """Fit the configured min/max intervals around the base interval"""
+        self.min_interval = min(self._min_interval, self.base_interval)
+        self.max_interval = max(self._max_interval, self.base_interval)
+        self.risk_interval = max(self.min_interval, self.base_interval / ADAPTIVE_POLL_RISK_DIVISOR)
+
+    def set_base_interval(self, base_interval: float):
+        super().set_base_interval(base_interval)
+        self._apply_bounds()
+
+    def _new_state(self, wallet_id: str, now: float) -> Dict:
+        # Dormancy is measured from when we start watching
+        next_due = now
+        if self.spread:
+            slot = math.floor(slot_fraction(wallet_id) * SCHEDULE_SPREAD_SLOTS)
+            next_due = now + slot * self.base_interval / SCHEDULE_SPREAD_SLOTS
+        return {"interval": self.base_interval, "next_due": next_due, "last_change": now, "reason": "new"}
+
+    def record(self, wallet_id: str, changed: bool, positions: Optional[Dict] = None,
+               failed: bool = False, now: Optional[float] = None) -> float:
+        """Record a finished check and schedule the wallet's next one; return the new interval"""
+        now = self.clock() if now is None else now
+        state = self._state(wallet_id, now)
+        previous = state["interval"]
+
+        leverage, liquidation_distance = position_risk(positions)
+        risky = leverage >= self.risk_leverage or (
+            liquidation_distance is not None and liquidation_distance <= self.risk_liquidation_distance
+        )
+
+        if failed:
+            interval, reason = min(previous, self.base_interval), "retry"
+        elif changed:
+            state["last_change"] = now
+            interval, reason = self.min_interval, "changed"
+        elif risky:
+            interval, reason = min(self.risk_interval, previous * self.backoff_factor), "risk"
+        elif now - state["last_change"] >= self.dormant_after:
+            interval, reason = min(self.max_interval, max(self.base_interval, previous * self.backoff_factor)), "dormant"
+        else:
+            # Cool down toward the normal interval after recent activity
+            interval, reason = min(self.base_interval, previous * self.backoff_factor), "normal"
+
+        state["interval"] = interval
+        state["next_due"] = now + interval
+        if self.spread:
+            state["next_due"] += interval * random.uniform(-SCHEDULE_JITTER_FRACTION, SCHEDULE_JITTER_FRACTION)
+        state["reason"] = reason
+        return interval
+
+    def get_stats(self) -> Dict:
+        """Number of wallets per scheduling reason and the interval range"""
+        reasons = {}
+        for state in self._wallets.values():
+            reasons[state["reason"]] = reasons.get(state["reason"], 0) + 1
+        intervals = [state["interval"] for state in self._wallets.values()]
+        return {
+            "wallets": len(self._wallets),
+            "reasons": reasons,
+            "min_interval": min(intervals) if intervals else 0.0,
+            "max_interval": max(intervals) if intervals else 0.0,
+            "next_due_in": self.next_due_in()
+        }
+
+    def format_stats(self) -> str:
+        """One-line summary of the schedule for cycle logs"""
+        stats = self.get_stats()
+        reasons = ", ".join(f"{count} {reason}" for reason, count in sorted(stats["reasons"].items()))
+        return (
+            f"{stats['wallets']} wallets ({reasons}); intervals {stats['min_interval']:.0f}-"
+            f"{stats['max_interval']:.0f}s; next due in {stats['next_due_in']:.0f}s"
+        )
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Sharding - Split wallets across worker processes or hosts by consistent hashing
+"""
+
+import bisect
+import hashlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
+
+from constants import (
+    # Sharding
+    DEFAULT_SHARD_LEASE_PATH,
+    DEFAULT_SHARD_LEASE_TTL,
+    SHARD_VIRTUAL_NODES,
+    SHARD_JOIN_TIMEOUT
+)
+from wallet_registry import WalletRegistry
+
+
+class ShardingError(Exception):
+    """Sharding related errors"""
+    pass
+
+
+def _ring_hash(key: str) -> int:
+    """Position of a key on the ring, the same in every process and host"""
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring of shard IDs.
+
+    Each shard owns `vnodes` points on the ring and a wallet belongs to the
+    first point at or after its address hash, so a shard joining or leaving
+    only moves about 1/N of the wallets.
+    """
+
+    def __init__(self, shard_ids: Iterable[str], vnodes: int = SHARD_VIRTUAL_NODES):
+        self.shard_ids = sorted(set(shard_ids))
+        points = sorted(
+            (_ring_hash(f"{shard_id}#{index}"), shard_id)
+            for shard_id in self.shard_ids
+            for index in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [shard_id for _, shard_id in points]
+
+    def shard_for(self, address: str) -> Optional[str]:
+        """Shard that owns an address, or None on an empty ring"""
+        if not self._hashes:
+            return None
+        index = bisect.bisect_left(self._hashes, _ring_hash(address.lower())) % len(self._hashes)
+        return self._owners[index]
+
+    def __len__(self) -> int:
+        return len(self.shard_ids)
+
+
+def shard_registry(registry: WalletRegistry, ring: HashRing, shard_id: str) -> WalletRegistry:
+    """The part of a registry whose addresses hash to shard_id, in registry order"""
+    return WalletRegistry(
+        ((wallet_id, wallet_config) for wallet_id, wallet_config in registry.items()
+         if ring.shard_for(wallet_config["address"]) == shard_id),
+        source=registry.source,
+        path=registry.path
+    )
+
+
+class ShardCoordinator:
+    """
+    Shard membership through leases in a SQLite file.
+
+    Every shard renews its own lease from a heartbeat thread; a shard whose
+    lease has expired is considered gone and its wallets move to the others.
+    Shards on several hosts share the same file (e.g. on a network mount);
+    no external service is needed.
+    """
+
+    def __init__(self, shard_id: str, path: str = DEFAULT_SHARD_LEASE_PATH,
+                 lease_ttl: float = DEFAULT_SHARD_LEASE_TTL, clock: Callable[[], float] = time.time):
+        if not shard_id:
+            raise ShardingError("Shard ID must not be empty")
+        self.shard_id = shard_id
+        self.path = path
+        self.lease_ttl = float(lease_ttl)
+        self.clock = clock
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._lock = threading.Lock()
+        self._live: List[str] = []
+        self._ring = HashRing([])
+        self._changed = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS shard_leases ("
+                "shard_id TEXT PRIMARY KEY, "
+                "owner TEXT NOT NULL, "
+                "expires_at REAL NOT NULL)"
+            )
+            connection.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per call; the heartbeat thread and the check loop never share one
+        return sqlite3.connect(self.path, timeout=self.lease_ttl / 3, isolation_level=None)
+
+    def renew(self) -> List[str]:
+        """Renew this shard's lease and return the live shard IDs"""
+        now = self.clock()
+        try:
+            with closing(self._connect()) as connection:
+                connection.execute("BEGIN IMMEDIATE")
+                row = connection.execute(
+                    "SELECT owner, expires_at FROM shard_leases WHERE shard_id = ?", (self.shard_id,)
+                ).fetchone()
+                if row and row[0] != self.owner and row[1] > now:
+                    connection.execute("ROLLBACK")
+                    raise ShardingError(f"Shard {self.shard_id} is already held by {row[0]}")
+
+                connection.execute(
+                    "INSERT OR REPLACE INTO shard_leases (shard_id, owner, expires_at) VALUES (?, ?, ?)",
+                    (self.shard_id, self.owner, now + self.lease_ttl)
+                )
+                # Long-dead shards are removed so the table doesn't grow
+                connection.execute("DELETE FROM shard_leases WHERE expires_at < ?", (now - 10 * self.lease_ttl,))
+                live = [shard_id for (shard_id,) in connection.execute(
+                    "SELECT shard_id FROM shard_leases WHERE expires_at > ? ORDER BY shard_id", (now,)
+                )]
+                connection.execute("COMMIT")
+        except sqlite3.Error as e:
+            raise ShardingError(f"Failed to renew lease in {self.path}: {e}") from e
+
+        with self._lock:
+            if live != self._live:
+                self._live = live
+                self._ring = HashRing(live)
+                self._changed = True
+        return live
+
+    def join(self, expected: int = 1, timeout: float = SHARD_JOIN_TIMEOUT) -> List[str]:
+        """
+        Take this shard's lease and start the heartbeat.
+
+        Waits up to `timeout` for `expected` shards so workers started together
+        don't each claim every wallet for a moment and then hand most of them off.
+        """
+        deadline = time.monotonic() + timeout
+        live = self.renew()
+        while len(live) < expected and time.monotonic() < deadline:
+            time.sleep(0.5)
+            live = self.renew()
+
+        self._thread = threading.Thread(target=self._heartbeat, name=f"shard-{self.shard_id}-lease", daemon=True)
+        self._thread.start()
+        return live
+
+    def _heartbeat(self):
+        """Renew the lease every third of its TTL until stopped"""
+        while not self._stop.wait(self.lease_ttl / 3):
+            try:
+                self.renew()
+            except ShardingError as e:
+                print(f"⚠️ Shard heartbeat failed: {e}")
+
+    def leave(self):
+        """Stop the heartbeat and drop the lease so the other shards take over right away"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.lease_ttl / 3)
+        try:
+            with closing(self._connect()) as connection:
+                connection.execute(
+                    "DELETE FROM shard_leases WHERE shard_id = ? AND owner = ?", (self.shard_id, self.owner)
+                )
+        except sqlite3.Error as e:
+            print(f"⚠️ Failed to release shard lease: {e}")
+
+    def live_shards(self) -> List[str]:
+        """Shard IDs seen at the last renewal"""
+        with self._lock:
+            return list(self._live)
+
+    def take_membership_change(self) -> bool:
+        """True once after the set of live shards changed"""
+        with self._lock:
+            changed, self._changed = self._changed, False
+            return changed
+
+    def owned(self, registry: WalletRegistry) -> WalletRegistry:
+        """The wallets this shard is responsible for under the current membership"""
+        with self._lock:
+            ring = self._ring if self._live else HashRing([self.shard_id])
+        return shard_registry(registry, ring, self.shard_id)
+
+    def rate_share(self, rates: Mapping[str, float]) -> Dict[str, float]:
+        """This shard's slice of each process-wide rate budget"""
+        shards = max(1, len(self.live_shards()))
+        return {upstream: rate / shards for upstream, rate in rates.items()}
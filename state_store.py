@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+State Store - Durable per-wallet snapshots so restarts resume change detection
+"""
+
+import json
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import closing
+from typing import Dict, Any, Optional
+
+from constants import (
+    # State persistence
+    STATE_BACKEND_SQLITE,
+    STATE_BACKEND_NONE,
+    DEFAULT_STATE_BACKEND,
+    DEFAULT_STATE_DB_PATH
+)
+
+# Position fields kept in snapshots; enough for change detection and summaries
+SNAPSHOT_POSITION_FIELDS = (
+    "coin", "szi", "entryPx", "positionValue", "unrealizedPnl", "returnOnEquity",
+    "leverage", "liquidationPx", "marginUsed", "cumFunding"
+)
+
+
+class StateStoreError(Exception):
+    """State store related errors"""
+    pass
+
+
+def compact_positions(positions: Optional[Dict]) -> Optional[Dict]:
+    """Strip a clearinghouseState response down to the margin summary and open positions"""
+    if not isinstance(positions, dict):
+        return None
+
+    asset_positions = []
+    for entry in positions.get("assetPositions", []):
+        position = entry.get("position") or {}
+        try:
+            if float(position.get("szi", 0)) == 0:
+                continue
+        except (TypeError, ValueError):
+            continue
+        asset_positions.append({
+            "position": {key: position[key] for key in SNAPSHOT_POSITION_FIELDS if key in position}
+        })
+
+    return {
+        "marginSummary": dict(positions.get("marginSummary", {})),
+        "assetPositions": asset_positions
+    }
+
+
+def build_snapshot(tracker) -> Dict[str, Any]:
+    """Build a compact snapshot from a sync or async wallet tracker"""
+    return {
+        "address": tracker.wallet_address.lower(),
+        "balance": tracker.last_known_balance,
+        "positions": compact_positions(tracker.last_known_positions),
+        "tx_cursor": tracker.tx_cursor.to_dict(),
+        "updated_at": time.time()
+    }
+
+
+class StateStore(ABC):
+    """Backend interface: load every snapshot at startup, save changed ones after each cycle"""
+
+    @abstractmethod
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        """Load snapshots keyed by wallet ID"""
+
+    @abstractmethod
+    def save_many(self, snapshots: Dict[str, Dict[str, Any]]):
+        """Save snapshots keyed by wallet ID"""
+
+    @abstractmethod
+    def delete(self, wallet_id: str):
+        """Forget the snapshot of a wallet"""
+
+
+class NullStateStore(StateStore):
+    """Keeps nothing; every start re-baselines like before"""
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        return {}
+
+    def save_many(self, snapshots: Dict[str, Dict[str, Any]]):
+        pass
+
+    def delete(self, wallet_id: str):
+        pass
+
+
+class SQLiteStateStore(StateStore):
+    """
+    Snapshots in a single SQLite table, one JSON row per wallet.
+
+    A connection is opened per call so the store can be used from the event
+    loop's worker threads without sharing a connection between threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATE_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS wallet_state ("
+                "wallet_id TEXT PRIMARY KEY, "
+                "snapshot TEXT NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+            connection.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            return sqlite3.connect(self.path, timeout=10)
+        except sqlite3.Error as e:
+            raise StateStoreError(f"Cannot open state database {self.path}: {e}")
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        snapshots = {}
+        with closing(self._connect()) as connection:
+            for wallet_id, snapshot in connection.execute("SELECT wallet_id, snapshot FROM wallet_state"):
+                try:
+                    snapshots[wallet_id] = json.loads(snapshot)
+                except ValueError:
+                    print(f"⚠️ Ignoring unreadable state snapshot for wallet {wallet_id}")
+        return snapshots
+
+    def save_many(self, snapshots: Dict[str, Dict[str, Any]]):
+        if not snapshots:
+            return
+        rows = [
+            (wallet_id, json.dumps(snapshot), snapshot.get("updated_at", time.time()))
+            for wallet_id, snapshot in snapshots.items()
+        ]
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO wallet_state (wallet_id, snapshot, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(wallet_id) DO UPDATE SET snapshot = excluded.snapshot, updated_at = excluded.updated_at",
+                    rows
+                )
+
+    def delete(self, wallet_id: str):
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute("DELETE FROM wallet_state WHERE wallet_id = ?", (wallet_id,))
+
+
+# Backend name -> factory taking the state settings from config
+STATE_BACKENDS = {
+    STATE_BACKEND_SQLITE: lambda settings: SQLiteStateStore(settings.get("db_path", DEFAULT_STATE_DB_PATH)),
+    STATE_BACKEND_NONE: lambda settings: NullStateStore(),
+}
+
+
+def create_state_store(config: Dict[str, Any]) -> StateStore:
+    """Create the state backend named in config["state"]["backend"]"""
+    settings = config.get("state", {})
+    backend = settings.get("backend", DEFAULT_STATE_BACKEND)
+    factory = STATE_BACKENDS.get(backend)
+    if factory is None:
+        raise StateStoreError(f"Unknown state backend: {backend}")
+    return factory(settings)
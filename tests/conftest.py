@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# Modules live in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class Clock:
+    """Settable stand-in for time.monotonic; advance it with `clock.now += seconds`"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
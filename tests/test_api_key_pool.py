@@ -0,0 +1,98 @@
+import itertools
+
+import pytest
+
+from api_key_pool import ApiKeyPool, ApiKeyPoolError, is_auth_error_reply
+
+# Each pool gets its own upstream name so the process-wide limiters start fresh
+_upstreams = itertools.count()
+
+
+def make_pool(keys, clock):
+    pool = ApiKeyPool(keys, upstream=f"test-keys-{next(_upstreams)}", clock=clock)
+    # Fast enough that acquiring a key never waits noticeably
+    pool.configure(1000)
+    return pool
+
+
+def test_pool_needs_a_key(clock):
+    with pytest.raises(ApiKeyPoolError):
+        ApiKeyPool(["", None], clock=clock)
+
+
+def test_duplicate_keys_collapse(clock):
+    pool = make_pool(["key-one", "key-two", "key-one"], clock)
+    assert len(pool) == 2
+    assert pool.keys[0].limiter.name == pool.upstream
+    assert pool.keys[1].limiter.name == f"{pool.upstream}#2"
+
+
+def test_requests_rotate_to_the_key_with_most_budget(clock):
+    pool = make_pool(["key-one", "key-two", "key-three"], clock)
+
+    used = [pool.acquire().key for _ in range(6)]
+
+    assert sorted(used) == sorted(["key-one", "key-two", "key-three"] * 2)
+    assert [stats["requests"] for stats in pool.get_stats()] == [2, 2, 2]
+    assert pool.total_rate() == 3000
+
+
+def test_quarantined_key_is_skipped_until_it_returns(clock):
+    pool = make_pool(["key-one", "key-two"], clock)
+    first, second = pool.keys
+
+    pool.quarantine(first, "Max rate limit reached")
+    assert all(pool.acquire() is second for _ in range(3))
+    assert pool.total_rate() == 1000
+
+    clock.now += 5
+    assert pool.acquire() is first
+
+
+def test_quarantine_durations_double_up_to_the_cap(clock):
+    pool = make_pool(["key-one", "key-two"], clock)
+    api_key = pool.keys[0]
+
+    def quarantined_for(**kwargs):
+        pool.quarantine(api_key, "error", **kwargs)
+        return api_key.quarantined_until - clock.now
+
+    assert quarantined_for() == 5
+    assert quarantined_for() == 10
+    assert quarantined_for(retry_after=30) == 120
+    assert quarantined_for(auth=True) == 3600
+    assert (api_key.auth_failures, api_key.rate_failures) == (1, 3)
+
+    pool.record_success(api_key)
+    assert quarantined_for(retry_after=30) == 30
+    assert quarantined_for(auth=True) == 1800
+
+
+def test_all_keys_quarantined_uses_the_first_to_return(clock):
+    pool = make_pool(["key-one", "key-two"], clock)
+    first, second = pool.keys
+    pool.quarantine(first, "invalid", auth=True)
+    pool.quarantine(second, "rate", retry_after=60)
+
+    assert pool.acquire() is second
+    # No healthy key: report the first key's rate rather than nothing
+    assert pool.total_rate() == 1000
+
+
+def test_format_stats(clock):
+    pool = make_pool(["aaaa1111", "bbbb2222"], clock)
+    pool.acquire()
+    pool.quarantine(pool.keys[1], "Invalid API Key", auth=True)
+
+    summary = pool.format_stats()
+    assert "(...1111) 1 req" in summary
+    assert "(...2222) 0 req, 1 auth/0 rate errors, quarantined 900s" in summary
+    assert "bbbb2222" not in summary
+
+
+def test_is_auth_error_reply():
+    assert is_auth_error_reply({"status": "0", "message": "NOTOK", "result": "Invalid API Key"})
+    assert is_auth_error_reply({"status": 0, "message": "NOTOK", "result": "Missing/Invalid API Key"})
+    assert not is_auth_error_reply({"status": "0", "message": "NOTOK", "result": "Max rate limit reached"})
+    assert not is_auth_error_reply({"status": "1", "result": "Invalid API Key"})
+    assert not is_auth_error_reply(None)
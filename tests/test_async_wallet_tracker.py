@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from async_wallet_tracker import AsyncWalletTracker
+
+
+class Unreachable(Exception):
+    pass
+
+
+async def fail(*args):
+    raise Unreachable("timed out")
+
+
+async def unchanged_balance(current_balance=None):
+    return False, 1.0, 0
+
+
+async def unchanged_positions():
+    return False, {}, "no_change"
+
+
+async def no_transfers():
+    return False, []
+
+
+@pytest.fixture
+def tracker():
+    return AsyncWalletTracker("0x" + "ab" * 20, "test-key")
+
+
+def check(tracker, prefetched_balance=None, balance=unchanged_balance, positions=unchanged_positions,
+          deposits=no_transfers):
+    tracker.check_balance_change = balance
+    tracker.check_position_changes = positions
+    tracker.check_deposit_withdrawal = deposits
+    return asyncio.run(tracker.check_wallet(prefetched_balance))
+
+
+def test_partial_failure_keeps_the_other_parts(tracker):
+    result = check(tracker, positions=fail)
+
+    assert set(result["errors"]) == {"positions"}
+    assert "error" not in result
+    assert result["new_balance"] == 1.0
+    assert result["position_change_type"] == "position_data_unavailable"
+
+
+def test_every_part_failing_fails_the_wallet(tracker):
+    result = check(tracker, balance=fail, positions=fail, deposits=fail)
+
+    assert set(result["errors"]) == {"balance", "positions", "deposits"}
+    assert "error" in result
+
+
+def test_prefetched_balance_does_not_hide_a_failed_wallet(tracker):
+    result = check(tracker, prefetched_balance=1.0, positions=fail, deposits=fail)
+
+    assert "balance" not in result["errors"]
+    assert "positions: timed out" in result["error"]
+
+
+def test_own_balance_request_keeps_the_wallet_alive(tracker):
+    result = check(tracker, positions=fail, deposits=fail)
+
+    assert "error" not in result
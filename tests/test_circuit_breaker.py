@@ -0,0 +1,210 @@
+import asyncio
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitBreakerError,
+    circuit_breaker_name,
+    format_circuit_breaker_stats,
+    get_circuit_breaker
+)
+
+
+class Upstream(Exception):
+    pass
+
+
+async def fail():
+    raise Upstream("down")
+
+
+async def succeed():
+    return "ok"
+
+
+def make_breaker(clock, **kwargs):
+    kwargs.setdefault("failure_threshold", 3)
+    kwargs.setdefault("recovery_timeout", 30)
+    return CircuitBreaker("test", expected_exception=Upstream, clock=clock, **kwargs)
+
+
+def trip(breaker):
+    async def run():
+        for _ in range(breaker.failure_threshold):
+            with pytest.raises(Upstream):
+                await breaker.call(fail)
+    asyncio.run(run())
+
+
+def test_threshold_opens_and_rejects(clock):
+    breaker = make_breaker(clock)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(Upstream):
+                await breaker.call(fail)
+        # A success in between resets the streak
+        assert await breaker.call(succeed) == "ok"
+        for _ in range(3):
+            with pytest.raises(Upstream):
+                await breaker.call(fail)
+        assert breaker.get_state() == STATE_OPEN
+
+        with pytest.raises(CircuitBreakerError, match="OPEN"):
+            await breaker.call(succeed)
+
+    asyncio.run(run())
+    assert breaker.get_stats()["rejected"] == 1
+    assert breaker.get_stats()["opened"] == 1
+
+
+def test_other_exceptions_do_not_count(clock):
+    breaker = make_breaker(clock, failure_threshold=1)
+
+    async def run():
+        with pytest.raises(ValueError):
+            await breaker.call(lambda: int("x"))
+
+    asyncio.run(run())
+    assert breaker.get_state() == STATE_CLOSED
+    assert breaker.failure_count == 0
+
+
+def test_half_open_limits_concurrent_probes(clock):
+    breaker = make_breaker(clock, half_open_max_calls=2)
+    trip(breaker)
+    clock.now += 30
+
+    async def run():
+        release = asyncio.Event()
+
+        async def probe():
+            await release.wait()
+            return "ok"
+
+        probes = [asyncio.create_task(breaker.call(probe)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert breaker.get_state() == STATE_HALF_OPEN
+
+        with pytest.raises(CircuitBreakerError, match="HALF_OPEN"):
+            await breaker.call(succeed)
+
+        release.set()
+        assert await asyncio.gather(*probes) == ["ok", "ok"]
+
+    asyncio.run(run())
+    assert breaker.get_state() == STATE_CLOSED
+
+
+def test_failed_probe_reopens(clock):
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 30
+
+    async def run():
+        with pytest.raises(Upstream):
+            await breaker.call(fail)
+        assert breaker.get_state() == STATE_OPEN
+        with pytest.raises(CircuitBreakerError):
+            await breaker.call(succeed)
+
+    asyncio.run(run())
+    assert breaker.opened_at == clock.now
+    assert breaker.get_stats()["opened"] == 2
+
+
+def test_successful_probe_closes_and_records_the_outage(clock):
+    breaker = make_breaker(clock)
+    trip(breaker)
+
+    # The first call after the timeout is the probe, however late it comes
+    clock.now += 45
+
+    assert asyncio.run(breaker.call(succeed)) == "ok"
+
+    stats = breaker.get_stats()
+    assert stats["state"] == STATE_CLOSED
+    assert stats["last_open_duration"] == 45
+    assert stats["total_open_seconds"] == 45
+    assert stats["open_for"] == 0
+    assert [(start, end) for _, start, end in stats["transitions"]] == [
+        (STATE_CLOSED, STATE_OPEN),
+        (STATE_OPEN, STATE_HALF_OPEN),
+        (STATE_HALF_OPEN, STATE_CLOSED)
+    ]
+
+
+def test_late_success_while_open_is_ignored(clock):
+    breaker = make_breaker(clock)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "ok"
+
+        # Sent while closed, answers after the breaker opened
+        late = asyncio.create_task(breaker.call(slow))
+        await asyncio.sleep(0)
+        for _ in range(3):
+            with pytest.raises(Upstream):
+                await breaker.call(fail)
+        release.set()
+        assert await late == "ok"
+
+    asyncio.run(run())
+    assert breaker.get_state() == STATE_OPEN
+    assert breaker.failure_count == 3
+
+
+def test_cancelled_probe_frees_its_slot(clock):
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 30
+
+    async def run():
+        probe = asyncio.create_task(breaker.call(asyncio.sleep, 60))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert breaker.get_state() == STATE_HALF_OPEN
+        assert await breaker.call(succeed) == "ok"
+
+    asyncio.run(run())
+    assert breaker.get_state() == STATE_CLOSED
+
+
+def test_registry_shares_breakers_per_endpoint(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    url = "https://api.etherscan.io/api?module=account&apikey=secret"
+
+    assert circuit_breaker_name(url) == "api.etherscan.io/api"
+    assert circuit_breaker_name(url, "txlist") == "api.etherscan.io/api txlist"
+
+    breaker = get_circuit_breaker(url, "txlist")
+    assert get_circuit_breaker("https://api.etherscan.io/api?apikey=other", "txlist") is breaker
+    assert get_circuit_breaker(url, "tokentx") is not breaker
+
+
+def test_format_stats_lists_only_tripped_breakers(monkeypatch, clock):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    assert format_circuit_breaker_stats() == ""
+
+    get_circuit_breaker("https://api.hyperliquid.xyz/info")
+    tripped = get_circuit_breaker("https://api.etherscan.io/api", "txlist")
+    tripped.clock = clock
+    tripped.expected_exception = Upstream
+    trip(tripped)
+    with pytest.raises(CircuitBreakerError):
+        asyncio.run(tripped.call(succeed))
+
+    summary = format_circuit_breaker_stats()
+    assert summary.startswith("api.etherscan.io/api txlist OPEN (opened 1x, 1 rejected")
+    assert "hyperliquid" not in summary
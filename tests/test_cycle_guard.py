@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+
+from cycle_guard import CycleGuard
+
+
+@pytest.fixture
+def guard(clock):
+    return CycleGuard(soft_fraction=0.8, hard_fraction=0.95, max_deferrals=3, clock=clock)
+
+
+def test_deadlines_follow_the_budget(guard, clock):
+    assert not guard.past_soft_deadline()
+
+    assert guard.begin(100)
+    assert guard.soft_deadline == clock.now + 80
+    assert guard.hard_deadline == clock.now + 95
+
+    clock.now += 79
+    assert not guard.past_soft_deadline()
+    clock.now += 1
+    assert guard.past_soft_deadline()
+
+    guard.end([], [])
+    assert guard.soft_deadline is None and guard.hard_deadline is None
+    assert not guard.past_soft_deadline()
+
+
+def test_overlapping_cycle_is_refused(guard):
+    assert guard.begin(100)
+    assert not guard.begin(100)
+    assert guard.get_stats()["overlaps_skipped"] == 1
+
+    guard.end([], [])
+    assert guard.begin(100)
+
+
+def test_overlap_is_refused_across_threads(guard):
+    assert guard.begin(100)
+    started = []
+    thread = threading.Thread(target=lambda: started.append(guard.begin(100)))
+    thread.start()
+    thread.join()
+
+    assert started == [False]
+    guard.end([], [])
+
+
+def test_unchecked_wallets_are_deferred(guard):
+    guard.begin(100)
+    deferred = guard.end(["a", "b", "c"], ["a"])
+
+    assert deferred == ["b", "c"]
+    assert guard.get_stats() == {"last_deferred": 2, "total_deferred": 2, "waiting": 2, "overlaps_skipped": 0}
+
+    # Checking a wallet clears its deferral count
+    guard.begin(100)
+    guard.end(["b", "c"], ["b", "c"])
+    assert guard.get_stats()["waiting"] == 0
+
+
+def test_priority_keeps_the_given_order_by_default(guard):
+    assert guard.prioritize(["c", "a", "b"]) == ["c", "a", "b"]
+
+
+def test_priority_puts_urgent_and_changed_wallets_first(guard):
+    guard.record("b", changed=True)
+
+    order = guard.prioritize(["a", "b", "c", "d"], is_urgent=lambda wallet_id: wallet_id == "d")
+    assert order == ["b", "d", "a", "c"]
+
+    # A quiet check drops the changed wallet back
+    guard.record("b", changed=False)
+    assert guard.prioritize(["a", "b", "c"]) == ["a", "b", "c"]
+
+
+def test_priority_favours_the_most_deferred(guard):
+    guard.begin(100)
+    guard.end(["a", "b", "c"], ["a"])
+    guard.begin(100)
+    guard.end(["a", "c"], ["a"])
+
+    assert guard.prioritize(["a", "b", "c"]) == ["c", "b", "a"]
+
+
+def test_long_deferred_wallets_become_urgent(guard):
+    for _ in range(3):
+        guard.begin(100)
+        guard.end(["starved"], [])
+
+    # Three deferrals rank with the urgent wallets, ahead of the changed one listed before it
+    guard.record("changed", changed=True)
+    assert guard.prioritize(["changed", "starved", "other"])[:2] == ["starved", "changed"]
+
+
+def test_forget_drops_priority_state(guard):
+    guard.begin(100)
+    guard.end(["a"], [])
+    guard.record("a", changed=True)
+
+    guard.forget("a")
+    assert guard.prioritize(["b", "a"]) == ["b", "a"]
+    assert guard.get_stats()["waiting"] == 0
@@ -0,0 +1,110 @@
+import time
+from email.utils import formatdate
+
+import pytest
+
+from rate_limiter import TokenBucketRateLimiter, parse_retry_after
+
+
+def test_reservations_wait_their_turn(clock):
+    limiter = TokenBucketRateLimiter("test", rate=2, burst=1, clock=clock)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.5)
+    assert limiter.reserve() == pytest.approx(1.0)
+
+    clock.now += 10
+    assert limiter.reserve() == 0
+
+
+def test_throttle_halves_the_rate_once_per_cooldown(clock):
+    limiter = TokenBucketRateLimiter("test", rate=10, clock=clock)
+
+    limiter.record_throttled()
+    assert limiter.rate == 5
+    assert limiter.throttled_at_rate == 10
+
+    # Replies from the same burst of in-flight requests count once
+    clock.now += 1
+    limiter.record_throttled()
+    assert limiter.rate == 5
+    assert limiter.total_throttled == 2
+
+    clock.now += 2
+    limiter.record_throttled()
+    assert limiter.rate == 2.5
+
+
+def test_throttle_never_goes_below_the_floor(clock):
+    limiter = TokenBucketRateLimiter("test", rate=10, clock=clock)
+    for _ in range(10):
+        limiter.record_throttled()
+        clock.now += 2
+    assert limiter.rate == pytest.approx(1.0)
+
+
+def test_retry_after_blocks_new_reservations(clock):
+    limiter = TokenBucketRateLimiter("test", rate=10, burst=5, clock=clock)
+
+    limiter.record_throttled(retry_after=3)
+    assert limiter.get_wait_time() >= 3
+    clock.now += 3.5
+    assert limiter.get_wait_time() == 0
+
+
+def test_success_recovers_the_rate_after_each_interval(clock):
+    limiter = TokenBucketRateLimiter("test", rate=10, clock=clock)
+    limiter.record_throttled()
+
+    limiter.record_success()
+    assert limiter.rate == 5
+
+    for expected in (6, 7, 8, 9, 10):
+        clock.now += 5
+        limiter.record_success()
+        assert limiter.rate == pytest.approx(expected)
+
+    # Back at the configured rate and nobody is waiting: stay there
+    clock.now += 5
+    limiter.record_success()
+    assert limiter.rate == pytest.approx(10)
+
+
+def test_probes_above_the_configured_rate_only_while_saturated(clock):
+    limiter = TokenBucketRateLimiter("test", rate=10, burst=1, max_rate=12, clock=clock)
+
+    clock.now += 5
+    limiter.record_success()
+    assert limiter.rate == 10
+
+    limiter.reserve()
+    assert limiter.reserve() > 0
+    limiter.record_success()
+    assert limiter.rate == 11
+
+    for _ in range(5):
+        clock.now += 5
+        limiter.reserve()
+        limiter.reserve()
+        limiter.record_success()
+    assert limiter.rate == 12
+
+
+def test_configure_restarts_adaptation(clock):
+    limiter = TokenBucketRateLimiter("test", rate=10, burst=10, clock=clock)
+    limiter.record_throttled()
+
+    limiter.configure(4, burst=2, max_rate=8)
+    assert (limiter.rate, limiter.base_rate, limiter.max_rate, limiter.min_rate) == (4, 4, 8, pytest.approx(0.4))
+    assert limiter.burst == 2
+    assert limiter.throttled_at_rate is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("5") == 5
+    assert parse_retry_after("-3") == 0
+    assert 50 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0
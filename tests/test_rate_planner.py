@@ -0,0 +1,93 @@
+import pytest
+
+from constants import MAX_CHECK_INTERVAL, UPSTREAM_ETHERSCAN, UPSTREAM_HYPERLIQUID
+from rate_planner import RatePlanner, balancemulti_calls, calls_per_cycle, format_plan, plan_cycle
+
+LIMITS = {UPSTREAM_ETHERSCAN: 2, UPSTREAM_HYPERLIQUID: 10}
+
+
+def test_balancemulti_calls_per_batch():
+    assert balancemulti_calls(0) == 0
+    assert balancemulti_calls(100) == 5
+    # Every spread slot sends its own balancemulti, however few wallets it holds
+    assert balancemulti_calls(100, batches=60) == 60
+    # More batches than wallets can't add calls
+    assert balancemulti_calls(10, batches=60) == 10
+    assert balancemulti_calls(100, batches=2) == 6
+
+
+def test_calls_per_cycle():
+    assert calls_per_cycle(100) == {UPSTREAM_ETHERSCAN: 205, UPSTREAM_HYPERLIQUID: 100}
+    assert calls_per_cycle(100, batches=60)[UPSTREAM_ETHERSCAN] == 260
+
+
+def test_plan_finds_the_rate_bottleneck():
+    plan = plan_cycle(100, LIMITS, check_interval=600, concurrency=10)
+
+    assert plan["bottleneck"] == UPSTREAM_ETHERSCAN
+    assert plan["min_cycle"] == pytest.approx(102.5)
+    assert plan["required_interval"] == pytest.approx(123)
+    assert plan["fits"]
+    assert plan["recommended_interval"] == 123
+    assert plan["max_wallets"] == 487
+
+
+def test_plan_finds_the_latency_bottleneck():
+    plan = plan_cycle(100, LIMITS, check_interval=60, concurrency=1, seconds_per_wallet=2.0)
+
+    assert plan["bottleneck"] == "latency"
+    assert plan["min_cycle"] == 200
+    assert not plan["fits"] and plan["achievable"]
+    assert plan["recommended_interval"] == 240
+    assert "MAX_CONCURRENT_WALLETS" in format_plan(plan, LIMITS)[-1]
+
+
+def test_plan_beyond_the_maximum_interval():
+    plan = plan_cycle(5000, LIMITS, check_interval=600, concurrency=100)
+
+    assert not plan["achievable"]
+    assert plan["recommended_interval"] == MAX_CHECK_INTERVAL
+    assert "etherscan rate limit" in format_plan(plan, LIMITS)[-1]
+
+
+def test_spread_batches_raise_the_per_wallet_cost():
+    burst = plan_cycle(100, LIMITS, check_interval=600, concurrency=10)
+    spread = plan_cycle(100, LIMITS, check_interval=600, concurrency=10, batches=60)
+
+    assert spread["calls"][UPSTREAM_ETHERSCAN] > burst["calls"][UPSTREAM_ETHERSCAN]
+    assert spread["max_wallets"] < burst["max_wallets"]
+    assert "60 separate batches" in format_plan(spread, LIMITS)[0]
+
+
+def test_planner_without_auto_tune_keeps_the_interval():
+    planner = RatePlanner(60)
+    plan = planner.update(100, LIMITS, concurrency=10)
+
+    assert not plan["fits"]
+    assert planner.check_interval == 60
+
+
+def test_auto_tune_raises_and_eases_back():
+    planner = RatePlanner(60, auto_tune=True)
+
+    assert planner.update(100, LIMITS, concurrency=10)["fits"]
+    assert planner.check_interval == 123
+
+    # Slightly less work isn't enough room to ease back
+    planner.update(90, LIMITS, concurrency=10)
+    assert planner.check_interval == 123
+
+    planner.update(10, LIMITS, concurrency=10)
+    assert planner.check_interval == 60
+
+
+def test_observed_latency_is_smoothed():
+    planner = RatePlanner(600)
+    planner.observe_cycle(20, 10.0, concurrency=10)
+    assert planner.seconds_per_wallet == 5.0
+
+    planner.observe_cycle(20, 0.0, concurrency=10)
+    assert planner.seconds_per_wallet == 5.0
+
+    planner.observe_cycle(20, 20.0, concurrency=10)
+    assert 5.0 < planner.seconds_per_wallet < 10.0
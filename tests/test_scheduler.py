@@ -0,0 +1,185 @@
+import pytest
+
+from scheduler import AdaptivePollScheduler, PollScheduler, SpreadPollScheduler, position_risk, slot_fraction
+
+
+def positions(leverage=1, liquidation_price=None, size="1", value="100"):
+    position = {"szi": size, "leverage": {"value": leverage}, "positionValue": value}
+    if liquidation_price is not None:
+        position["liquidationPx"] = str(liquidation_price)
+    return {"assetPositions": [{"position": position}]}
+
+
+def test_base_scheduler_is_abstract():
+    with pytest.raises(TypeError):
+        PollScheduler(600)
+
+
+def test_position_risk():
+    assert position_risk(None) == (0.0, None)
+    assert position_risk(positions(leverage=5)) == (5.0, None)
+    assert position_risk(positions(leverage=5, liquidation_price=95)) == (5.0, pytest.approx(0.05))
+    # Closed positions carry no risk
+    assert position_risk(positions(leverage=50, size="0")) == (0.0, None)
+
+
+def test_slot_fraction_is_stable():
+    assert slot_fraction("wallet") == slot_fraction("wallet")
+    assert 0 <= slot_fraction("wallet") < 1
+    assert slot_fraction("wallet") != slot_fraction("wallet2")
+
+
+def test_adaptive_new_wallets_are_due_at_once(clock):
+    scheduler = AdaptivePollScheduler(600, clock=clock)
+
+    assert scheduler.due(["a", "b"]) == ["a", "b"]
+    assert scheduler.get_interval("a") == 600
+
+
+def test_adaptive_change_polls_fast_then_cools_down(clock):
+    scheduler = AdaptivePollScheduler(600, min_interval=60, clock=clock)
+    scheduler.sync(["a"])
+
+    assert scheduler.record("a", changed=True) == 60
+    intervals = [scheduler.record("a", changed=False) for _ in range(5)]
+    assert intervals == [120, 240, 480, 600, 600]
+
+
+def test_adaptive_failure_keeps_the_wallet_on_schedule(clock):
+    scheduler = AdaptivePollScheduler(600, clock=clock)
+    scheduler.sync(["a"])
+
+    clock.now += 86400
+    assert scheduler.record("a", changed=False) == 1200
+    assert scheduler.record("a", changed=False, failed=True) == 600
+    assert scheduler.get_stats()["reasons"] == {"retry": 1}
+
+
+def test_adaptive_risky_positions_poll_faster(clock):
+    scheduler = AdaptivePollScheduler(600, clock=clock)
+    scheduler.sync(["levered", "near_liquidation", "calm"])
+
+    assert scheduler.record("levered", False, positions(leverage=20)) == 150
+    assert scheduler.record("near_liquidation", False, positions(leverage=2, liquidation_price=95)) == 150
+    assert scheduler.record("calm", False, positions(leverage=2, liquidation_price=50)) == 600
+
+
+def test_adaptive_dormant_wallets_back_off_to_the_maximum(clock):
+    scheduler = AdaptivePollScheduler(600, max_interval=3600, dormant_after=86400, clock=clock)
+    scheduler.sync(["a"])
+
+    clock.now += 86400
+    intervals = [scheduler.record("a", changed=False) for _ in range(4)]
+    assert intervals == [1200, 2400, 3600, 3600]
+
+    # Activity brings it straight back
+    assert scheduler.record("a", changed=True) == 60
+
+
+def test_adaptive_orders_due_wallets_by_how_overdue(clock):
+    scheduler = AdaptivePollScheduler(600, min_interval=60, clock=clock)
+    scheduler.sync(["quiet", "busy"])
+    scheduler.record("quiet", changed=False)
+    scheduler.record("busy", changed=True)
+
+    clock.now += 60
+    assert scheduler.due(["quiet", "busy"]) == ["busy"]
+    assert scheduler.next_due_in() == 0
+
+    clock.now += 540
+    assert scheduler.due(["quiet", "busy"]) == ["busy", "quiet"]
+
+
+def test_adaptive_forgets_removed_wallets(clock):
+    scheduler = AdaptivePollScheduler(600, clock=clock)
+    scheduler.sync(["a", "b"])
+    scheduler.record("a", changed=False)
+
+    assert scheduler.due(["a", "c"]) == ["c"]
+    assert scheduler.get_interval("b") is None
+    assert scheduler.get_stats()["wallets"] == 2
+
+
+def test_adaptive_spread_staggers_new_wallets_and_jitters(clock):
+    scheduler = AdaptivePollScheduler(600, spread=True, clock=clock)
+    wallet_ids = [f"w{index}" for index in range(200)]
+    scheduler.sync(wallet_ids)
+
+    starts = {scheduler._wallets[wallet_id]["next_due"] - clock.now for wallet_id in wallet_ids}
+    assert len(starts) > 30
+    assert all(0 <= start < 600 for start in starts)
+
+    for wallet_id in wallet_ids:
+        scheduler.record(wallet_id, changed=False)
+    due_in = [scheduler._wallets[wallet_id]["next_due"] - clock.now for wallet_id in wallet_ids]
+    assert all(540 <= seconds <= 660 for seconds in due_in)
+    assert len(set(due_in)) > 100
+
+
+def test_spread_deals_wallets_evenly_over_slots(clock):
+    scheduler = SpreadPollScheduler(600, slots=60, clock=clock)
+    wallet_ids = [f"w{index}" for index in range(120)]
+    scheduler.sync(wallet_ids)
+
+    per_slot = {}
+    for wallet_id in wallet_ids:
+        phase = scheduler._wallets[wallet_id]["phase"]
+        per_slot[phase] = per_slot.get(phase, 0) + 1
+    assert len(per_slot) == 60
+    assert set(per_slot.values()) == {2}
+    assert scheduler.batches_per_interval() == 60
+
+
+def test_spread_checks_every_wallet_once_per_interval(clock):
+    scheduler = SpreadPollScheduler(600, slots=60, clock=clock)
+    wallet_ids = [f"w{index}" for index in range(90)]
+
+    checked = []
+    for _ in range(60):
+        for wallet_id in scheduler.due(wallet_ids):
+            checked.append(wallet_id)
+            scheduler.record(wallet_id, changed=False)
+        clock.now += 10
+
+    assert sorted(checked) == sorted(wallet_ids)
+
+
+def test_spread_late_check_skips_to_a_later_slot(clock):
+    scheduler = SpreadPollScheduler(600, slots=60, clock=clock)
+    scheduler.sync(["a"])
+    phase = scheduler._wallets["a"]["phase"]
+
+    clock.now += phase + 590
+    next_in = scheduler.record("a", changed=False)
+    assert next_in >= 300
+    assert (clock.now + next_in - 1000 - phase) % 600 == 0
+
+
+def test_spread_slots_barely_move_when_wallets_change(clock):
+    scheduler = SpreadPollScheduler(600, slots=60, clock=clock)
+    wallet_ids = [f"w{index}" for index in range(100)]
+    scheduler.sync(wallet_ids)
+    before = {wallet_id: dict(scheduler._wallets[wallet_id]) for wallet_id in wallet_ids}
+
+    scheduler.sync(wallet_ids + ["new"])
+    for wallet_id in wallet_ids:
+        state = scheduler._wallets[wallet_id]
+        assert abs(state["phase"] - before[wallet_id]["phase"]) <= 10
+        # Already scheduled wallets keep their next check
+        assert state["next_due"] == before[wallet_id]["next_due"]
+
+    scheduler.sync(wallet_ids[:50])
+    assert scheduler.get_stats()["wallets"] == 50
+    assert scheduler.batches_per_interval() == 50
+
+
+def test_spread_new_base_interval_redeals_slots(clock):
+    scheduler = SpreadPollScheduler(600, slots=60, clock=clock)
+    wallet_ids = [f"w{index}" for index in range(60)]
+    scheduler.sync(wallet_ids)
+
+    scheduler.set_base_interval(1200)
+    scheduler.sync(wallet_ids)
+    phases = sorted(scheduler._wallets[wallet_id]["phase"] for wallet_id in wallet_ids)
+    assert phases == [slot * 20 for slot in range(60)]
+    assert scheduler.get_interval("w0") == 1200
@@ -0,0 +1,121 @@
+import pytest
+
+from sharding import HashRing, ShardCoordinator, ShardingError, shard_registry
+from wallet_registry import WalletRegistry
+
+
+def addresses(count):
+    return ["0x%040x" % index for index in range(1, count + 1)]
+
+
+def test_ring_is_deterministic_and_case_insensitive():
+    ring = HashRing(["b", "a", "c"])
+    other = HashRing(["c", "a", "b"])
+    for address in addresses(50):
+        assert ring.shard_for(address) == other.shard_for(address) == ring.shard_for(address.upper())
+
+
+def test_empty_ring_owns_nothing():
+    assert HashRing([]).shard_for(addresses(1)[0]) is None
+    assert len(HashRing(["a", "a"])) == 1
+
+
+def test_ring_spreads_wallets_over_every_shard():
+    ring = HashRing(["a", "b", "c", "d"])
+    counts = {}
+    for address in addresses(4000):
+        shard = ring.shard_for(address)
+        counts[shard] = counts.get(shard, 0) + 1
+    assert set(counts) == {"a", "b", "c", "d"}
+    assert min(counts.values()) > 4000 / 4 * 0.6
+
+
+def test_adding_a_shard_only_moves_wallets_to_it():
+    before = HashRing(["a", "b", "c"])
+    after = HashRing(["a", "b", "c", "d"])
+    moved = [address for address in addresses(3000) if before.shard_for(address) != after.shard_for(address)]
+
+    assert all(after.shard_for(address) == "d" for address in moved)
+    # Roughly 1/4 of the wallets, never a reshuffle of everything
+    assert 0.1 < len(moved) / 3000 < 0.4
+
+
+def test_shard_registry_partitions_in_order():
+    registry = WalletRegistry(
+        [(f"w{index}", {"address": address, "enabled": True}) for index, address in enumerate(addresses(100))],
+        source="test"
+    )
+    ring = HashRing(["a", "b"])
+    parts = [shard_registry(registry, ring, shard) for shard in ("a", "b")]
+
+    assert set(parts[0]) | set(parts[1]) == set(registry)
+    assert not set(parts[0]) & set(parts[1])
+    assert list(parts[0]) == [wallet_id for wallet_id in registry if wallet_id in parts[0]]
+    assert parts[0].source == "test"
+
+
+@pytest.fixture
+def lease_path(tmp_path):
+    return str(tmp_path / "leases.db")
+
+
+def coordinator(shard_id, path, clock, owner=None):
+    shard = ShardCoordinator(shard_id, path=path, lease_ttl=30, clock=clock)
+    if owner:
+        shard.owner = owner
+    return shard
+
+
+def test_leases_track_live_shards_and_expire(lease_path, clock):
+    a = coordinator("a", lease_path, clock)
+    b = coordinator("b", lease_path, clock)
+
+    assert a.renew() == ["a"]
+    assert b.renew() == ["a", "b"]
+    assert a.renew() == ["a", "b"]
+    assert a.take_membership_change() and not a.take_membership_change()
+
+    # b stops renewing; once its lease runs out a sees it gone
+    clock.now += 31
+    assert a.renew() == ["a"]
+    assert a.take_membership_change()
+    assert a.rate_share({"etherscan": 4}) == {"etherscan": 4}
+
+
+def test_live_lease_cannot_be_taken_by_another_owner(lease_path, clock):
+    coordinator("a", lease_path, clock, owner="host-1:1").renew()
+    intruder = coordinator("a", lease_path, clock, owner="host-2:1")
+
+    with pytest.raises(ShardingError, match="already held"):
+        intruder.renew()
+
+    clock.now += 31
+    assert intruder.renew() == ["a"]
+
+
+def test_owned_wallets_follow_membership(lease_path, clock):
+    a = coordinator("a", lease_path, clock)
+    b = coordinator("b", lease_path, clock)
+    registry = WalletRegistry(
+        [(f"w{index}", {"address": address, "enabled": True}) for index, address in enumerate(addresses(60))]
+    )
+
+    # Before the first renewal a shard owns everything rather than nothing
+    assert set(a.owned(registry)) == set(registry)
+
+    a.renew()
+    b.renew()
+    a.renew()
+    assert set(a.owned(registry)) | set(b.owned(registry)) == set(registry)
+    assert not set(a.owned(registry)) & set(b.owned(registry))
+    assert a.rate_share({"etherscan": 4}) == {"etherscan": 2}
+
+
+def test_leave_releases_the_lease(lease_path, clock):
+    a = coordinator("a", lease_path, clock)
+    b = coordinator("b", lease_path, clock)
+    a.renew()
+    b.renew()
+
+    b.leave()
+    assert a.renew() == ["a"]
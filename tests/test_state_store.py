@@ -0,0 +1,128 @@
+import sqlite3
+
+import pytest
+
+from multi_wallet_tracker import MultiWalletTracker
+from state_store import (
+    NullStateStore,
+    SQLiteStateStore,
+    StateStore,
+    StateStoreError,
+    compact_positions,
+    create_state_store
+)
+
+ADDRESS = "0x" + "AB" * 20
+
+POSITIONS = {
+    "marginSummary": {"accountValue": "1500.0"},
+    "assetPositions": [
+        {"position": {"coin": "ETH", "szi": "2.0", "entryPx": "3000", "positionValue": "6000",
+                      "leverage": {"type": "cross", "value": 5}, "liquidationPx": "2500", "maxTradeSzs": [1, 2]}},
+        {"position": {"coin": "BTC", "szi": "0.0", "entryPx": "60000"}}
+    ]
+}
+
+
+def snapshot(balance, updated_at=1.0):
+    return {"address": ADDRESS.lower(), "balance": balance, "positions": None, "tx_cursor": {}, "updated_at": updated_at}
+
+
+def test_compact_positions_keeps_open_positions_only():
+    compact = compact_positions(POSITIONS)
+
+    assert compact["marginSummary"] == {"accountValue": "1500.0"}
+    assert [entry["position"]["coin"] for entry in compact["assetPositions"]] == ["ETH"]
+    assert "maxTradeSzs" not in compact["assetPositions"][0]["position"]
+    assert compact_positions(None) is None
+
+
+def test_sqlite_round_trip(tmp_path):
+    path = str(tmp_path / "state" / "wallets.db")
+    store = SQLiteStateStore(path)
+    assert store.load_all() == {}
+
+    store.save_many({"a": snapshot(1.5), "b": snapshot(2.0)})
+    store.save_many({"a": snapshot(1.75, updated_at=2.0)})
+    store.delete("b")
+
+    # A fresh store on the same file sees what the first one saved
+    assert SQLiteStateStore(path).load_all() == {"a": snapshot(1.75, updated_at=2.0)}
+
+
+def test_sqlite_skips_unreadable_rows(tmp_path):
+    path = str(tmp_path / "wallets.db")
+    store = SQLiteStateStore(path)
+    store.save_many({"good": snapshot(1.0)})
+    with sqlite3.connect(path) as connection:
+        connection.execute("INSERT INTO wallet_state VALUES ('bad', '{not json', 0)")
+
+    assert list(store.load_all()) == ["good"]
+
+
+def test_create_state_store(tmp_path):
+    assert isinstance(create_state_store({"state": {"backend": "none"}}), NullStateStore)
+    store = create_state_store({"state": {"backend": "sqlite", "db_path": str(tmp_path / "s.db")}})
+    assert isinstance(store, SQLiteStateStore)
+
+    with pytest.raises(StateStoreError, match="Unknown state backend"):
+        create_state_store({"state": {"backend": "redis"}})
+    with pytest.raises(TypeError):
+        StateStore()
+
+
+def test_null_store_keeps_nothing():
+    store = NullStateStore()
+    store.save_many({"a": snapshot(1.0)})
+    assert store.load_all() == {}
+
+
+def make_tracker(path, warm_start=False, address=ADDRESS):
+    return MultiWalletTracker({
+        "wallets": {"main": {"address": address, "name": "Main", "enabled": True}},
+        "etherscan_api_key": "test-key",
+        "state": {"backend": "sqlite", "db_path": path},
+        "warm_start": warm_start
+    }, use_async=False)
+
+
+def test_tracker_state_survives_a_restart(tmp_path):
+    path = str(tmp_path / "wallets.db")
+    first = make_tracker(path)
+    try:
+        tracker = first.trackers["main"]
+        tracker.core.last_known_balance = 1.25
+        tracker.core.last_known_positions = POSITIONS
+        tracker.core.tx_cursor.advance("txlist", [{"blockNumber": "19000000"}])
+        first.save_state()
+    finally:
+        first.close()
+
+    second = make_tracker(path, warm_start=True)
+    try:
+        restored = second.trackers["main"].core
+        assert restored.last_known_balance == 1.25
+        assert restored.last_known_positions == compact_positions(POSITIONS)
+        assert restored.tx_cursor.to_dict() == {"txlist": 19000000}
+
+        sent = {}
+        second.notification_gateway.send_initial_summary = \
+            lambda wallet_id, summary, use_async=False: sent.setdefault(wallet_id, summary)
+        assert second.send_snapshot_summaries() == []
+        assert sent["main"]["eth_balance"] == 1.25
+        assert sent["main"]["wallet_address"] == ADDRESS
+    finally:
+        second.close()
+
+
+def test_snapshot_of_a_changed_address_is_ignored(tmp_path):
+    path = str(tmp_path / "wallets.db")
+    SQLiteStateStore(path).save_many({"main": snapshot(3.0)})
+
+    tracker = make_tracker(path, warm_start=True, address="0x" + "cd" * 20)
+    try:
+        assert tracker.snapshots == {}
+        assert tracker.trackers["main"].core.last_known_balance is None
+        assert tracker.send_snapshot_summaries() == ["main"]
+    finally:
+        tracker.close()
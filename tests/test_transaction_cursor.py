@@ -0,0 +1,89 @@
+import time
+
+from constants import ETHERSCAN_ACTION_TOKENTX, ETHERSCAN_ACTION_TXLIST
+from transaction_cursor import EMPTY_HISTORY_BLOCK, TransactionCursor, filter_deposit_withdrawal
+
+WALLET = "0x" + "a" * 40
+OTHER = "0x" + "b" * 40
+
+
+def rows(*blocks):
+    return [{"blockNumber": str(block)} for block in blocks]
+
+
+def test_untracked_cursor_starts_at_block_zero():
+    cursor = TransactionCursor()
+    assert not cursor.is_tracking(ETHERSCAN_ACTION_TXLIST)
+    assert cursor.next_start_block(ETHERSCAN_ACTION_TXLIST) == 0
+
+
+def test_advance_moves_to_highest_block_and_never_back():
+    cursor = TransactionCursor()
+    cursor.advance(ETHERSCAN_ACTION_TXLIST, rows(5, 12, 7))
+    assert cursor.next_start_block(ETHERSCAN_ACTION_TXLIST) == 13
+
+    cursor.advance(ETHERSCAN_ACTION_TXLIST, rows(3))
+    cursor.advance(ETHERSCAN_ACTION_TXLIST, [])
+    assert cursor.next_start_block(ETHERSCAN_ACTION_TXLIST) == 13
+
+
+def test_advance_skips_unparseable_block_numbers():
+    cursor = TransactionCursor()
+    cursor.advance(ETHERSCAN_ACTION_TXLIST, [{"blockNumber": "x"}, {"blockNumber": None}, {"blockNumber": "4"}])
+    assert cursor.to_dict() == {ETHERSCAN_ACTION_TXLIST: 4}
+
+
+def test_seed_only_initializes_once_per_action():
+    cursor = TransactionCursor()
+    cursor.seed(ETHERSCAN_ACTION_TXLIST, rows(10))
+    cursor.seed(ETHERSCAN_ACTION_TXLIST, rows(20))
+    cursor.seed(ETHERSCAN_ACTION_TOKENTX, rows(3))
+    assert cursor.to_dict() == {ETHERSCAN_ACTION_TXLIST: 10, ETHERSCAN_ACTION_TOKENTX: 3}
+
+
+def test_seed_marks_empty_history_as_tracking():
+    cursor = TransactionCursor()
+    cursor.seed(ETHERSCAN_ACTION_TXLIST, [])
+    assert cursor.is_tracking(ETHERSCAN_ACTION_TXLIST)
+    assert cursor.to_dict() == {ETHERSCAN_ACTION_TXLIST: EMPTY_HISTORY_BLOCK}
+    assert cursor.next_start_block(ETHERSCAN_ACTION_TXLIST) == 0
+
+    # The first transfer of a fresh wallet moves it like any other
+    cursor.advance(ETHERSCAN_ACTION_TXLIST, rows(8))
+    assert cursor.next_start_block(ETHERSCAN_ACTION_TXLIST) == 9
+
+
+def test_cursor_round_trips_through_dict():
+    cursor = TransactionCursor()
+    cursor.seed(ETHERSCAN_ACTION_TXLIST, rows(42))
+    cursor.seed(ETHERSCAN_ACTION_TOKENTX, [])
+    restored = TransactionCursor(cursor.to_dict())
+    assert restored.to_dict() == cursor.to_dict()
+    assert restored.is_tracking(ETHERSCAN_ACTION_TOKENTX)
+
+
+def test_filter_keeps_incremental_rows_regardless_of_age():
+    old = str(int(time.time()) - 10 ** 6)
+    eth = [
+        {"to": WALLET, "from": OTHER, "value": "1", "isError": "0", "timeStamp": old},
+        {"to": WALLET, "from": OTHER, "value": "0", "isError": "0", "timeStamp": old},
+        {"to": WALLET, "from": OTHER, "value": "1", "isError": "1", "timeStamp": old},
+        {"to": OTHER, "from": OTHER, "value": "1", "isError": "0", "timeStamp": old},
+    ]
+    tokens = [{"tokenSymbol": "USDC", "timeStamp": old}]
+
+    transfers = filter_deposit_withdrawal(WALLET, eth, True, tokens, True)
+    assert [tx["asset"] for tx in transfers] == ["ETH", "USDC"]
+
+
+def test_filter_first_read_only_keeps_recent_rows():
+    now = str(int(time.time()))
+    old = str(int(time.time()) - 10 ** 6)
+    eth = [
+        {"to": WALLET, "from": OTHER, "value": "1", "isError": "0", "timeStamp": now},
+        {"to": WALLET, "from": OTHER, "value": "1", "isError": "0", "timeStamp": old},
+    ]
+    tokens = [{"tokenSymbol": "WBTC", "timeStamp": old}]
+
+    transfers = filter_deposit_withdrawal(WALLET, eth, False, tokens, False)
+    assert [(tx["asset"], tx["timeStamp"]) for tx in transfers] == [("ETH", now)]
@@ -0,0 +1,188 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import pytest
+
+from wallet_registry import (
+    LazyWalletObjects,
+    WalletRegistry,
+    WalletRegistryError,
+    load_wallet_registry,
+    load_wallets_file,
+    parse_enabled,
+)
+
+ADDRESS_1 = "0x" + "1" * 40
+ADDRESS_2 = "0x" + "2" * 40
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_jsonl_rows_skip_blanks_and_comments(tmp_path):
+    path = write(tmp_path / "wallets.jsonl", "\n".join([
+        "# team wallets",
+        json.dumps({"id": "main", "address": ADDRESS_1, "name": "Main"}),
+        "",
+        json.dumps({"wallet_id": "cold", "address": ADDRESS_2, "enabled": "false"}),
+    ]))
+
+    registry = load_wallets_file(path)
+    assert list(registry) == ["main", "cold"]
+    assert registry["main"]["name"] == "Main"
+    assert registry["cold"]["name"] == "Wallet cold"
+    assert registry.enabled_ids() == ["main"]
+    assert registry.path == path
+
+
+def test_jsonl_reports_every_bad_line(tmp_path):
+    path = write(tmp_path / "wallets.jsonl", "\n".join([
+        "{not json",
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"id": "bad", "address": "0x123"}),
+        json.dumps({"id": "ok", "address": ADDRESS_1}),
+        json.dumps({"id": "ok", "address": ADDRESS_2}),
+    ]))
+
+    with pytest.raises(WalletRegistryError) as error:
+        load_wallets_file(path)
+    message = str(error.value)
+    assert "4 invalid wallet entries" in message
+    assert f"{path}:1: invalid JSON" in message
+    assert f"{path}:2: expected a JSON object" in message
+    assert "Invalid Ethereum address for wallet bad" in message
+    assert f"{path}:5: duplicate wallet ID ok" in message
+
+
+def test_csv_rows_are_trimmed_and_numbered_without_ids(tmp_path):
+    path = write(tmp_path / "wallets.csv", "\n".join([
+        "address, name ,enabled",
+        f" {ADDRESS_1} ,Trading,yes",
+        f"{ADDRESS_2},,0",
+    ]))
+
+    registry = load_wallets_file(path)
+    assert list(registry) == ["wallet_1", "wallet_2"]
+    assert registry["wallet_1"]["address"] == ADDRESS_1
+    assert registry["wallet_1"]["name"] == "Trading"
+    assert registry.enabled_ids() == ["wallet_1"]
+
+
+def test_csv_error_locations_count_the_header(tmp_path):
+    path = write(tmp_path / "wallets.csv", "id,address\nw1,nope\n")
+    with pytest.raises(WalletRegistryError, match=f"{path}:2"):
+        load_wallets_file(path)
+
+
+def test_sqlite_wallets_table(tmp_path):
+    path = str(tmp_path / "wallets.db")
+    with closing(sqlite3.connect(path)) as connection:
+        connection.execute("CREATE TABLE wallets (id INTEGER, address TEXT, enabled INTEGER)")
+        connection.executemany("INSERT INTO wallets VALUES (?, ?, ?)", [(1, ADDRESS_1, 1), (2, ADDRESS_2, 0)])
+        connection.commit()
+
+    registry = load_wallets_file(path)
+    assert list(registry) == ["1", "2"]
+    assert registry.enabled_ids() == ["1"]
+
+
+def test_unsupported_and_missing_files(tmp_path):
+    with pytest.raises(WalletRegistryError, match="Unsupported wallets file type"):
+        load_wallets_file(write(tmp_path / "wallets.txt", ""))
+    with pytest.raises(WalletRegistryError, match="not found"):
+        load_wallets_file(str(tmp_path / "missing.jsonl"))
+
+
+def test_environment_sources_in_priority_order(tmp_path):
+    path = write(tmp_path / "wallets.jsonl", json.dumps({"id": "file", "address": ADDRESS_1}))
+    environ = {
+        "WALLETS_FILE": path,
+        "WALLETS_JSON": json.dumps({"json": {"address": ADDRESS_1}}),
+        "WALLET_2_ADDRESS": ADDRESS_2,
+        "WALLET_2_NAME": "Second",
+    }
+    assert list(load_wallet_registry(environ)) == ["file"]
+
+    del environ["WALLETS_FILE"]
+    assert list(load_wallet_registry(environ)) == ["json"]
+
+    del environ["WALLETS_JSON"]
+    registry = load_wallet_registry(environ)
+    assert list(registry) == ["wallet_2"]
+    assert registry["wallet_2"]["name"] == "Second"
+
+
+@pytest.mark.parametrize("value, enabled", [
+    (None, True), ("", True), (True, True), ("on", True), ("1", True),
+    (False, False), ("false", False), ("0", False), ("no", False),
+])
+def test_parse_enabled(value, enabled):
+    assert parse_enabled(value) is enabled
+
+
+def test_registry_indexes_follow_updates():
+    registry = WalletRegistry([("a", {"address": ADDRESS_1, "enabled": True})])
+    assert registry.get_by_address(ADDRESS_1)[0] == "a"
+
+    assert registry.upsert("a", {"address": ADDRESS_2, "enabled": False})
+    assert registry.wallet_ids_for_address(ADDRESS_1) == []
+    assert registry.wallet_ids_for_address(ADDRESS_2) == ["a"]
+    assert registry.enabled_ids() == []
+
+    other = WalletRegistry([("b", {"address": ADDRESS_1, "enabled": True})])
+    assert registry.apply(other) == (["b"], ["a"], [])
+    assert list(registry) == ["b"]
+
+
+def test_lazy_objects_build_on_first_access_only():
+    registry = WalletRegistry([
+        ("a", {"address": ADDRESS_1, "enabled": True}),
+        ("off", {"address": ADDRESS_2, "enabled": False}),
+    ])
+    built = []
+    lazy = LazyWalletObjects(registry, lambda wallet_id, config: built.append(wallet_id) or wallet_id, "tracker")
+
+    assert list(lazy) == ["a"] and "a" in lazy and "off" not in lazy
+    assert built == []
+    assert lazy["a"] == "a" and lazy["a"] == "a"
+    assert built == ["a"]
+    with pytest.raises(KeyError):
+        lazy["off"]
+
+
+def test_lazy_objects_drop_wallets_that_fail_to_build():
+    registry = WalletRegistry([("a", {"address": ADDRESS_1, "enabled": True})])
+
+    def factory(wallet_id, config):
+        raise ValueError("boom")
+
+    lazy = LazyWalletObjects(registry, factory, "tracker")
+    with pytest.raises(KeyError):
+        lazy["a"]
+    assert "a" not in lazy and list(lazy) == []
+
+
+def test_lazy_objects_build_once_under_concurrent_access():
+    registry = WalletRegistry([("a", {"address": ADDRESS_1, "enabled": True})])
+    built = []
+
+    def factory(wallet_id, config):
+        time.sleep(0.02)
+        built.append(wallet_id)
+        return object()
+
+    lazy = LazyWalletObjects(registry, factory, "tracker")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(lazy["a"])) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert built == ["a"]
+    assert len({id(result) for result in results}) == 1
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Transaction Cursor - Per-wallet block cursor for incremental Etherscan polling
+"""
+
+import time
+from typing import Dict, List, Optional
+
+from constants import DEFAULT_CHECK_INTERVAL
+
+# Cursor position of a wallet whose history was empty when seeded: every block is new
+EMPTY_HISTORY_BLOCK = -1
+
+
+class TransactionCursor:
+    """Remembers the highest block seen per Etherscan action for a single wallet"""
+
+    def __init__(self, blocks: Optional[Dict[str, int]] = None):
+        self.blocks = dict(blocks or {})
+
+    def is_tracking(self, action: str) -> bool:
+        """Check if a cursor position exists for the action"""
+        return action in self.blocks
+
+    def next_start_block(self, action: str) -> int:
+        """First block that has not been seen yet for the action"""
+        return self.blocks.get(action, EMPTY_HISTORY_BLOCK) + 1
+
+    def advance(self, action: str, transactions: List[Dict]):
+        """Move the cursor to the highest block number in transactions"""
+        highest = self._highest_block(transactions)
+        if highest is not None and highest >= self.blocks.get(action, EMPTY_HISTORY_BLOCK):
+            self.blocks[action] = highest
+
+    def seed(self, action: str, transactions: List[Dict]):
+        """
+        Initialize the cursor from a successful recent-transactions read if not tracking yet.
+
+        An empty history is seeded too, with EMPTY_HISTORY_BLOCK, so the wallet's
+        first transfer is read incrementally instead of by the time-window heuristic.
+        """
+        if self.is_tracking(action):
+            return
+        highest = self._highest_block(transactions)
+        self.blocks[action] = EMPTY_HISTORY_BLOCK if highest is None else highest
+
+    def to_dict(self) -> Dict[str, int]:
+        """Export cursor positions for persistence"""
+        return dict(self.blocks)
+
+    @staticmethod
+    def _highest_block(transactions: List[Dict]) -> Optional[int]:
+        """Highest blockNumber in an Etherscan result list"""
+        highest = None
+        for tx in transactions:
+            try:
+                block = int(tx.get("blockNumber", 0))
+            except (TypeError, ValueError):
+                continue
+            if highest is None or block > highest:
+                highest = block
+        return highest
+
+
+def filter_deposit_withdrawal(wallet_address: str,
+                              eth_transactions: List[Dict], eth_incremental: bool,
+                              token_transfers: List[Dict], token_incremental: bool) -> List[Dict]:
+    """
+    Pick the deposit/withdrawal transfers out of txlist and tokentx results.
+
+    Cursor (incremental) reads are new by construction; first reads only keep
+    rows inside the last check interval. Each kept row gets an "asset" key.
+    """
+    address = wallet_address.lower()
+    current_time = int(time.time())
+    transfers = []
+
+    # Check ETH transfers
+    for tx in eth_transactions:
+        # Check if it's a simple ETH transfer (not contract interaction)
+        if (tx.get("to") == address or tx.get("from") == address) and \
+           tx.get("isError", "0") == "0" and \
+           float(tx.get("value", 0)) > 0:  # Has ETH value
+
+            tx_time = int(tx.get("timeStamp", 0))
+            if eth_incremental or current_time - tx_time <= DEFAULT_CHECK_INTERVAL:
+                tx["asset"] = "ETH"
+                transfers.append(tx)
+
+    # Check token transfers (including BTC and other ERC-20 tokens)
+    for tx in token_transfers:
+        tx_time = int(tx.get("timeStamp", 0))
+        if token_incremental or current_time - tx_time <= DEFAULT_CHECK_INTERVAL:
+            tx["asset"] = tx.get("tokenSymbol", "Unknown")
+            transfers.append(tx)
+
+    return transfers
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Wallet Registry - Wallet configuration loaded in one pass from a file, SQLite or the environment
+"""
+
+import os
+import re
+import threading
+from collections.abc import Mapping
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from constants import (
+    # Validation patterns
+    ETH_ADDRESS_PATTERN,
+    MAX_WALLET_COUNT,
+
+    # Wallet registry
+    WALLET_REGISTRY_JSONL_EXTENSIONS,
+    WALLET_REGISTRY_CSV_EXTENSIONS,
+    WALLET_REGISTRY_SQLITE_EXTENSIONS,
+    WALLET_REGISTRY_TABLE
+)
+
+# Per-wallet settings kept from a registry row
+WALLET_FIELDS = ("address", "name", "enabled", "telegram_chat_id", "email_recipient")
+
+# Errors listed in full before the rest are only counted
+MAX_REPORTED_ERRORS = 10
+
+_ADDRESS_RE = re.compile(ETH_ADDRESS_PATTERN)
+_ENV_WALLET_RE = re.compile(r"^WALLET_(\d+)_ADDRESS$")
+
+
+class WalletRegistryError(Exception):
+    """Wallet registry related errors"""
+    pass
+
+
+def parse_enabled(value: Any) -> bool:
+    """Read an enabled flag from JSON, CSV, SQLite or env values; missing means enabled"""
+    if isinstance(value, bool):
+        return value
+    if value is None or str(value).strip() == "":
+        return True
+    return str(value).strip().lower() in ("true", "1", "yes", "on")
+
+
+def normalize_wallet(wallet_id: str, data: Dict[str, Any], default_name: str) -> Dict[str, Any]:
+    """Validate one registry row and return its wallet config"""
+    address = (data.get("address") or "").strip()
+    if not _ADDRESS_RE.match(address):
+        raise WalletRegistryError(f"Invalid Ethereum address for wallet {wallet_id}: {address}")
+
+    return {
+        "address": address,
+        "name": data.get("name") or default_name,
+        "enabled": parse_enabled(data.get("enabled")),
+        "telegram_chat_id": data.get("telegram_chat_id") or None,
+        "email_recipient": data.get("email_recipient") or None
+    }
+
+
+class WalletRegistry(Mapping):
+    """
+    Wallet configs keyed by wallet ID, indexed by address.
+
+    Behaves like the plain {wallet_id: config} dict it replaces; upsert() and
+    remove() keep the indexes current so updates cost O(changes), not O(wallets).
+    """
+
+    def __init__(self, wallets: Optional[Iterable[Tuple[str, Dict[str, Any]]]] = None, source: str = "env",
+                 path: Optional[str] = None):
+        self.source = source
+        # File the registry was loaded from, watched for hot reloads
+        self.path = path
+        self._wallets: Dict[str, Dict[str, Any]] = {}
+        self._ids_by_address: Dict[str, List[str]] = {}
+        self._enabled_ids: Dict[str, None] = {}
+        for wallet_id, wallet_config in wallets or ():
+            self.upsert(wallet_id, wallet_config)
+
+    def __getitem__(self, wallet_id: str) -> Dict[str, Any]:
+        return self._wallets[wallet_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._wallets)
+
+    def __len__(self) -> int:
+        return len(self._wallets)
+
+    def __contains__(self, wallet_id) -> bool:
+        return wallet_id in self._wallets
+
+    def enabled_ids(self) -> List[str]:
+        """IDs of enabled wallets in registry order"""
+        return list(self._enabled_ids)
+
+    def is_enabled(self, wallet_id: str) -> bool:
+        """Check if a wallet is registered and enabled"""
+        return wallet_id in self._enabled_ids
+
+    def wallet_ids_for_address(self, address: str) -> List[str]:
+        """IDs of every wallet watching an address"""
+        return list(self._ids_by_address.get(address.lower(), ()))
+
+    def get_by_address(self, address: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(wallet_id, config) of the first wallet watching an address"""
+        wallet_ids = self._ids_by_address.get(address.lower())
+        if not wallet_ids:
+            return None
+        return wallet_ids[0], self._wallets[wallet_ids[0]]
+
+    def upsert(self, wallet_id: str, wallet_config: Dict[str, Any]) -> bool:
+        """Add or replace a wallet; return False if it was already registered unchanged"""
+        previous = self._wallets.get(wallet_id)
+        if previous == wallet_config:
+            return False
+        if previous is not None:
+            self._unindex_address(wallet_id, previous)
+
+        self._wallets[wallet_id] = wallet_config
+        self._ids_by_address.setdefault(wallet_config["address"].lower(), []).append(wallet_id)
+        # Edited wallets keep their place in the check order
+        if wallet_config.get("enabled", True):
+            self._enabled_ids.setdefault(wallet_id, None)
+        else:
+            self._enabled_ids.pop(wallet_id, None)
+        return True
+
+    def remove(self, wallet_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a wallet and return its config, if it was registered"""
+        wallet_config = self._wallets.pop(wallet_id, None)
+        if wallet_config is not None:
+            self._unindex_address(wallet_id, wallet_config)
+            self._enabled_ids.pop(wallet_id, None)
+        return wallet_config
+
+    def _unindex_address(self, wallet_id: str, wallet_config: Dict[str, Any]):
+        address = wallet_config["address"].lower()
+        wallet_ids = self._ids_by_address.get(address, [])
+        if wallet_id in wallet_ids:
+            wallet_ids.remove(wallet_id)
+        if not wallet_ids:
+            self._ids_by_address.pop(address, None)
+
+    def diff(self, other: Mapping) -> Tuple[List[str], List[str], List[str]]:
+        """(added, removed, changed) wallet IDs going from this registry to other"""
+        added = [wallet_id for wallet_id in other if wallet_id not in self._wallets]
+        removed = [wallet_id for wallet_id in self._wallets if wallet_id not in other]
+        changed = [
+            wallet_id for wallet_id in other
+            if wallet_id in self._wallets and self._wallets[wallet_id] != other[wallet_id]
+        ]
+        return added, removed, changed
+
+    def apply(self, other: Mapping) -> Tuple[List[str], List[str], List[str]]:
+        """Update this registry in place to match other, touching only the wallets that differ"""
+        added, removed, changed = self.diff(other)
+        for wallet_id in removed:
+            self.remove(wallet_id)
+        for wallet_id in added + changed:
+            self.upsert(wallet_id, other[wallet_id])
+        return added, removed, changed
+
+
+def as_registry(wallets: Mapping) -> WalletRegistry:
+    """Wrap a plain {wallet_id: config} dict so callers can rely on the registry interface"""
+    if isinstance(wallets, WalletRegistry):
+        return wallets
+    return WalletRegistry(wallets.items(), source="config")
+
+
+class LazyWalletObjects(Mapping):
+    """
+    Per-wallet objects (trackers, notification systems) built on first access.
+
+    Keys are the registry's enabled wallet IDs, so iterating or checking
+    membership never builds anything. A wallet whose object fails to build is
+    logged once and dropped, as it was when everything was built up front.
+    Construction is serialized, so worker threads asking for the same wallet
+    at once get one object.
+    """
+
+    def __init__(self, registry: WalletRegistry, factory: Callable[[str, Dict[str, Any]], Any], label: str):
+        self._registry = registry
+        self._factory = factory
+        self._label = label
+        self._objects: Dict[str, Any] = {}
+        self._failed = set()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, wallet_id: str) -> Any:
+        wallet_object = self._objects.get(wallet_id)
+        if wallet_object is not None:
+            return wallet_object
+
+        with self._lock:
+            # Another thread may have built it while we waited
+            if wallet_id in self._objects:
+                return self._objects[wallet_id]
+            if wallet_id in self._failed or not self._registry.is_enabled(wallet_id):
+                raise KeyError(wallet_id)
+
+            try:
+                wallet_object = self._factory(wallet_id, self._registry[wallet_id])
+            except Exception as e:
+                print(f"❌ Failed to initialize {self._label} for wallet {wallet_id}: {e}")
+                self._failed.add(wallet_id)
+                raise KeyError(wallet_id)
+
+            self._objects[wallet_id] = wallet_object
+            return wallet_object
+
+    def __iter__(self) -> Iterator[str]:
+        return (wallet_id for wallet_id in self._registry.enabled_ids() if wallet_id not in self._failed)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, wallet_id) -> bool:
+        return self._registry.is_enabled(wallet_id) and wallet_id not in self._failed
+
+    def built(self) -> Dict[str, Any]:
+        """Objects built so far, without building the rest"""
+        return dict(self._objects)
+
+    def discard(self, wallet_id: str):
+        """Drop a built object so the next access rebuilds it from the registry"""
+        with self._lock:
+            self._objects.pop(wallet_id, None)
+            self._failed.discard(wallet_id)
+
+
+def _iter_jsonl_rows(path: str) -> Iterator[Tuple[str, Optional[str], Dict[str, Any]]]:
+    """Stream (location, wallet_id, row) from a JSON-lines file"""
+    import json
+
+    with open(path, encoding="utf-8") as wallets_file:
+        for line_number, line in enumerate(wallets_file, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            location = f"{path}:{line_number}"
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield location, None, {"_error": f"invalid JSON ({e})"}
+                continue
+            if not isinstance(row, dict):
+                yield location, None, {"_error": "expected a JSON object"}
+                continue
+            yield location, row.get("id") or row.get("wallet_id"), row
+
+
+def _iter_csv_rows(path: str) -> Iterator[Tuple[str, Optional[str], Dict[str, Any]]]:
+    """Stream (location, wallet_id, row) from a CSV file with a header row"""
+    import csv
+
+    with open(path, encoding="utf-8", newline="") as wallets_file:
+        # Line 1 is the header
+        for line_number, row in enumerate(csv.DictReader(wallets_file), 2):
+            row = {key.strip(): (value or "").strip() for key, value in row.items() if key}
+            yield f"{path}:{line_number}", row.get("id") or row.get("wallet_id"), row
+
+
+def _iter_sqlite_rows(path: str) -> Iterator[Tuple[str, Optional[str], Dict[str, Any]]]:
+    """Stream (location, wallet_id, row) from the wallets table of a SQLite database"""
+    import sqlite3
+    from contextlib import closing
+
+    try:
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    except sqlite3.Error as e:
+        raise WalletRegistryError(f"Cannot open wallet database {path}: {e}")
+
+    with closing(connection):
+        connection.row_factory = sqlite3.Row
+        try:
+            cursor = connection.execute(f"SELECT * FROM {WALLET_REGISTRY_TABLE}")
+        except sqlite3.Error as e:
+            raise WalletRegistryError(f"Cannot read table {WALLET_REGISTRY_TABLE} from {path}: {e}")
+        for row_number, row in enumerate(cursor, 1):
+            row = dict(row)
+            wallet_id = row.get("id") or row.get("wallet_id")
+            yield f"{path} row {row_number}", str(wallet_id) if wallet_id is not None else None, row
+
+
+def _iter_json_rows(wallets_json: str) -> Iterator[Tuple[str, Optional[str], Dict[str, Any]]]:
+    """(location, wallet_id, row) from the WALLETS_JSON object"""
+    import json
+
+    try:
+        raw_wallets = json.loads(wallets_json)
+    except ValueError as e:
+        raise WalletRegistryError(f"Invalid JSON in WALLETS_JSON: {e}")
+    if not isinstance(raw_wallets, dict):
+        raise WalletRegistryError("WALLETS_JSON must be an object keyed by wallet ID")
+
+    for wallet_id, row in raw_wallets.items():
+        # Non-object entries were always skipped
+        if isinstance(row, dict):
+            yield f"WALLETS_JSON[{wallet_id}]", wallet_id, row
+
+
+def _iter_env_rows(environ: Mapping) -> Iterator[Tuple[str, Optional[str], Dict[str, Any]]]:
+    """(location, wallet_id, row) from WALLET_<n>_* variables, found in one pass over the environment"""
+    numbers = sorted(
+        int(match.group(1))
+        for match in (_ENV_WALLET_RE.match(key) for key in environ)
+        if match and environ[match.group(0)]
+    )
+    for number in numbers:
+        prefix = f"WALLET_{number}_"
+        yield f"{prefix}ADDRESS", f"wallet_{number}", {
+            "address": environ.get(f"{prefix}ADDRESS", ""),
+            "name": environ.get(f"{prefix}NAME") or f"Wallet {number}",
+            "enabled": environ.get(f"{prefix}ENABLED", "true"),
+            "telegram_chat_id": environ.get(f"{prefix}TELEGRAM_CHAT_ID"),
+            "email_recipient": environ.get(f"{prefix}EMAIL_RECIPIENT")
+        }
+
+
+def build_registry(rows: Iterable[Tuple[str, Optional[str], Dict[str, Any]]], source: str) -> WalletRegistry:
+    """
+    Validate rows in a single pass and build the registry.
+
+    Every bad row is collected so one load reports all problems at once;
+    rows without an ID are numbered in file order.
+    """
+    registry = WalletRegistry(source=source)
+    errors = []
+
+    for row_number, (location, wallet_id, row) in enumerate(rows, 1):
+        if "_error" in row:
+            errors.append(f"{location}: {row['_error']}")
+            continue
+
+        wallet_id = str(wallet_id) if wallet_id else f"wallet_{row_number}"
+        if wallet_id in registry:
+            errors.append(f"{location}: duplicate wallet ID {wallet_id}")
+            continue
+
+        try:
+            registry.upsert(wallet_id, normalize_wallet(wallet_id, row, f"Wallet {wallet_id}"))
+        except WalletRegistryError as e:
+            errors.append(f"{location}: {e}")
+
+    if errors:
+        shown = "\n  ".join(errors[:MAX_REPORTED_ERRORS])
+        more = f"\n  ... and {len(errors) - MAX_REPORTED_ERRORS} more" if len(errors) > MAX_REPORTED_ERRORS else ""
+        raise WalletRegistryError(f"{len(errors)} invalid wallet entr{'y' if len(errors) == 1 else 'ies'} in {source}:\n  {shown}{more}")
+
+    if len(registry) > MAX_WALLET_COUNT:
+        raise WalletRegistryError(f"{source} has {len(registry)} wallets; the maximum is {MAX_WALLET_COUNT}")
+
+    return registry
+
+
+def load_wallets_file(path: str) -> WalletRegistry:
+    """Load a registry from a JSONL, CSV or SQLite file, chosen by extension"""
+    if not os.path.isfile(path):
+        raise WalletRegistryError(f"Wallets file not found: {path}")
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension in WALLET_REGISTRY_JSONL_EXTENSIONS:
+        rows = _iter_jsonl_rows(path)
+    elif extension in WALLET_REGISTRY_CSV_EXTENSIONS:
+        rows = _iter_csv_rows(path)
+    elif extension in WALLET_REGISTRY_SQLITE_EXTENSIONS:
+        rows = _iter_sqlite_rows(path)
+    else:
+        supported = WALLET_REGISTRY_JSONL_EXTENSIONS + WALLET_REGISTRY_CSV_EXTENSIONS + WALLET_REGISTRY_SQLITE_EXTENSIONS
+        raise WalletRegistryError(f"Unsupported wallets file type {extension or path}; use one of {', '.join(supported)}")
+
+    try:
+        registry = build_registry(rows, path)
+    except OSError as e:
+        raise WalletRegistryError(f"Cannot read wallets file {path}: {e}")
+    registry.path = path
+    return registry
+
+
+class RegistryWatcher:
+    """
+    Notices wallet registry changes between cycles.
+
+    A change is a new mtime on the watched file (WALLETS_FILE or .env) or an
+    explicit request, e.g. from a SIGHUP handler. Polling is one stat() call.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or None
+        self._mtime = self._read_mtime()
+        self._requested = False
+
+    def _read_mtime(self) -> Optional[int]:
+        if not self.path:
+            return None
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def request(self):
+        """Ask for a reload on the next poll; only sets a flag, so it is safe in signal handlers"""
+        self._requested = True
+
+    def poll(self) -> bool:
+        """Return True once for each change since the last poll"""
+        changed = self._requested
+        self._requested = False
+        mtime = self._read_mtime()
+        if mtime != self._mtime:
+            self._mtime = mtime
+            changed = True
+        return changed
+
+
+def load_wallet_registry(environ: Mapping = os.environ) -> WalletRegistry:
+    """Load wallets from WALLETS_FILE, else WALLETS_JSON, else WALLET_<n>_* variables"""
+    wallets_file = environ.get("WALLETS_FILE", "")
+    if wallets_file:
+        return load_wallets_file(wallets_file)
+
+    wallets_json = environ.get("WALLETS_JSON", "")
+    if wallets_json:
+        registry = build_registry(_iter_json_rows(wallets_json), "WALLETS_JSON")
+        if registry:
+            return registry
+
+    return build_registry(_iter_env_rows(environ), "environment")
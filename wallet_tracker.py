@@ -1,25 +1,21 @@
-import json
-from datetime import datetime
-import time
-from typing import Dict, List, Optional, Tuple
+#!/usr/bin/env python3
+"""
+Wallet Tracker - Blocking facade that runs the async tracking core on a background event loop
+"""
+
+import asyncio
+import atexit
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 # Import centralized constants
 from constants import (
-    # Business rules
-    SIGNIFICANT_BALANCE_CHANGE,
-    POSITION_CHANGE_PERCENTAGE,
-    DEFAULT_CHECK_INTERVAL,
-
-    # API URLs
-    HYPERLIQUID_API_URL,
-
-    # Default values
-    DEFAULT_TIMEOUT_SECONDS
+    # Incremental transaction polling
+    ETHERSCAN_ACTION_TXLIST,
+    ETHERSCAN_ACTION_TOKENTX
 )
 
-# Import API service for external calls
-from api_service import APIService, APIError
-
 class WalletTrackerError(Exception):
     """Wallet tracker related errors"""
     pass
@@ -28,289 +24,200 @@ class APIError(WalletTrackerError):
     """API related errors"""
     pass
 
+class _CoreLoop:
+    """
+    Background event loop that runs the async tracker core for blocking callers.
+
+    Every facade shares the loop and its pooled session, so sync checks reuse
+    connections across wallets and cycles exactly like the async path.
+    Coroutines from several threads run on it concurrently. Owners such as
+    MultiWalletTracker hold a reference; the loop stops when the last one
+    releases it, or at process exit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session = None
+        self._users = 0
+        self._atexit_registered = False
+
+    def _running_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread on first use (or after close)"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="wallet-tracker-core", daemon=True)
+                self._thread.start()
+                if not self._atexit_registered:
+                    atexit.register(self.close)
+                    self._atexit_registered = True
+            return self._loop
+
+    def acquire(self):
+        """Hold the loop open until the matching release()"""
+        with self._lock:
+            self._users += 1
+
+    def release(self):
+        """Drop a reference; the last one closes the session and stops the loop"""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            last = self._users == 0
+        if last:
+            self.close()
+
+    def run(self, coro) -> Any:
+        """Run a coroutine on the loop and block until it finishes"""
+        return asyncio.run_coroutine_threadsafe(coro, self._running_loop()).result()
+
+    async def get_session(self):
+        """The shared pooled session; only called on the loop"""
+        if self._session is None or self._session.closed:
+            from async_wallet_tracker import create_pooled_session
+            self._session = create_pooled_session()
+        return self._session
+
+    async def _close_session(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def close(self):
+        """Close the session and stop the loop; the next call starts a new one"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        # At interpreter exit the daemon loop thread can no longer run, so there is nothing to wait for
+        if loop is None or sys.is_finalizing():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_session(), loop).result()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+_core_loop = _CoreLoop()
+
+def acquire_core_loop():
+    """Keep the background loop used by WalletTracker running until release_core_loop()"""
+    _core_loop.acquire()
+
+def release_core_loop():
+    """Release a reference taken with acquire_core_loop(); the last one stops the loop"""
+    _core_loop.release()
+
+def close_core_loop():
+    """Close the pooled session and stop the background loop used by WalletTracker, whoever still uses it"""
+    _core_loop.close()
+
+def get_eth_balances(wallet_addresses: List[str], key_pool) -> Dict[str, float]:
+    """Batched balancemulti lookup through the async core on an ApiKeyPool, keyed by lowercase address"""
+    from async_wallet_tracker import fetch_eth_balances
+
+    async def fetch():
+        return await fetch_eth_balances(await _core_loop.get_session(), key_pool, wallet_addresses)
+
+    return _core_loop.run(fetch())
+
 class WalletTracker:
-    def __init__(self, wallet_address: str, etherscan_api_key: str):
+    """
+    Blocking facade over the async tracker core (AsyncWalletTracker).
+
+    Fetching and change detection live in the core; each call here runs it
+    on the shared background loop and waits for the result. State
+    (last known balance/positions, block cursor) is the core's.
+    """
+
+    def __init__(self, wallet_address: str, etherscan_api_key: str, key_pool=None):
+        # aiohttp is only imported once a tracker is actually built
+        from async_wallet_tracker import AsyncWalletTracker
         self.wallet_address = wallet_address
         self.etherscan_api_key = etherscan_api_key
-        self.last_known_balance = None
-        self.last_known_positions = None
-        # Initialize API service
-        self.api_service = APIService(etherscan_api_key)
-        
+        # Without a pool the core uses a process-wide one for this single key
+        self.core = AsyncWalletTracker(wallet_address, etherscan_api_key, key_pool=key_pool)
+
+    def _run(self, method, *args) -> Any:
+        """Call a core coroutine method on the background loop with the shared session attached"""
+        async def call():
+            self.core.attach_session(await _core_loop.get_session())
+            return await method(*args)
+        return _core_loop.run(call())
+
+    @property
+    def last_known_balance(self) -> Optional[float]:
+        return self.core.last_known_balance
+
+    @last_known_balance.setter
+    def last_known_balance(self, value: Optional[float]):
+        self.core.last_known_balance = value
+
+    @property
+    def last_known_positions(self) -> Optional[Dict]:
+        return self.core.last_known_positions
+
+    @last_known_positions.setter
+    def last_known_positions(self, value: Optional[Dict]):
+        self.core.last_known_positions = value
+
+    @property
+    def tx_cursor(self):
+        return self.core.tx_cursor
+
+    @tx_cursor.setter
+    def tx_cursor(self, value):
+        self.core.tx_cursor = value
+
+    def export_state(self) -> Dict:
+        """Compact snapshot of the change-detection state for the state store"""
+        return self.core.export_state()
+
+    def restore_state(self, snapshot: Dict):
+        """Resume change detection from a saved snapshot"""
+        self.core.restore_state(snapshot)
+
     def get_eth_balance(self) -> Optional[float]:
-        """Get current ETH balance using API service"""
-        return self.api_service.get_eth_balance(self.wallet_address)
-    
+        """Get current ETH balance (V2 with V1 fallback)"""
+        return self._run(self.core.get_eth_balance_async)
+
     def get_token_transfers(self, limit: int = 100) -> List[Dict]:
-        """Get recent token transfers using API service"""
-        return self.api_service.get_token_transfers(self.wallet_address, limit)
-    
+        """Get the latest token transfers (one server-side page) and seed the block cursor"""
+        return self._run(self.core.get_recent_transactions_async, ETHERSCAN_ACTION_TOKENTX, limit)
+
     def get_normal_transactions(self, limit: int = 100) -> List[Dict]:
-        """Get recent normal transactions using API service"""
-        return self.api_service.get_normal_transactions(self.wallet_address, limit)
-    
-    def check_deposit_withdrawal(self) -> Tuple[bool, List[Dict]]:
-        """Check for new deposit or withdrawal transactions (ETH and tokens)"""
-        try:
-            # Get recent transactions and token transfers
-            recent_eth_txs = self.get_normal_transactions(5)
-            recent_token_txs = self.get_token_transfers(10)
-
-            all_transfers = []
-            current_time = int(time.time())
-
-            # Check ETH transfers
-            for tx in recent_eth_txs:
-                # Check if it's a simple ETH transfer (not contract interaction)
-                if (tx.get("to") == self.wallet_address.lower() or
-                    tx.get("from") == self.wallet_address.lower()) and \
-                   tx.get("isError", "0") == "0" and \
-                   float(tx.get("value", 0)) > 0:  # Has ETH value
-
-                    tx_time = int(tx.get("timeStamp", 0))
-
-                    # Check if transaction is within last check interval
-                    if current_time - tx_time <= DEFAULT_CHECK_INTERVAL:
-                        tx["asset"] = "ETH"
-                        all_transfers.append(tx)
-
-            # Check token transfers (including BTC and other ERC-20 tokens)
-            for tx in recent_token_txs:
-                tx_time = int(tx.get("timeStamp", 0))
-
-                # Check if transaction is within last check interval
-                if current_time - tx_time <= DEFAULT_CHECK_INTERVAL:
-                    tx["asset"] = tx.get("tokenSymbol", "Unknown")
-                    all_transfers.append(tx)
-
-            if all_transfers:
-                return True, all_transfers
-            return False, []
-
-        except (ValueError, TypeError, KeyError) as e:
-            print(f"Error checking deposits/withdrawals: {e}")
-            return False, []
-    
+        """Get the latest normal transactions (one server-side page) and seed the block cursor"""
+        return self._run(self.core.get_recent_transactions_async, ETHERSCAN_ACTION_TXLIST, limit)
+
+    def get_new_transactions(self, action: str) -> List[Dict]:
+        """Get transactions in blocks after the cursor for txlist/tokentx, oldest first"""
+        return self._run(self.core.get_new_transactions_async, action)
+
     def get_hyperliquid_positions(self) -> Optional[Dict]:
-        """Get Hyperliquid perpetual positions using API service"""
-        return self.api_service.get_hyperliquid_positions(self.wallet_address)
-    
-    def check_balance_change(self) -> Tuple[bool, float, float]:
-        """Check if balance has changed significantly"""
-        current_balance = self.get_eth_balance()
-        if current_balance is None:
-            return False, 0, 0
-
-        if self.last_known_balance is None:
-            self.last_known_balance = current_balance
-            return False, current_balance, 0
-
-        change = abs(current_balance - self.last_known_balance)
-        if change > SIGNIFICANT_BALANCE_CHANGE:  # Significant change threshold
-            significant_change = True
-        else:
-            significant_change = False
-
-        self.last_known_balance = current_balance
-        return significant_change, current_balance, change
-    
+        """Get Hyperliquid perpetual positions"""
+        return self._run(self.core.get_hyperliquid_positions_async)
+
+    def check_balance_change(self, current_balance: Optional[float] = None) -> Tuple[bool, float, float]:
+        """Check if balance has changed significantly; current_balance may come from a batched lookup"""
+        return self._run(self.core.check_balance_change, current_balance)
+
     def check_position_changes(self) -> Tuple[bool, Dict, str]:
         """Check if positions have opened, closed, or significantly changed"""
-        current_positions = self.get_hyperliquid_positions()
-        if current_positions is None:
-            return False, {}, "position_data_unavailable"
-
-        if self.last_known_positions is None:
-            self.last_known_positions = current_positions
-            # Check if there are any active positions on first run
-            asset_positions = current_positions.get("assetPositions", [])
-            has_active_positions = any(
-                pos.get("position", {}).get("szi", 0) != 0
-                for pos in asset_positions
-            )
-            return has_active_positions, current_positions, "position_summary"
-
-        # Extract current and previous positions
-        current_asset_positions = current_positions.get("assetPositions", [])
-        previous_asset_positions = self.last_known_positions.get("assetPositions", [])
-
-        # Create dictionaries of positions by coin for easier comparison
-        current_pos_dict = {}
-        previous_pos_dict = {}
-
-        for pos in current_asset_positions:
-            if "position" in pos and pos["position"]:
-                coin = pos["position"].get("coin", "")
-                size = float(pos["position"].get("szi", 0))
-                current_pos_dict[coin] = size
-
-        for pos in previous_asset_positions:
-            if "position" in pos and pos["position"]:
-                coin = pos["position"].get("coin", "")
-                size = float(pos["position"].get("szi", 0))
-                previous_pos_dict[coin] = size
-
-        # Check for position changes
-        changes_detected = False
-        change_type = "none"
-        changed_coin = None
-
-        # Check for new positions opened
-        for coin, size in current_pos_dict.items():
-            if size != 0:
-                if coin not in previous_pos_dict or previous_pos_dict[coin] == 0:
-                    changes_detected = True
-                    change_type = "position_opened"
-                    changed_coin = coin
-                    break
-                # Check for significant size change (more than 5% change)
-                elif previous_pos_dict[coin] != 0:
-                    change_pct = abs(size - previous_pos_dict[coin]) / abs(previous_pos_dict[coin])
-                    if change_pct > POSITION_CHANGE_PERCENTAGE:
-                        changes_detected = True
-                        change_type = "position_changed"
-                        changed_coin = coin
-                        break
-
-        # Check for positions closed
-        if not changes_detected:
-            for coin, size in previous_pos_dict.items():
-                if size != 0 and (coin not in current_pos_dict or current_pos_dict[coin] == 0):
-                    changes_detected = True
-                    change_type = "position_closed"
-                    changed_coin = coin
-                    break
-
-        self.last_known_positions = current_positions
-
-        # Add changed coin to positions data for notification formatting
-        if changes_detected and changed_coin:
-            current_positions["_changed_coin"] = changed_coin
-
-        return changes_detected, current_positions, change_type
-    
+        return self._run(self.core.check_position_changes)
+
+    def check_deposit_withdrawal(self) -> Tuple[bool, List[Dict]]:
+        """Check for new deposit or withdrawal transactions (ETH and tokens)"""
+        return self._run(self.core.check_deposit_withdrawal)
+
+    def check_wallet(self, prefetched_balance: Optional[float] = None) -> Dict:
+        """Check balance, positions and deposits/withdrawals concurrently; see AsyncWalletTracker.check_wallet"""
+        return self._run(self.core.check_wallet, prefetched_balance)
+
     def get_summary(self) -> Dict:
         """Get comprehensive wallet summary"""
-        balance = self.get_eth_balance()
-        positions = self.get_hyperliquid_positions()
-        recent_txs = self.get_normal_transactions(5)
-        token_txs = self.get_token_transfers(5)
-
-        # Calculate additional statistics
-        stats = self.calculate_position_stats(positions) if positions else {}
-
-        return {
-            "wallet_address": self.wallet_address,
-            "eth_balance": balance if balance is not None else 0.0,
-            "hyperliquid_positions": positions,
-            "position_stats": stats,
-            "recent_transactions": recent_txs,
-            "token_transfers": token_txs,
-            "timestamp": datetime.now().isoformat()
-        }
-    
+        return self._run(self.core.get_summary)
+
     def calculate_position_stats(self, positions: Dict) -> Dict:
-        """
-        Hyperliquid / HyperDash istatistiklerini tek noktadan okur.
-
-        NOT:
-        - Win rate, leverage vb. metrikler bizim lokal hesapladığımız değerler
-          değil; HyperDash / backend tarafında zaten hesaplanmış geliyor.
-        - Burada amaç:
-          • Gelen JSON içindeki hazır alanları güvenli şekilde çekmek,
-          • Eksikse 0'a düşmek ama asla yanlış formülle "uydurmamak".
-        """
-        try:
-            # HyperDash / backend response yapısı üzerinden okuma
-            stats = positions.get("stats") or positions.get("hyperdashStats") or {}
-
-            # Asset positions'ı al
-            asset_positions = positions.get("assetPositions", [])
-
-            def _f(v, default=0.0):
-                try:
-                    if v is None or v == "":
-                        return float(default)
-                    return float(v)
-                except (TypeError, ValueError):
-                    return float(default)
-
-            account_value = _f(stats.get("account_value", stats.get("accountValue", 0.0)))
-            total_position_value = _f(stats.get("total_position_value", stats.get("totalPositionValue", 0.0)))
-            long_value = _f(stats.get("long_value", stats.get("longValue", 0.0)))
-            short_value = _f(stats.get("short_value", stats.get("shortValue", 0.0)))
-            total_unrealized_pnl = _f(stats.get("total_unrealized_pnl", stats.get("totalUnrealizedPnl", 0.0)))
-
-            # Hazır gelen metrikler (HyperDash kaynaklı)
-            win_rate = _f(stats.get("win_rate", 0.0))
-            leverage = _f(stats.get("leverage", 0.0))
-            roe_percentage = _f(stats.get("roe_percentage", stats.get("roe", 0.0)))
-
-            position_count = int(_f(stats.get("position_count", stats.get("open_positions", 0))))
-            winning_positions = int(_f(stats.get("winning_positions", stats.get("profitable_positions", 0))))
-
-            long_pct = _f(stats.get("long_percentage", stats.get("longPct", 0.0)))
-            short_pct = _f(stats.get("short_percentage", stats.get("shortPct", 0.0)))
-
-            # Eğer API'dan stats gelmediyse, pozisyonlardan hesapla
-            if position_count == 0 and asset_positions:
-                # Pozisyonlardan stats hesapla
-                positions = []
-                total_pnl = 0.0
-                total_position_val = 0.0
-                total_margin = 0.0
-                win_count = 0
-                leverage_sum = 0.0
-                long_val = 0.0
-                short_val = 0.0
-
-                for pos_data in asset_positions:
-                    if "position" in pos_data and pos_data["position"]:
-                        position = pos_data["position"]
-                        size = float(position.get("szi", 0))
-
-                        if size != 0:  # Sadece aktif pozisyonlar
-                            pnl = float(position.get("unrealizedPnl", 0))
-                            pos_val = float(position.get("positionValue", 0))
-                            margin = float(position.get("marginUsed", 0))
-                            lev = float(position.get("leverage", {}).get("value", 0))
-
-                            positions.append(position)
-                            total_pnl += pnl
-                            total_position_val += pos_val
-                            total_margin += margin
-                            leverage_sum += lev if lev > 0 else 1
-
-                            if size > 0:
-                                long_val += pos_val
-                            else:
-                                short_val += pos_val
-
-                            # Win rate: pozitif PnL olan pozisyonlar
-                            if pnl > 0:
-                                win_count += 1
-
-                position_count = len(positions)
-                winning_positions = win_count
-                win_rate = (win_count / position_count * 100) if position_count > 0 else 0.0
-                leverage = leverage_sum / position_count if position_count > 0 else 0.0
-                long_pct = (long_val / total_position_val * 100) if total_position_val > 0 else 0.0
-                short_pct = (short_val / total_position_val * 100) if total_position_val > 0 else 0.0
-
-            return {
-                "account_value": account_value,
-                "total_position_value": total_position_value if total_position_value > 0 else total_position_val,
-                "long_value": long_value if long_value > 0 else long_val,
-                "short_value": short_value if short_value > 0 else short_val,
-                "total_unrealized_pnl": total_unrealized_pnl if total_unrealized_pnl != 0 else total_pnl,
-                "position_count": position_count,
-                "winning_positions": winning_positions,
-                "win_rate": win_rate,
-                "roe_percentage": roe_percentage,
-                "leverage": leverage,
-                "long_percentage": long_pct,
-                "short_percentage": short_pct,
-            }
-        except (ValueError, TypeError, KeyError, ZeroDivisionError) as e:
-            print(f"Error reading external position stats: {e}")
-            return {}
+        """Position statistics from a Hyperliquid response; see AsyncWalletTracker.calculate_position_stats"""
+        return self.core.calculate_position_stats(positions)